@@ -1,11 +1,19 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
+import signal
 
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.core.model_manager import model_manager
+from app.core.model_registry import model_registry, ReloadInProgressError
+from app.core.executor import inference_executor
+from app.core.batcher import micro_batcher
+from app.core.rate_limit import create_rate_limit_store
+from app.core.system_monitor import system_monitor
+from app.core.jobs import job_manager
 from app.api import router
 from app.middleware.rate_limiter import RateLimiter
 from app.middleware.request_logger import RequestLoggerMiddleware
@@ -14,6 +22,41 @@ from app.middleware.request_logger import RequestLoggerMiddleware
 logger = setup_logging(settings.LOG_LEVEL)
 
 
+async def _load_model_in_background() -> None:
+    """Load and warm up the model without blocking server startup"""
+    try:
+        await model_registry.load()
+    except Exception as e:
+        logger.error(f"Model failed to load; service will stay unready: {str(e)}")
+
+
+def _reload_default_model() -> None:
+    """SIGHUP handler: reload the default model without downtime"""
+    if model_registry.supervisor_pid is not None:
+        # A pre-fork worker: the supervisor replaces every worker
+        logger.info(f"Forwarding SIGHUP to the pre-fork supervisor (pid {model_registry.supervisor_pid})")
+        os.kill(model_registry.supervisor_pid, signal.SIGHUP)
+        return
+    try:
+        model_registry.reload()
+    except ReloadInProgressError as e:
+        logger.warning(str(e))
+
+
+def _set_reload_signal(enabled: bool) -> bool:
+    """Install or remove the SIGHUP handler; returns whether it applies"""
+    try:
+        loop = asyncio.get_running_loop()
+        if enabled:
+            loop.add_signal_handler(signal.SIGHUP, _reload_default_model)
+        else:
+            loop.remove_signal_handler(signal.SIGHUP)
+        return True
+    except (AttributeError, NotImplementedError, RuntimeError):
+        # No SIGHUP on Windows, and handlers only work on the main thread
+        return False
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan - startup and shutdown events"""
@@ -22,9 +65,23 @@ async def lifespan(app: FastAPI):
     logger.info(f"Configuration: {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Device preference: {settings.DEVICE}")
     
+    loading_task = None
     try:
-        # Load ML model
-        model_manager.load_model()
+        # Start inference executor, micro-batching scheduler, system sampler and job workers
+        inference_executor.start()
+        await micro_batcher.start()
+        await system_monitor.start()
+        if settings.JOBS_ENABLED:
+            await job_manager.start()
+        
+        # Load ML model; in the background, /health reports readiness meanwhile
+        if settings.LOAD_MODEL_IN_BACKGROUND:
+            loading_task = asyncio.create_task(_load_model_in_background())
+        else:
+            model_registry.default.load_model()
+        
+        if _set_reload_signal(True) and model_registry.supervisor_pid is None:
+            logger.info("Send SIGHUP to reload the default model without downtime")
         logger.info("Application startup complete!")
     except Exception as e:
         logger.error(f"Failed to start application: {str(e)}")
@@ -34,6 +91,17 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
+    _set_reload_signal(False)
+    if loading_task is not None and not loading_task.done():
+        await loading_task
+    await model_registry.wait_for_reloads()
+    await system_monitor.stop()
+    await job_manager.stop()
+    await micro_batcher.stop()
+    inference_executor.shutdown()
+    rate_limit_store = getattr(app.state, "rate_limit_store", None)
+    if rate_limit_store is not None:
+        await rate_limit_store.close()
 
 
 def create_app() -> FastAPI:
@@ -62,14 +130,19 @@ def create_app() -> FastAPI:
     
     # Add rate limiter middleware (if enabled)
     if settings.RATE_LIMIT_ENABLED:
+        app.state.rate_limit_store = create_rate_limit_store()
         app.add_middleware(
             RateLimiter,
             requests_limit=settings.RATE_LIMIT_REQUESTS,
-            window_seconds=settings.RATE_LIMIT_WINDOW
+            window_seconds=settings.RATE_LIMIT_WINDOW,
+            api_key_header=settings.RATE_LIMIT_API_KEY_HEADER,
+            api_key_limits=settings.rate_limit_api_keys_map,
+            store=app.state.rate_limit_store,
+            exempt_paths=settings.rate_limit_exempt_paths_list
         )
         logger.info(
             f"Rate limiting enabled: {settings.RATE_LIMIT_REQUESTS} requests "
-            f"per {settings.RATE_LIMIT_WINDOW} seconds"
+            f"per {settings.RATE_LIMIT_WINDOW} seconds ({settings.RATE_LIMIT_BACKEND} store)"
         )
     
     # Include API router
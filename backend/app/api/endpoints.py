@@ -1,21 +1,93 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.schemas import (
     TextInput,
     BatchTextInput,
     SentimentResult,
     BatchSentimentResult,
     HealthResponse,
-    ModelInfo
+    ProbeResponse,
+    ModelsInfo,
+    ModelReloadRequest,
+    ModelReloadStatus,
+    CacheStats,
+    JobStatus,
+    JobResultItem,
+    JobResults
 )
-from app.core.model_manager import model_manager
-from app.utils.helpers import get_system_info, format_confidence, preprocess_text
+from app.core.model_manager import ModelManager, TRUNCATION_TIERS
+from app.core.model_registry import (
+    model_registry,
+    ReloadInProgressError,
+    ReloadUnavailableError,
+    UnknownModelError
+)
+from app.core.batcher import micro_batcher
+from app.core.executor import PRIORITY_CLASSES, QueueFullError
+from app.core.cache import prediction_cache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.system_monitor import system_monitor
+from app.core.streaming import (
+    BodyStreamingResponse,
+    StreamAbort,
+    StreamItem,
+    parse_value,
+    read_batches,
+    stream_predictions
+)
+from app.core.jobs import job_manager
+from app.middleware.rate_limiter import charge_request
+from app.utils.helpers import format_confidence, preprocess_text
+from typing import List, Literal, Optional
+import asyncio
+import json
 import logging
+import secrets
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _request_priority(request: Request, default: str) -> str:
+    """
+    Priority class for a request: the endpoint's default, or a lower
+    class asked for in the priority header. Raising priority above the
+    endpoint's class is not allowed, so bulk clients cannot jump ahead of
+    interactive traffic.
+    """
+    requested = request.headers.get(settings.PRIORITY_HEADER)
+    if requested is None:
+        return default
+    
+    requested = requested.strip().lower()
+    if requested not in PRIORITY_CLASSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {settings.PRIORITY_HEADER} header. Expected one of: {', '.join(PRIORITY_CLASSES)}"
+        )
+    return max(default, requested, key=PRIORITY_CLASSES.index)
+
+
+async def _acquire_model(name: Optional[str]) -> ModelManager:
+    """
+    Acquire a registered model for a request, loading it on first use
+    
+    The caller must hand it back with ``model_registry.release``.
+    """
+    try:
+        return await model_registry.acquire(name)
+    except UnknownModelError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Model {name} is unavailable: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Model '{name}' is unavailable. Please try again in a moment."
+        )
+
+
 @router.get("/")
 async def root():
     """Root endpoint with API information and examples"""
@@ -25,9 +97,18 @@ async def root():
         "endpoints": {
             "/": "GET - API information",
             "/health": "GET - Health check with system status",
+            "/health/live": "GET - Liveness probe",
+            "/health/ready": "GET - Readiness probe",
             "/analyze": "POST - Analyze sentiment of single text",
             "/analyze/batch": "POST - Analyze sentiment of multiple texts",
-            "/models/info": "GET - Get model information"
+            "/analyze/stream": "POST - Analyze an NDJSON stream of texts, results streamed back as NDJSON",
+            "/jobs": "POST - Submit a large list or file of texts for background analysis",
+            "/jobs/{job_id}": "GET - Job status and progress, DELETE - Cancel and delete a job",
+            "/jobs/{job_id}/results": "GET - Paginated job results",
+            "/models/info": "GET - Registered models with load state, memory and usage",
+            "/admin/models/reload": "POST - Load a new model version and swap it in without downtime",
+            "/cache/stats": "GET - Get prediction cache statistics",
+            "/metrics": "GET - Prometheus metrics"
         },
         "examples": {
             "single_analysis": {
@@ -61,46 +142,91 @@ async def health_check():
     """
     Health check endpoint with system information
     
-    Returns service status, device information, and system metrics
+    Returns service status, device information, and system metrics.
+    Responds with 503 and the readiness state (loading, warming, failed)
+    until the model is loaded and warmed up. System metrics come from the
+    background sampler, so this never waits on psutil.
     """
-    if not model_manager.is_ready():
-        raise HTTPException(
-            status_code=503,
-            detail="Model not loaded. Service is starting up."
+    if not model_registry.default.is_ready():
+        unavailable = HealthResponse(
+            status="unavailable",
+            readiness=model_registry.default.state,
+            device=str(model_registry.default.device or "unknown"),
+            model_loaded=model_registry.default.backend is not None
         )
-    
-    model_info = model_manager.get_model_info()
-    system_info = get_system_info()
+        return JSONResponse(status_code=503, content=unavailable.dict())
     
     return HealthResponse(
         status="healthy",
-        device=model_info.get("device", "unknown"),
+        readiness=model_registry.default.state,
+        device=str(model_registry.default.device),
         model_loaded=True,
-        system_info=system_info
+        system_info=system_monitor.snapshot()
     )
 
 
+@router.get("/health/live", response_model=ProbeResponse)
+async def liveness_probe():
+    """
+    Liveness probe
+    
+    Succeeds whenever the event loop is serving requests, including while
+    the model is still loading. Reads no system or model state.
+    """
+    return ProbeResponse(status="alive")
+
+
+@router.get("/health/ready", response_model=ProbeResponse)
+async def readiness_probe():
+    """
+    Readiness probe
+    
+    Responds with 200 once the model is loaded and warmed up, and with 503
+    and the readiness state (loading, warming, failed) before that.
+    """
+    if not model_registry.default.is_ready():
+        unavailable = ProbeResponse(status="unavailable", readiness=model_registry.default.state)
+        return JSONResponse(status_code=503, content=unavailable.dict())
+    
+    return ProbeResponse(status="ready", readiness=model_registry.default.state)
+
+
 @router.post("/analyze", response_model=SentimentResult)
-async def analyze_sentiment(input_data: TextInput):
+async def analyze_sentiment(input_data: TextInput, request: Request):
     """
     Analyze sentiment of a single text
     
     - **text**: The text to analyze (1-5000 characters)
+    - **model**: Optional registered model name (see ``/models/info``)
+    - **tier**: ``standard`` (default) or ``fast``, which truncates long
+      texts to FAST_MAX_SEQUENCE_LENGTH tokens for a bounded cost
     
-    Returns sentiment label (POSITIVE/NEGATIVE) and confidence score
+    Returns sentiment label (POSITIVE/NEGATIVE) and confidence score.
+    Runs in the interactive priority class; bulk clients can send
+    ``X-Priority: batch`` or ``background`` to stay out of its way.
     """
-    if not model_manager.is_ready():
+    if not model_registry.default.is_ready():
         raise HTTPException(
             status_code=503,
             detail="Model not loaded. Please try again in a moment."
         )
     
+    priority = _request_priority(request, "interactive")
+    model = await _acquire_model(input_data.model)
+    
     try:
         # Preprocess text
         processed_text = preprocess_text(input_data.text)
         
-        # Get prediction
-        sentiment, confidence = model_manager.predict_sentiment(processed_text)
+        # Serve repeated texts from the cache, otherwise batch with
+        # concurrent requests
+        cached = model.get_cached(processed_text, input_data.tier)
+        if cached is not None:
+            sentiment, confidence = cached
+        else:
+            sentiment, confidence = await micro_batcher.submit(
+                processed_text, priority, model, input_data.tier
+            )
         
         return SentimentResult(
             text=input_data.text,
@@ -108,66 +234,378 @@ async def analyze_sentiment(input_data: TextInput):
             confidence=format_confidence(confidence)
         )
     
+    except QueueFullError as e:
+        logger.warning(f"Rejecting request: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy. Please try again in a moment."
+        )
+    
     except Exception as e:
         logger.error(f"Error during sentiment analysis: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Error analyzing sentiment: {str(e)}"
         )
+    
+    finally:
+        model_registry.release(model)
 
 
 @router.post("/analyze/batch", response_model=BatchSentimentResult)
-async def analyze_batch_sentiment(input_data: BatchTextInput):
+async def analyze_batch_sentiment(input_data: BatchTextInput, request: Request):
     """
     Analyze sentiment of multiple texts in batch
     
     - **texts**: List of texts to analyze (1-50 texts, each 1-5000 characters)
+    - **model**: Optional registered model name (see ``/models/info``)
+    - **tier**: ``standard`` (default) or ``fast``, which truncates long
+      texts to FAST_MAX_SEQUENCE_LENGTH tokens for a bounded cost
     
-    Returns list of sentiment results with labels and confidence scores
+    Returns list of sentiment results with labels and confidence scores.
+    Each text counts as one request against the rate limit. Runs in the
+    batch priority class (or ``background`` via the X-Priority header).
     """
-    if not model_manager.is_ready():
+    if not model_registry.default.is_ready():
         raise HTTPException(
             status_code=503,
             detail="Model not loaded. Please try again in a moment."
         )
     
+    priority = _request_priority(request, "batch")
+    
+    # The middleware already charged one request for the call itself
+    await charge_request(request, len(input_data.texts) - 1)
+    model = await _acquire_model(input_data.model)
+    
     try:
-        results = []
+        # Preprocess texts
+        processed_texts = [preprocess_text(text) for text in input_data.texts]
         
-        for text in input_data.texts:
-            # Preprocess text
-            processed_text = preprocess_text(text)
-            
-            # Get prediction
-            sentiment, confidence = model_manager.predict_sentiment(processed_text)
-            
-            results.append(
-                SentimentResult(
-                    text=text,
-                    sentiment=sentiment,
-                    confidence=format_confidence(confidence)
-                )
+        # Get predictions with vectorized batch inference
+        predictions = await model_registry.predict(model, processed_texts, input_data.tier, priority)
+        
+        results = [
+            SentimentResult(
+                text=text,
+                sentiment=sentiment,
+                confidence=format_confidence(confidence)
             )
+            for text, (sentiment, confidence) in zip(input_data.texts, predictions)
+        ]
         
         return BatchSentimentResult(
             results=results,
             total=len(results)
         )
     
+    except QueueFullError as e:
+        logger.warning(f"Rejecting batch request: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy. Please try again in a moment."
+        )
+    
     except Exception as e:
         logger.error(f"Error during batch sentiment analysis: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Error analyzing batch sentiment: {str(e)}"
         )
+    
+    finally:
+        model_registry.release(model)
 
 
-@router.get("/models/info", response_model=ModelInfo)
+@router.post("/analyze/stream")
+async def analyze_stream(
+    request: Request,
+    model: Optional[str] = Query(None, description="Registered model to use (default: the default model)"),
+    tier: Literal["standard", "fast"] = Query("standard", description="Truncation tier (standard or fast)")
+):
+    """
+    Analyze a stream of texts of any length
+    
+    The request body is NDJSON: one JSON string or ``{"text": ..., "id": ...}``
+    object per line (send ``Content-Type: text/plain`` for one raw text per
+    line). Texts are batched as they arrive and results are streamed back
+    as NDJSON in input order, one line per input line. Choose a registered
+    model with ``?model=`` and the fast truncation tier with ``?tier=fast``.
+    
+    - ``{"line": 1, "id": ..., "sentiment": "POSITIVE", "confidence": 0.999}``
+    - ``{"line": 2, "error": "Line is not valid JSON"}``
+    
+    A final ``{"done": true, "processed": ..., "errors": ...}`` line reports
+    totals. Each text counts as one request against the rate limit; when
+    the limit is reached the stream ends with an inline error. Runs in the
+    batch priority class (or ``background`` via the X-Priority header).
+    """
+    if not model_registry.default.is_ready():
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Please try again in a moment."
+        )
+    
+    priority = _request_priority(request, "batch")
+    
+    content_type = request.headers.get("content-type", "")
+    plain_text = content_type.startswith("text/plain")
+    charged_call = False
+    
+    async def charge(count: int) -> None:
+        nonlocal charged_call
+        # The middleware already charged one request for the call itself
+        cost = count if charged_call else count - 1
+        charged_call = True
+        try:
+            await charge_request(request, cost)
+        except HTTPException as e:
+            raise StreamAbort(e.detail)
+    
+    manager = await _acquire_model(model)
+    
+    async def results():
+        try:
+            async for chunk in stream_predictions(
+                request.stream(), plain_text=plain_text, charge=charge, priority=priority,
+                model=manager, tier=tier
+            ):
+                yield chunk
+        finally:
+            model_registry.release(manager)
+    
+    return BodyStreamingResponse(
+        results(),
+        media_type="application/x-ndjson"
+    )
+
+
+def _job_status(job: dict) -> JobStatus:
+    progress = job["processed"] / job["total"] if job["total"] else 0.0
+    return JobStatus(progress=min(progress, 1.0), **job)
+
+
+def _parse_job_texts(texts: list) -> List[StreamItem]:
+    """Validate the texts of a JSON job body (blocking; runs off the event loop)"""
+    return [parse_value(value, index + 1) for index, value in enumerate(texts)]
+
+
+async def _get_job(job_id: str) -> dict:
+    if not job_manager.is_running():
+        raise HTTPException(status_code=503, detail="Background jobs are disabled")
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+async def create_job(request: Request):
+    """
+    Submit texts for background analysis and return a job id immediately
+    
+    The body is either JSON ``{"texts": [...]}`` or an uploaded NDJSON file
+    (one JSON string or ``{"text": ..., "id": ...}`` object per line; send
+    ``Content-Type: text/plain`` for one raw text per line). Texts are
+    stored on disk before the response is sent and processed in the
+    background; poll ``/jobs/{job_id}`` for progress and read
+    ``/jobs/{job_id}/results`` page by page. Invalid texts are recorded
+    as errors. Each text counts as one request against the rate limit.
+    Jobs run in the background priority class. Choose a registered model
+    with a ``model`` field in the JSON body or a ``?model=`` parameter, and
+    the truncation tier the same way with ``tier``.
+    
+    A JSON body may hold up to JOBS_MAX_TEXTS texts, so it is decoded and
+    validated on a worker thread rather than on the event loop.
+    """
+    if not job_manager.is_running():
+        raise HTTPException(status_code=503, detail="Background jobs are disabled")
+    
+    content_type = request.headers.get("content-type", "")
+    model = request.query_params.get("model")
+    tier = request.query_params.get("tier")
+    texts = None
+    if content_type.startswith("application/json"):
+        body = await request.body()
+        try:
+            body = await asyncio.to_thread(json.loads, body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Request body is not valid JSON")
+        texts = body.get("texts") if isinstance(body, dict) else None
+        if not isinstance(texts, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON object with a 'texts' list")
+        if len(texts) > settings.JOBS_MAX_TEXTS:
+            raise HTTPException(status_code=413, detail=f"Job exceeds {settings.JOBS_MAX_TEXTS} texts")
+        model = body.get("model", model)
+        tier = body.get("tier", tier)
+    
+    try:
+        model_registry.get(model)
+    except UnknownModelError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if tier is not None and tier not in TRUNCATION_TIERS:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid tier. Expected one of: {', '.join(TRUNCATION_TIERS)}"
+        )
+    
+    job_id = await job_manager.create_job(model, tier)
+    try:
+        if texts is not None:
+            items = await asyncio.to_thread(_parse_job_texts, texts)
+            await job_manager.add_items(job_id, 0, items)
+            valid = sum(1 for item in items if item.text is not None)
+        else:
+            batches = read_batches(
+                request.stream(),
+                plain_text=content_type.startswith("text/plain"),
+                batch_size=settings.STREAM_BATCH_SIZE,
+                max_line_bytes=settings.STREAM_MAX_LINE_BYTES
+            )
+            try:
+                _, valid = await job_manager.ingest(job_id, batches, settings.JOBS_MAX_TEXTS)
+            except ValueError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+        
+        if not valid:
+            raise HTTPException(status_code=400, detail="No valid texts to analyze")
+        
+        # The middleware already charged one request for the call itself
+        await charge_request(request, valid - 1)
+    except BaseException:
+        await job_manager.discard(job_id)
+        raise
+    
+    await job_manager.submit(job_id)
+    logger.info(f"Job {job_id} submitted with {valid} texts")
+    return _job_status(await job_manager.get(job_id))
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    Get job status and progress
+    
+    Status is one of receiving, queued, running, completed, failed or
+    cancelled; progress is the fraction of texts processed so far.
+    """
+    return _job_status(await _get_job(job_id))
+
+
+@router.get("/jobs/{job_id}/results", response_model=JobResults)
+async def get_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Index of the first result"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum results per page")
+):
+    """
+    Get a page of job results in input order
+    
+    Results are available as soon as they are processed, so pages can be
+    read while the job is still running; unprocessed texts have
+    ``done: false``. Follow ``next_offset`` until it is null.
+    """
+    job = await _get_job(job_id)
+    rows = await job_manager.results(job_id, offset, limit)
+    next_offset = offset + len(rows)
+    return JobResults(
+        id=job_id,
+        status=job["status"],
+        total=job["total"],
+        offset=offset,
+        next_offset=next_offset if next_offset < job["total"] else None,
+        results=[JobResultItem(**row) for row in rows]
+    )
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatus)
+async def delete_job(job_id: str):
+    """
+    Cancel a job if it is still running and delete it with its results
+    """
+    job = await _get_job(job_id)
+    await job_manager.delete(job_id)
+    if job["status"] in ("receiving", "queued", "running"):
+        job["status"] = "cancelled"
+    return _job_status(job)
+
+
+@router.get("/models/info", response_model=ModelsInfo)
 async def get_model_info():
     """
-    Get information about the loaded model
+    Get information about every registered model
+    
+    Returns each model's load state, memory footprint and request counts,
+    plus model name, device, parameters count and other details for
+    loaded models
+    """
+    return ModelsInfo(**model_registry.info())
+
+
+def _require_admin(request: Request) -> None:
+    """Check the admin API key; admin endpoints do not exist without one"""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Admin API is disabled")
+    supplied = request.headers.get(settings.ADMIN_API_KEY_HEADER, "")
+    if not secrets.compare_digest(supplied.encode("utf-8"), settings.ADMIN_API_KEY.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid or missing admin API key")
+
+
+@router.post("/admin/models/reload", response_model=ModelReloadStatus, status_code=202)
+async def reload_model(reload_request: ModelReloadRequest, request: Request):
+    """
+    Load a new version of a model and swap it in without downtime
+    
+    The new version loads and warms up in the background while the current
+    one keeps serving. It then replaces the current version between
+    batches; requests already running finish on the old version, whose
+    weights are freed afterwards. Cached predictions are keyed by version,
+    so the new version never serves the old one's results. Track progress
+    in ``/models/info``. Requires the admin API key. Sending SIGHUP to the
+    process reloads the default model the same way.
     
-    Returns model name, device, parameters count, and other details
+    Under the pre-fork server (WORKERS > 1) this responds with 409: send
+    SIGHUP to the supervisor instead, which replaces every worker so they
+    all serve one version and keep sharing its weights.
     """
-    info = model_manager.get_model_info()
-    return ModelInfo(**info)
+    _require_admin(request)
+    
+    try:
+        status = model_registry.reload(
+            reload_request.model,
+            model_name=reload_request.model_name,
+            tokenizer_name=reload_request.tokenizer_name
+        )
+    except UnknownModelError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (ReloadInProgressError, ReloadUnavailableError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return ModelReloadStatus(**status)
+
+
+@router.get("/cache/stats", response_model=CacheStats)
+async def get_cache_stats():
+    """
+    Get prediction cache statistics
+    
+    Returns cache size, hit/miss/eviction counters and hit ratio
+    """
+    if prediction_cache is None:
+        return CacheStats(enabled=False)
+    return CacheStats(**prediction_cache.stats())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus metrics in the text exposition format
+    
+    Includes per-route request counts and latency, inference stage timings,
+    batch sizes, token counts, queue wait and cache statistics
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from .config import settings
+
+
+ARTIFACT_EXTENSIONS = {
+    "snapshot": None,  # directory
+    "torchscript": "pt",
+    "onnx": "onnx",
+}
+
+
+def artifact_path(kind: str, model_name: str = None) -> Path:
+    """
+    Location of an exported artifact for a model
+
+    Args:
+        kind: One of ARTIFACT_EXTENSIONS (snapshot, torchscript, onnx)
+        model_name: Model name (default: settings.MODEL_NAME)
+
+    Returns:
+        File path, or directory path for local snapshots
+    """
+    model_name = model_name or settings.MODEL_NAME
+    directory = Path(settings.ARTIFACT_DIR)
+    if not directory.is_absolute():
+        directory = Path(__file__).parent.parent.parent / directory
+
+    safe_name = model_name.strip("/").replace("/", "__").replace(":", "_")
+    extension = ARTIFACT_EXTENSIONS[kind]
+    if extension is None:
+        return directory / safe_name
+    return directory / f"{safe_name}.{extension}"
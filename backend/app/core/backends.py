@@ -0,0 +1,197 @@
+import logging
+from pathlib import Path
+from typing import Optional
+
+import torch
+
+from .artifacts import artifact_path
+
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("pytorch", "torchscript", "onnx")
+
+
+class InferenceBackend:
+    """Base class for a model runtime that maps token ids to logits"""
+
+    name = "base"
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """Run a forward pass and return logits as a CPU or device tensor"""
+        raise NotImplementedError
+
+    def num_parameters(self) -> Optional[int]:
+        """Number of model parameters, if the runtime exposes them"""
+        return None
+
+
+class PyTorchBackend(InferenceBackend):
+    """Eager PyTorch model from transformers"""
+
+    name = "pytorch"
+
+    def __init__(self, model: torch.nn.Module):
+        self.model = model
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+    def num_parameters(self) -> Optional[int]:
+        return sum(p.numel() for p in self.model.parameters())
+
+
+class TorchScriptBackend(InferenceBackend):
+    """TorchScript-traced model loaded from an exported artifact"""
+
+    name = "torchscript"
+
+    def __init__(self, path: Path, device: torch.device):
+        self.model = torch.jit.load(str(path), map_location=device)
+        self.model.eval()
+        self.model = torch.jit.optimize_for_inference(self.model)
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        return self.model(input_ids, attention_mask)[0]
+
+    def num_parameters(self) -> Optional[int]:
+        return sum(p.numel() for p in self.model.parameters()) or None
+
+
+class OnnxBackend(InferenceBackend):
+    """Exported ONNX graph run with ONNX Runtime on CPU"""
+
+    name = "onnx"
+
+    def __init__(self, path: Path):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise RuntimeError("BACKEND=onnx requires the onnxruntime package")
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            str(path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        logits = self.session.run(
+            ["logits"],
+            {
+                "input_ids": input_ids.cpu().numpy(),
+                "attention_mask": attention_mask.cpu().numpy(),
+            }
+        )[0]
+        return torch.from_numpy(logits)
+
+
+def _example_inputs():
+    """Small dummy batch used for tracing and export"""
+    input_ids = torch.ones((2, 16), dtype=torch.long)
+    attention_mask = torch.ones((2, 16), dtype=torch.long)
+    return input_ids, attention_mask
+
+
+def export_torchscript(model: torch.nn.Module, path: Path) -> Path:
+    """
+    Trace a model loaded with ``torchscript=True`` and save it
+
+    Args:
+        model: Eager model in eval mode on CPU
+        path: Destination file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, _example_inputs(), strict=False)
+    traced.save(str(path))
+    return path
+
+
+def export_onnx(model: torch.nn.Module, path: Path, opset: int = 14) -> Path:
+    """
+    Export a model to ONNX with dynamic batch and sequence dimensions
+
+    Args:
+        model: Eager model in eval mode on CPU
+        path: Destination file
+        opset: ONNX opset version
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "sequence"},
+        "attention_mask": {0: "batch", 1: "sequence"},
+        "logits": {0: "batch"},
+    }
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            _example_inputs(),
+            str(path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True
+        )
+    return path
+
+
+def export_snapshot(model_name: str, tokenizer_name: str, path: Path) -> Path:
+    """
+    Save a local model and tokenizer snapshot with safetensors weights
+
+    The server loads this directory with no network lookups, and
+    safetensors weights are memory-mapped instead of unpickled.
+    """
+    from transformers import DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+    path.mkdir(parents=True, exist_ok=True)
+    DistilBertTokenizerFast.from_pretrained(tokenizer_name).save_pretrained(str(path))
+    DistilBertForSequenceClassification.from_pretrained(model_name).save_pretrained(
+        str(path), safe_serialization=True
+    )
+    return path
+
+
+def load_backend(
+    name: str,
+    model: Optional[torch.nn.Module],
+    device: torch.device,
+    model_name: Optional[str] = None
+) -> InferenceBackend:
+    """
+    Create the configured inference backend
+
+    Args:
+        name: One of BACKENDS
+        model: Loaded eager model (required for the pytorch backend)
+        device: Device to run on
+        model_name: Model whose exported artifact to load (default: settings.MODEL_NAME)
+
+    Raises:
+        ValueError: For unknown backends or unsupported devices
+        FileNotFoundError: If the exported artifact is missing
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown BACKEND '{name}'. Expected one of: {', '.join(BACKENDS)}")
+
+    if name == "pytorch":
+        return PyTorchBackend(model)
+
+    path = artifact_path(name, model_name)
+    if not path.exists():
+        model_option = f" --model {model_name}" if model_name else ""
+        raise FileNotFoundError(
+            f"No {name} artifact at {path}. Run `python export_model.py --backend {name}{model_option}` first."
+        )
+
+    logger.info(f"Loading {name} artifact: {path}")
+    if name == "torchscript":
+        return TorchScriptBackend(path, device)
+
+    if device.type != "cpu":
+        raise ValueError(f"BACKEND=onnx runs on CPU only, not {device}")
+    return OnnxBackend(path)
@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from .config import settings
+from .executor import inference_executor, PRIORITY_CLASSES, QueueFullError
+from .model_manager import ModelManager
+from .model_registry import model_registry
+from .metrics import INFERENCE_QUEUE_WAIT, metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collect concurrent single-text requests into one padded forward pass
+
+    Requests are queued and a single background task drains the queue,
+    waiting at most ``max_wait_ms`` after the first request (or until
+    ``max_batch_size`` requests are collected) before running the batch.
+    Batches run on the inference executor, at most one per executor
+    worker, so requests keep accumulating while all workers are busy.
+    Each caller receives its own result through a future. A batch runs
+    at the highest priority class among its requests, with one forward
+    pass per model and truncation tier when requests differ.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 1024
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._inflight: Set[asyncio.Task] = set()
+        # Requests queued and queue wait series, per model name
+        self._queued: Dict[str, int] = {}
+        self._queue_wait: Dict[str, object] = {}
+
+    async def start(self) -> None:
+        """Start the background batching task"""
+        if self._task is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._slots = asyncio.Semaphore(inference_executor.max_workers)
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Micro-batcher started: max_batch_size={self.max_batch_size}, "
+            f"max_wait={self.max_wait * 1000:.1f}ms, queue_size={self.max_queue_size}"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background task and fail any queued requests"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+        while not self._queue.empty():
+            _, future, _, _, model, _ = self._queue.get_nowait()
+            self._dequeued(model)
+            if not future.done():
+                future.set_exception(RuntimeError("Inference service is shutting down"))
+
+        logger.info("Micro-batcher stopped")
+
+    def is_running(self) -> bool:
+        """Check if the batching task is running"""
+        return self._task is not None and not self._task.done()
+
+    def queue_depth(self) -> int:
+        """Number of requests waiting to be batched"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def queue_depth_by_model(self) -> Dict[str, int]:
+        """Number of requests waiting to be batched, by model name"""
+        return dict(self._queued)
+
+    async def submit(
+        self,
+        text: str,
+        priority: str = "interactive",
+        model: Optional[ModelManager] = None,
+        tier: str = "standard"
+    ) -> Tuple[str, float]:
+        """
+        Queue a preprocessed text for inference and wait for its result
+
+        Args:
+            text: Preprocessed text to analyze
+            priority: Priority class (interactive, batch or background)
+            model: Model to run (default: the default model)
+            tier: Truncation tier (standard or fast)
+
+        Returns:
+            Tuple of (sentiment_label, confidence_score)
+        """
+        if not self.is_running():
+            raise RuntimeError("Micro-batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        model = model or model_registry.default
+        try:
+            self._queue.put_nowait((text, future, time.perf_counter(), priority, model, tier))
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"Inference queue is full ({self.max_queue_size} pending requests)"
+            )
+        self._queued[model.model_name] = self._queued.get(model.model_name, 0) + 1
+
+        return await future
+
+    async def _collect(self) -> List[tuple]:
+        """Wait for the first request, then gather more until the deadline"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        try:
+            while len(batch) < self.max_batch_size:
+                # Take whatever is already queued without paying for a timer
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            for _, future, _, _, _, _ in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Inference service is shutting down"))
+            raise
+        finally:
+            for _, _, _, _, model, _ in batch:
+                self._dequeued(model)
+
+        return batch
+
+    def _dequeued(self, model: ModelManager) -> None:
+        """Take a request off the per-model queue depth"""
+        remaining = self._queued.get(model.model_name, 0) - 1
+        if remaining > 0:
+            self._queued[model.model_name] = remaining
+        else:
+            self._queued.pop(model.model_name, None)
+
+    async def _run(self) -> None:
+        """Background loop that dispatches one forward pass per collected batch"""
+        while True:
+            # Wait for a free executor worker before collecting, so the
+            # queue keeps filling while inference is busy
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[tuple]) -> None:
+        """Run a batch on the inference executor and resolve its futures"""
+        try:
+            now = time.perf_counter()
+            for _, _, enqueued_at, _, model, _ in batch:
+                queue_wait = self._queue_wait.get(model.model_name)
+                if queue_wait is None:
+                    queue_wait = self._queue_wait[model.model_name] = INFERENCE_QUEUE_WAIT.labels(model.model_name)
+                queue_wait.observe(now - enqueued_at)
+
+            # Skip requests whose callers have gone away
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                return
+
+            priority = min((item[3] for item in batch), key=PRIORITY_CLASSES.index)
+            by_model: Dict[Tuple[ModelManager, str], List[tuple]] = {}
+            for text, future, _, _, model, tier in batch:
+                by_model.setdefault((model, tier), []).append((text, future))
+
+            for (model, tier), requests in by_model.items():
+                texts = [text for text, _ in requests]
+                try:
+                    results = await model_registry.predict(model, texts, tier, priority)
+                except Exception as e:
+                    if not isinstance(e, QueueFullError):
+                        logger.error(f"Error during batched inference: {str(e)}")
+                    for _, future in requests:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, future), result in zip(requests, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+# Global micro-batcher instance
+micro_batcher = MicroBatcher(
+    max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=settings.MICRO_BATCH_MAX_WAIT_MS,
+    max_queue_size=settings.MICRO_BATCH_QUEUE_SIZE
+)
+
+metrics.collected(
+    "inference_queue_depth", "Requests waiting in the micro-batch queue", "gauge",
+    ("model",), lambda: {
+        (model,): depth
+        for model, depth in {model_registry.default.model_name: 0, **micro_batcher.queue_depth_by_model()}.items()
+    }
+)
@@ -0,0 +1,424 @@
+import hashlib
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import settings
+from .metrics import metrics, model_label
+
+
+logger = logging.getLogger(__name__)
+
+Prediction = Tuple[str, float]
+
+# Rough per-entry bookkeeping cost of the OrderedDict node and expiry tuple
+_ENTRY_OVERHEAD_BYTES = 120
+
+# Disk cache key recording which model the stored predictions belong to
+_MODEL_MARKER_KEY = "__model_name__"
+
+# Per-model counters, in the order they are kept
+_MODEL_COUNTERS = ("entries", "hits", "misses", "coalesced", "evictions", "expirations", "disk_hits")
+
+
+class DiskPredictionCache:
+    """
+    Persistent prediction cache shared by all worker processes on a host
+
+    Backed by diskcache (SQLite plus files), which is safe for concurrent
+    use from several processes. The cache is size-bounded with LRU
+    eviction and is cleared automatically when the model name changes.
+    Lookups run on inference threads, so the hit and miss counters are
+    updated under a lock.
+    """
+
+    def __init__(self, directory: str, size_limit_bytes: int, model_name: str):
+        import diskcache
+
+        self.directory = directory
+        self.size_limit_bytes = size_limit_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._cache = diskcache.Cache(
+            directory,
+            size_limit=size_limit_bytes,
+            eviction_policy="least-recently-used"
+        )
+
+        # Drop predictions made by a different model
+        with self._cache.transact():
+            stored_model = self._cache.get(_MODEL_MARKER_KEY)
+            if stored_model != model_name:
+                if stored_model is not None:
+                    logger.info(
+                        f"Model changed from {stored_model} to {model_name}, "
+                        f"clearing disk cache at {directory}"
+                    )
+                self._cache.clear()
+                self._cache.set(_MODEL_MARKER_KEY, model_name)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Prediction]:
+        """Look up several keys, returning only those found"""
+        found = {}
+        for key in keys:
+            value = self._cache.get(key)
+            if value is not None:
+                found[key] = tuple(value)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, Prediction]) -> None:
+        """Store several predictions"""
+        with self._cache.transact():
+            for key, value in items.items():
+                self._cache.set(key, value)
+
+    def stats(self) -> dict:
+        """Get disk cache size and hit and miss counts"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "directory": self.directory,
+            "entries": max(0, len(self._cache) - 1),
+            "bytes": self._cache.volume(),
+            "size_limit_bytes": self.size_limit_bytes,
+            "hits": hits,
+            "misses": misses,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database handles"""
+        self._cache.close()
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of sentiment predictions
+
+    Entries are evicted least-recently-used first once ``max_entries`` or
+    ``max_bytes`` is exceeded, and expire after ``ttl_seconds`` when set.
+    Concurrent misses for the same key are coalesced: the first caller
+    computes the prediction and the others wait for its result. Misses
+    are checked against the optional disk tier before running inference.
+
+    Counters are kept in total and per model, named by the ``model``
+    argument of each lookup (default: MODEL_NAME).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 0,
+        ttl_seconds: float = 0,
+        disk: Optional[DiskPredictionCache] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk = disk
+        self._entries: "OrderedDict[str, Tuple[Prediction, float, int, str]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._model_counters: Dict[str, List[int]] = {}
+
+    @staticmethod
+    def make_key(text: str, model_name: str, truncation: str) -> str:
+        """Build a cache key from normalized text, model name and truncation policy"""
+        raw = f"{model_name}\x00{truncation}\x00{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, key: str, model: Optional[str] = None) -> Optional[Prediction]:
+        """Return a cached prediction, or None if absent or expired"""
+        model = model or model_label()
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                self._count(model, "hits")
+            return value
+
+    def put(self, key: str, value: Prediction, model: Optional[str] = None) -> None:
+        """Store a prediction, evicting old entries if over budget"""
+        with self._lock:
+            self._store(key, value, model or model_label())
+
+    def get_or_compute_many(
+        self,
+        keys: List[str],
+        texts: List[str],
+        compute: Callable[[List[str]], List[Prediction]],
+        model: Optional[str] = None
+    ) -> List[Prediction]:
+        """
+        Resolve predictions for several texts through the cache
+
+        Cached keys are returned directly, keys already being computed by
+        another caller are waited on, keys found in the disk tier are
+        promoted to memory, and the remaining texts are passed to
+        ``compute`` in a single call.
+
+        Args:
+            keys: Cache key for each text
+            texts: Texts to predict, aligned with keys
+            compute: Function predicting a list of texts
+            model: Model name the counters are kept under (default: MODEL_NAME)
+
+        Returns:
+            List of predictions in input order
+        """
+        results: Dict[str, Prediction] = {}
+        waiting: Dict[str, Future] = {}
+        owned: Dict[str, Future] = {}
+        owned_texts: Dict[str, str] = {}
+        model = model or model_label()
+
+        with self._lock:
+            for key, text in zip(keys, texts):
+                if key in results or key in waiting or key in owned:
+                    continue
+
+                value = self._lookup(key)
+                if value is not None:
+                    self.hits += 1
+                    self._count(model, "hits")
+                    results[key] = value
+                elif key in self._inflight:
+                    self.coalesced += 1
+                    self._count(model, "coalesced")
+                    waiting[key] = self._inflight[key]
+                else:
+                    future = Future()
+                    self._inflight[key] = future
+                    owned[key] = future
+                    owned_texts[key] = text
+
+        if owned:
+            try:
+                computed = self._resolve_owned(owned_texts, compute, model)
+            except BaseException as e:
+                with self._lock:
+                    for key, future in owned.items():
+                        self._inflight.pop(key, None)
+                        future.set_exception(e)
+                raise
+
+            with self._lock:
+                for key, future in owned.items():
+                    value = computed[key]
+                    self._store(key, value, model)
+                    self._inflight.pop(key, None)
+                    future.set_result(value)
+                    results[key] = value
+
+        for key, future in waiting.items():
+            results[key] = future.result()
+
+        return [results[key] for key in keys]
+
+    def _resolve_owned(
+        self,
+        owned_texts: Dict[str, str],
+        compute: Callable[[List[str]], List[Prediction]],
+        model: str
+    ) -> Dict[str, Prediction]:
+        """Resolve claimed keys from the disk tier, computing the rest"""
+        found = self.disk.get_many(list(owned_texts)) if self.disk is not None else {}
+        missing = [key for key in owned_texts if key not in found]
+        disk_hits = len(found)
+
+        if missing:
+            predictions = compute([owned_texts[key] for key in missing])
+            computed = dict(zip(missing, predictions))
+            if self.disk is not None:
+                self.disk.set_many(computed)
+            found.update(computed)
+
+        with self._lock:
+            self.misses += len(missing)
+            self._count(model, "misses", len(missing))
+            self._count(model, "disk_hits", disk_hits)
+
+        return found
+
+    def clear(self) -> None:
+        """Remove all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for counters in self._model_counters.values():
+                counters[0] = 0
+
+    def counters(self) -> dict:
+        """Get hit, miss and eviction counters without touching the disk cache"""
+        disk_hits = self.disk.hits if self.disk is not None else 0
+
+        with self._lock:
+            served = self.hits + self.coalesced + disk_hits
+            lookups = served + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "disk_hits": disk_hits,
+                "hit_ratio": round(served / lookups, 4) if lookups else None,
+            }
+
+    def model_counters(self) -> Dict[str, dict]:
+        """Get the counters() fields for each model the cache has seen"""
+        with self._lock:
+            counters = {model: list(values) for model, values in self._model_counters.items()}
+
+        result = {}
+        for model, values in counters.items():
+            named = dict(zip(_MODEL_COUNTERS, values))
+            served = named["hits"] + named["coalesced"] + named["disk_hits"]
+            lookups = served + named["misses"]
+            named["hit_ratio"] = round(served / lookups, 4) if lookups else None
+            result[model] = named
+        return result
+
+    def stats(self) -> dict:
+        """Get cache counters and size"""
+        disk_stats = self.disk.stats() if self.disk is not None else None
+        counters = self.counters()
+
+        with self._lock:
+            return {
+                "enabled": True,
+                "entries": counters["entries"],
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                **{name: value for name, value in counters.items() if name != "entries"},
+                "disk": disk_stats,
+            }
+
+    def _lookup(self, key: str) -> Optional[Prediction]:
+        """Find a live entry and mark it recently used (lock must be held)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at, size, model = entry
+        if expires_at and expires_at <= time.monotonic():
+            del self._entries[key]
+            self._bytes -= size
+            self.expirations += 1
+            self._count(model, "entries", -1)
+            self._count(model, "expirations")
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _count(self, model: str, name: str, amount: int = 1) -> None:
+        """Add to one of a model's counters (lock must be held)"""
+        counters = self._model_counters.get(model)
+        if counters is None:
+            counters = self._model_counters[model] = [0] * len(_MODEL_COUNTERS)
+        counters[_MODEL_COUNTERS.index(name)] += amount
+
+    def _store(self, key: str, value: Prediction, model: str) -> None:
+        """Insert an entry and evict down to budget (lock must be held)"""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+            self._count(old[3], "entries", -1)
+
+        size = (
+            sys.getsizeof(key) + sys.getsizeof(value[0])
+            + sys.getsizeof(value[1]) + _ENTRY_OVERHEAD_BYTES
+        )
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        self._entries[key] = (value, expires_at, size, model)
+        self._bytes += size
+        self._count(model, "entries")
+
+        while self._entries and (
+            (self.max_entries > 0 and len(self._entries) > self.max_entries)
+            or (self.max_bytes > 0 and self._bytes > self.max_bytes)
+        ):
+            _, (_, _, evicted_size, evicted_model) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+            self._count(evicted_model, "entries", -1)
+            self._count(evicted_model, "evictions")
+
+
+def _create_disk_cache() -> Optional[DiskPredictionCache]:
+    """Create the persistent cache tier if enabled and available"""
+    if not settings.DISK_CACHE_ENABLED:
+        return None
+
+    directory = Path(settings.DISK_CACHE_DIR)
+    if not directory.is_absolute():
+        directory = Path(__file__).parent.parent.parent / directory
+
+    try:
+        disk = DiskPredictionCache(
+            str(directory),
+            size_limit_bytes=settings.DISK_CACHE_SIZE_LIMIT_MB * 1024 * 1024,
+            model_name=settings.MODEL_NAME
+        )
+    except ImportError:
+        logger.warning("DISK_CACHE_ENABLED is set but diskcache is not installed")
+        return None
+
+    logger.info(f"Disk prediction cache enabled at {directory}")
+    return disk
+
+
+# Global prediction cache instance (None when disabled)
+prediction_cache: Optional[PredictionCache] = (
+    PredictionCache(
+        max_entries=settings.CACHE_MAX_ENTRIES,
+        max_bytes=settings.CACHE_MAX_BYTES,
+        ttl_seconds=settings.CACHE_TTL_SECONDS,
+        disk=_create_disk_cache()
+    )
+    if settings.CACHE_ENABLED else None
+)
+
+
+# Read once per scrape and shared by every prediction cache family
+_cache_counters = metrics.per_scrape(lambda: prediction_cache.model_counters() if prediction_cache else {})
+
+
+def _collect_cache_stat(name: str):
+    """Scrape-time collector for one prediction cache counter, by model"""
+    def collect():
+        return {(model,): counters[name] for model, counters in _cache_counters().items()}
+    return collect
+
+
+for _stat, _kind, _help in (
+    ("hits", "counter", "Predictions served from the in-process cache"),
+    ("misses", "counter", "Predictions that required inference"),
+    ("coalesced", "counter", "Misses that waited on an identical in-flight prediction"),
+    ("disk_hits", "counter", "Predictions served from the disk cache"),
+    ("evictions", "counter", "Entries evicted from the in-process cache"),
+    ("entries", "gauge", "Entries in the in-process cache"),
+    ("hit_ratio", "gauge", "Fraction of lookups served without new inference"),
+):
+    metrics.collected(
+        f"prediction_cache_{_stat}" + ("_total" if _kind == "counter" else ""),
+        _help, _kind, ("model",), _collect_cache_stat(_stat)
+    )
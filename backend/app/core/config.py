@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional, Tuple
 import os
 
 
@@ -11,12 +11,82 @@ class Settings(BaseSettings):
     PORT: int = 8000
     RELOAD: bool = True
     LOG_LEVEL: str = "info"
+    WORKERS: int = 1  # > 1 runs the pre-fork server sharing model weights between workers
+    PRELOAD_MODEL: bool = True  # load the default model once in the pre-fork parent
+    WORKER_MEMORY_REPORT_SECONDS: float = 300.0  # pre-fork memory report interval; 0 = startup only
+    WORKER_GRACEFUL_TIMEOUT: float = 30.0  # seconds a stopping worker may finish requests
     
     # Model Configuration
     MODEL_NAME: str = "distilbert-base-uncased-finetuned-sst-2-english"
     TOKENIZER_NAME: str = "distilbert-base-uncased"
+    USE_FAST_TOKENIZER: bool = True
     DEVICE: str = "auto"  # auto, cuda, cpu
+    QUANTIZATION: str = "none"  # none, dynamic_int8 (CPU only)
+    BACKEND: str = "pytorch"  # pytorch, torchscript, onnx
+    ARTIFACT_DIR: str = "artifacts"  # exported models, relative to the backend directory
+    USE_MODEL_SNAPSHOT: bool = True  # load the local snapshot offline when it exists
     MAX_SEQUENCE_LENGTH: int = 512
+    MAX_BATCH_TOKENS: int = 8192  # padded tokens per forward pass
+    
+    # Truncation
+    TRUNCATION_STRATEGY: str = "head"  # head, head_tail
+    TRUNCATION_HEAD_RATIO: float = 0.25  # head_tail: share of kept tokens taken from the start
+    FAST_MAX_SEQUENCE_LENGTH: int = 128  # token cap for requests that choose the fast tier
+    
+    # Model Registry
+    MODELS: str = ""  # extra models as comma-separated name=model[|tokenizer] entries
+    MODEL_MEMORY_BUDGET_MB: int = 0  # 0 = never evict models
+    ADMIN_API_KEY: str = ""  # enables /admin endpoints; empty = disabled
+    ADMIN_API_KEY_HEADER: str = "X-Admin-Key"
+    
+    # Startup and Warmup
+    LOAD_MODEL_IN_BACKGROUND: bool = True  # serve /health while loading
+    WARMUP_ENABLED: bool = True
+    WARMUP_SEQUENCE_LENGTHS: str = "16,64,128,512"
+    WARMUP_BATCH_SIZE: int = 4
+    WARMUP_ITERATIONS: int = 2
+    
+    # Inference executor
+    INFERENCE_WORKERS: int = 1
+    INFERENCE_QUEUE_SIZE: int = 64  # running + waiting calls before 503
+    INFERENCE_TORCH_THREADS: int = 0  # intra-op threads per inference worker; 0 = cores split between workers
+    INFERENCE_INTEROP_THREADS: int = 0  # 0 = torch default
+    CPU_AFFINITY: str = ""  # pin inference to cores: empty = off, auto = all allowed cores, or a list like 0-7
+    INFERENCE_PRIORITY_WEIGHTS: str = "interactive:8,batch:2,background:1"  # worker share under contention
+    PRIORITY_HEADER: str = "X-Priority"  # lets clients lower a request's priority class
+    
+    # Micro-batching (single-text /analyze requests)
+    MICRO_BATCH_MAX_SIZE: int = 16
+    MICRO_BATCH_MAX_WAIT_MS: float = 5.0
+    MICRO_BATCH_QUEUE_SIZE: int = 1024
+    
+    # Streaming Analysis
+    STREAM_BATCH_SIZE: int = 64  # texts per inference call for /analyze/stream
+    STREAM_PREFETCH_BATCHES: int = 2  # parsed batches buffered ahead of inference
+    STREAM_MAX_LINE_BYTES: int = 65536
+
+    # Background Jobs
+    JOBS_ENABLED: bool = True
+    JOBS_DB_PATH: str = "jobs/jobs.db"  # relative to the backend directory
+    JOBS_WORKERS: int = 1  # jobs processed concurrently
+    JOBS_CHUNK_SIZE: int = 32  # texts per inference call for jobs
+    JOBS_MAX_TEXTS: int = 1000000  # texts per submitted job
+    JOBS_YIELD_MS: float = 200.0  # max wait per chunk while interactive requests are queued
+    JOBS_RETENTION_HOURS: float = 24.0  # 0 = keep finished jobs forever
+    JOBS_LEASE_SECONDS: float = 30.0  # a crashed process's jobs are resumed elsewhere after this long
+    
+    # Prediction Cache
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_MAX_BYTES: int = 0  # 0 = no byte limit
+    CACHE_TTL_SECONDS: float = 0  # 0 = entries never expire
+    DISK_CACHE_ENABLED: bool = False
+    DISK_CACHE_DIR: str = "cache/predictions"  # relative to the backend directory
+    DISK_CACHE_SIZE_LIMIT_MB: int = 512
+    
+    # Metrics
+    METRICS_ENABLED: bool = True
+    SYSTEM_SAMPLE_INTERVAL_SECONDS: float = 5.0  # background CPU/memory sampling for /health
     
     # CORS Configuration
     CORS_ORIGINS: str = "*"
@@ -25,6 +95,14 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW: int = 60  # seconds
+    RATE_LIMIT_API_KEY_HEADER: str = "X-API-Key"
+    RATE_LIMIT_API_KEYS: str = ""  # comma-separated key:limit pairs
+    RATE_LIMIT_MAX_CLIENTS: int = 100000  # memory backend only
+    RATE_LIMIT_BACKEND: str = "memory"  # memory, local or redis
+    RATE_LIMIT_LOCAL_PATH: str = ""  # local backend database, defaults to /dev/shm
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_KEY_PREFIX: str = "sentiment-api:ratelimit"
+    RATE_LIMIT_EXEMPT_PATHS: str = "/health/live,/health/ready"  # comma-separated
     
     # Application Settings
     APP_NAME: str = "DistilBERT Sentiment Analysis API"
@@ -41,6 +119,51 @@ class Settings(BaseSettings):
         if self.CORS_ORIGINS == "*":
             return ["*"]
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+    
+    @property
+    def warmup_sequence_lengths_list(self) -> List[int]:
+        """Convert WARMUP_SEQUENCE_LENGTHS string to list of ints"""
+        return [int(length) for length in self.WARMUP_SEQUENCE_LENGTHS.split(",") if length.strip()]
+
+    
+    @property
+    def rate_limit_exempt_paths_list(self) -> List[str]:
+        """Convert RATE_LIMIT_EXEMPT_PATHS string to list"""
+        return [path.strip() for path in self.RATE_LIMIT_EXEMPT_PATHS.split(",") if path.strip()]
+    
+    @property
+    def rate_limit_api_keys_map(self) -> Dict[str, int]:
+        """Convert RATE_LIMIT_API_KEYS "key:limit" pairs to a dict"""
+        limits = {}
+        for pair in self.RATE_LIMIT_API_KEYS.split(","):
+            if not pair.strip():
+                continue
+            key, _, limit = pair.strip().rpartition(":")
+            limits[key] = int(limit)
+        return limits
+    
+    @property
+    def models_map(self) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Convert MODELS "name=model[|tokenizer]" entries to a dict"""
+        models = {}
+        for entry in self.MODELS.split(","):
+            if not entry.strip():
+                continue
+            name, _, source = entry.strip().partition("=")
+            model_name, _, tokenizer_name = source.strip().partition("|")
+            models[name.strip()] = (model_name.strip(), tokenizer_name.strip() or None)
+        return models
+    
+    @property
+    def inference_priority_weights_map(self) -> Dict[str, int]:
+        """Convert INFERENCE_PRIORITY_WEIGHTS "class:weight" pairs to a dict"""
+        weights = {}
+        for pair in self.INFERENCE_PRIORITY_WEIGHTS.split(","):
+            if not pair.strip():
+                continue
+            name, _, weight = pair.strip().partition(":")
+            weights[name.strip().lower()] = int(weight)
+        return weights
 
 
 # Global settings instance
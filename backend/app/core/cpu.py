@@ -0,0 +1,112 @@
+import logging
+import os
+import threading
+from typing import List, Optional
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_interop_lock = threading.Lock()
+_interop_configured = False
+
+
+def available_cpus() -> List[int]:
+    """CPU cores this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def parse_cpu_list(value: str) -> List[int]:
+    """Parse a core list such as "0-3,8,10-11" """
+    cpus = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return sorted(set(cpus))
+
+
+def cpu_pool() -> Optional[List[int]]:
+    """Cores inference is pinned to per CPU_AFFINITY, or None when pinning is off"""
+    value = settings.CPU_AFFINITY.strip().lower()
+    if not value or value == "none":
+        return None
+    if value == "auto":
+        return available_cpus()
+    return parse_cpu_list(value)
+
+
+def split_cpus(cpus: List[int], parts: int) -> List[List[int]]:
+    """
+    Split cores into ``parts`` contiguous, equally sized blocks
+
+    Neighbouring core numbers usually share caches, so contiguous blocks
+    keep each worker's threads close together. Left-over cores are unused;
+    with fewer cores than parts, blocks share single cores round-robin.
+    """
+    parts = max(1, parts)
+    size = len(cpus) // parts
+    if size == 0:
+        return [[cpus[index % len(cpus)]] for index in range(parts)]
+    return [cpus[index * size:(index + 1) * size] for index in range(parts)]
+
+
+def pin_current_thread(cpus: Optional[List[int]]) -> bool:
+    """
+    Restrict the calling thread, and threads it starts later, to the cores
+
+    Returns False where thread affinity is not supported (macOS, Windows).
+    """
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, cpus)
+    except OSError as e:
+        logger.warning(f"Could not pin to CPUs {cpus}: {str(e)}")
+        return False
+    return True
+
+
+def default_intra_op_threads(processes: int = 1) -> int:
+    """
+    Intra-op threads for each inference thread when not configured
+
+    Cores (the CPU_AFFINITY pool if set) are split evenly between server
+    processes and their inference worker threads, so they do not compete
+    for the same cores.
+    """
+    cores = len(cpu_pool() or available_cpus())
+    return max(1, cores // (max(1, processes) * max(1, settings.INFERENCE_WORKERS)))
+
+
+def intra_op_threads(processes: int = 1) -> int:
+    """Configured INFERENCE_TORCH_THREADS, or the default split of the cores"""
+    return settings.INFERENCE_TORCH_THREADS or default_intra_op_threads(processes)
+
+
+def configure_torch_threads(intra_op: int) -> None:
+    """
+    Set torch's intra-op threads for the calling thread and, once per
+    process, its inter-op threads (INFERENCE_INTEROP_THREADS)
+
+    The inter-op count can only be set before torch runs any inter-op
+    work; later calls keep the count already in effect.
+    """
+    global _interop_configured
+    import torch
+
+    torch.set_num_threads(max(1, intra_op))
+
+    with _interop_lock:
+        if _interop_configured or settings.INFERENCE_INTEROP_THREADS <= 0:
+            return
+        _interop_configured = True
+        try:
+            torch.set_num_interop_threads(settings.INFERENCE_INTEROP_THREADS)
+        except RuntimeError as e:
+            logger.warning(f"INFERENCE_INTEROP_THREADS not applied: {str(e)}")
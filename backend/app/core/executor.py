@@ -0,0 +1,244 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .config import settings
+from .cpu import configure_torch_threads, cpu_pool, intra_op_threads, pin_current_thread, split_cpus
+from .metrics import INFERENCE_CALL_DURATION, INFERENCE_SCHEDULER_WAIT, metrics, model_label
+
+
+logger = logging.getLogger(__name__)
+
+
+# Priority classes, highest first
+PRIORITY_CLASSES = ("interactive", "batch", "background")
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the inference queue cannot accept more work"""
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool that runs blocking inference off the event loop
+
+    At most ``max_pending`` calls may be running or waiting at once;
+    further calls are rejected with QueueFullError so callers can shed
+    load instead of queueing without limit.
+
+    Each call belongs to a priority class (interactive, batch or
+    background) with its own wait queue. When every worker is busy,
+    freed workers go to the queues by weighted fair scheduling (stride
+    scheduling): under contention each class gets a share of workers
+    proportional to its weight, and no class is starved. Calls already
+    running are never preempted.
+
+    Each worker thread runs torch with ``torch_threads`` intra-op threads.
+    Given ``cpus``, the workers split those cores into equal blocks and pin
+    themselves, and the torch threads they start, to one block each.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_pending: int = 64,
+        torch_threads: int = 1,
+        weights: Optional[Dict[str, int]] = None,
+        cpus: Optional[List[int]] = None
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self.torch_threads = max(1, torch_threads)
+        self.cpus = cpus
+        self.weights = {name: max(1, (weights or {}).get(name, 1)) for name in PRIORITY_CLASSES}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._thread_index = itertools.count()
+
+        # Scheduler state, only touched from the event loop
+        self._running = 0
+        self._waiting: Dict[str, Deque[asyncio.Future]] = {name: deque() for name in PRIORITY_CLASSES}
+        self._passes = {name: 0.0 for name in PRIORITY_CLASSES}
+        self._virtual_time = 0.0
+        # Wait and call latency series per (model, priority), bound on first use
+        self._series: Dict[Tuple[str, str], tuple] = {}
+
+    def start(self) -> None:
+        """Create the worker thread pool"""
+        if self._pool is not None:
+            return
+
+        self._thread_index = itertools.count()
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inference",
+            initializer=self._init_worker
+        )
+        logger.info(
+            f"Inference executor started: workers={self.max_workers}, "
+            f"max_pending={self.max_pending}, torch_threads={self.torch_threads}, "
+            f"cpus={_format_cpus(self.cpus)}, weights={self.weights}"
+        )
+
+    def shutdown(self) -> None:
+        """Wait for running work to finish and release the pool"""
+        if self._pool is None:
+            return
+
+        for queue in self._waiting.values():
+            while queue:
+                future = queue.popleft()
+                if not future.done():
+                    future.set_exception(RuntimeError("Inference service is shutting down"))
+
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._pool = None
+        logger.info("Inference executor stopped")
+
+    def _init_worker(self) -> None:
+        """Pin each worker thread to its cores and configure torch threading"""
+        index = next(self._thread_index)
+        if self.cpus:
+            pin_current_thread(split_cpus(self.cpus, self.max_workers)[index % self.max_workers])
+        configure_torch_threads(self.torch_threads)
+
+    def pending(self) -> int:
+        """Number of calls currently running or waiting for a worker"""
+        return self._pending
+
+    def waiting(self, priority: str) -> int:
+        """Number of calls of a priority class waiting for a worker"""
+        return len(self._waiting[priority])
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        priority: str = "interactive",
+        model: Optional[str] = None
+    ) -> Any:
+        """
+        Run a blocking function on the pool and await its result
+
+        Args:
+            func: Blocking function to run
+            *args: Arguments for ``func``
+            priority: Priority class (interactive, batch or background)
+            model: Model name for the latency metrics (default: MODEL_NAME)
+
+        Raises:
+            QueueFullError: If max_pending calls are already in flight
+        """
+        if self._pool is None:
+            raise RuntimeError("Inference executor is not running")
+        if priority not in self._waiting:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(
+                    f"Inference queue is full ({self.max_pending} pending calls)"
+                )
+            self._pending += 1
+
+        wait_seconds, call_seconds = self._latency_series(model or model_label(), priority)
+        started = time.perf_counter()
+        try:
+            await self._acquire(priority)
+            wait_seconds.observe(time.perf_counter() - started)
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._pool, func, *args)
+            finally:
+                self._release()
+        finally:
+            with self._lock:
+                self._pending -= 1
+            call_seconds.observe(time.perf_counter() - started)
+
+    def _latency_series(self, model: str, priority: str) -> tuple:
+        """Scheduler wait and call duration series for a model and priority class"""
+        series = self._series.get((model, priority))
+        if series is None:
+            series = self._series[(model, priority)] = (
+                INFERENCE_SCHEDULER_WAIT.labels(model, priority),
+                INFERENCE_CALL_DURATION.labels(model, priority)
+            )
+        return series
+
+    async def _acquire(self, priority: str) -> None:
+        """Wait until the scheduler hands this call a worker"""
+        if self._running < self.max_workers and not any(self._waiting.values()):
+            self._running += 1
+            return
+
+        queue = self._waiting[priority]
+        if not queue:
+            # A class returning from idle starts at the current virtual
+            # time rather than spending credit saved up while idle
+            self._passes[priority] = max(self._passes[priority], self._virtual_time)
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Granted a worker just as the caller went away; pass it on
+                self._release()
+            elif future in queue:
+                # _release may already have popped (and skipped) it
+                queue.remove(future)
+            raise
+
+    def _release(self) -> None:
+        """Free a worker and grant it to the next waiting call"""
+        self._running -= 1
+        while self._running < self.max_workers:
+            waiting = [name for name in PRIORITY_CLASSES if self._waiting[name]]
+            if not waiting:
+                return
+
+            # Lowest pass wins; ties go to the higher priority class
+            name = min(waiting, key=self._passes.__getitem__)
+            future = self._waiting[name].popleft()
+            if future.done():
+                continue
+
+            self._virtual_time = self._passes[name]
+            self._passes[name] += 1.0 / self.weights[name]
+            self._running += 1
+            future.set_result(None)
+
+
+def _format_cpus(cpus: Optional[List[int]]) -> str:
+    if not cpus:
+        return "unpinned"
+    if len(cpus) > 1 and cpus == list(range(cpus[0], cpus[-1] + 1)):
+        return f"{cpus[0]}-{cpus[-1]}"
+    return ",".join(map(str, cpus))
+
+
+# Global inference executor instance
+inference_executor = InferenceExecutor(
+    max_workers=settings.INFERENCE_WORKERS,
+    max_pending=settings.INFERENCE_QUEUE_SIZE,
+    torch_threads=intra_op_threads(),
+    weights=settings.inference_priority_weights_map,
+    cpus=cpu_pool()
+)
+
+metrics.collected(
+    "inference_executor_pending", "Inference calls running or waiting for a worker", "gauge",
+    (), lambda: {(): inference_executor.pending()}
+)
+metrics.collected(
+    "inference_executor_waiting", "Inference calls waiting for a worker, by priority class", "gauge",
+    ("priority",), lambda: {(name,): inference_executor.waiting(name) for name in PRIORITY_CLASSES}
+)
@@ -0,0 +1,525 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from .config import settings
+from .executor import inference_executor, QueueFullError
+from .batcher import micro_batcher
+from .model_registry import model_registry
+from .metrics import metrics
+from .streaming import StreamItem
+from app.utils.helpers import format_confidence
+
+
+logger = logging.getLogger(__name__)
+
+# receiving: body still being read; queued/running/completed/failed/cancelled after
+JOB_STATES = ("receiving", "queued", "running", "completed", "failed", "cancelled")
+
+# Rows written per transaction while a job body is being ingested
+_INSERT_BATCH = 1000
+
+# Polling interval while waiting for the model or for interactive traffic
+_POLL_SECONDS = 0.01
+
+
+class JobStore:
+    """
+    SQLite persistence for jobs and their per-text results
+
+    All methods are blocking; JobManager calls them through
+    ``asyncio.to_thread``. One connection is shared behind a lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                model TEXT,
+                tier TEXT,
+                total INTEGER NOT NULL DEFAULT 0,
+                processed INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                owner TEXT,
+                lease_until REAL
+            );
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                item_id TEXT,
+                text TEXT,
+                sentiment TEXT,
+                confidence REAL,
+                error TEXT,
+                done INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS job_items_pending ON job_items (job_id, done, idx);
+            """
+        )
+        # Databases created before jobs could name a model or tier, or had owners
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("model", "TEXT"), ("tier", "TEXT"), ("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+
+    def create(
+        self,
+        job_id: str,
+        model: Optional[str] = None,
+        tier: Optional[str] = None,
+        owner: Optional[str] = None,
+        lease_until: Optional[float] = None
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, model, tier, created_at, owner, lease_until) "
+                "VALUES (?, 'receiving', ?, ?, ?, ?, ?)",
+                (job_id, model, tier, time.time(), owner, lease_until)
+            )
+
+    def add_items(self, job_id: str, start: int, items: List[StreamItem]) -> None:
+        """Insert parsed items; invalid ones are stored as already processed"""
+        rows = [
+            (
+                job_id, start + offset,
+                json.dumps(item.id) if item.id is not None else None,
+                item.text, item.error, 1 if item.error else 0
+            )
+            for offset, item in enumerate(items)
+        ]
+        failed = sum(1 for item in items if item.error)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO job_items (job_id, idx, item_id, text, error, done) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "UPDATE jobs SET total = total + ?, processed = processed + ?, failed = failed + ? WHERE id = ?",
+                (len(items), failed, failed, job_id)
+            )
+            self._conn.execute("COMMIT")
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            if status == "running":
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = COALESCE(started_at, ?) WHERE id = ?",
+                    (status, now, job_id)
+                )
+            elif status in ("completed", "failed", "cancelled"):
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                    (status, error, now, job_id)
+                )
+            else:
+                self._conn.execute("UPDATE jobs SET status = ? WHERE id = ?", (status, job_id))
+
+    def next_items(self, job_id: str, limit: int) -> List[Tuple[int, str]]:
+        """Unprocessed (index, text) pairs in input order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, text FROM job_items WHERE job_id = ? AND done = 0 ORDER BY idx LIMIT ?",
+                (job_id, limit)
+            ).fetchall()
+        return [(row["idx"], row["text"]) for row in rows]
+
+    def save_results(self, job_id: str, results: List[Tuple[int, Optional[str], Optional[float], Optional[str]]]) -> None:
+        """Store (index, sentiment, confidence, error) results and update progress"""
+        failed = sum(1 for _, _, _, error in results if error)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "UPDATE job_items SET sentiment = ?, confidence = ?, error = ?, done = 1 "
+                "WHERE job_id = ? AND idx = ?",
+                [(sentiment, confidence, error, job_id, index) for index, sentiment, confidence, error in results]
+            )
+            self._conn.execute(
+                "UPDATE jobs SET processed = processed + ?, failed = failed + ? WHERE id = ?",
+                (len(results), failed, job_id)
+            )
+            self._conn.execute("COMMIT")
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def results(self, job_id: str, offset: int, limit: int) -> List[dict]:
+        """A page of items in input order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idx, item_id, text, sentiment, confidence, error, done FROM job_items "
+                "WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT ?",
+                (job_id, offset, limit)
+            ).fetchall()
+        return [
+            {
+                "index": row["idx"],
+                "id": json.loads(row["item_id"]) if row["item_id"] is not None else None,
+                "text": row["text"],
+                "sentiment": row["sentiment"],
+                "confidence": row["confidence"],
+                "error": row["error"],
+                "done": bool(row["done"]),
+            }
+            for row in rows
+        ]
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self._conn.execute("COMMIT")
+
+    def claim(self, owner: str, lease_until: float) -> List[str]:
+        """
+        Take over unfinished jobs whose owner's lease has run out
+
+        Each process serving jobs renews the lease on the jobs it owns;
+        once a lease lapses, the owner has stopped or died. Orphaned jobs
+        whose body was never fully received are dropped; orphaned queued
+        and running jobs now belong to ``owner`` and are returned, oldest
+        first, to be resumed. Several processes may share the database:
+        the claim is one write transaction, so no job is claimed twice.
+        """
+        now = time.time()
+        expired = "(lease_until IS NULL OR lease_until < ?) AND (owner IS NULL OR owner != ?)"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                partial = [row["id"] for row in self._conn.execute(
+                    f"SELECT id FROM jobs WHERE status = 'receiving' AND {expired}", (now, owner)
+                )]
+                resumable = [row["id"] for row in self._conn.execute(
+                    f"SELECT id FROM jobs WHERE status IN ('queued', 'running') AND {expired} "
+                    "ORDER BY created_at",
+                    (now, owner)
+                )]
+                for job_id in partial:
+                    self._conn.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+                    self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                self._conn.executemany(
+                    "UPDATE jobs SET owner = ?, lease_until = ? WHERE id = ?",
+                    [(owner, lease_until, job_id) for job_id in resumable]
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return resumable
+
+    def renew(self, owner: str, lease_until: float) -> None:
+        """Extend the lease on every unfinished job ``owner`` holds"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status IN ('receiving', 'queued', 'running')",
+                (lease_until, owner)
+            )
+
+    def release(self, owner: str) -> None:
+        """Let other processes claim ``owner``'s unfinished jobs right away"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET lease_until = NULL WHERE owner = ? AND status IN ('receiving', 'queued', 'running')",
+                (owner,)
+            )
+
+    def expired(self, older_than: float) -> List[str]:
+        """Finished jobs that ended before the given timestamp"""
+        with self._lock:
+            return [row["id"] for row in self._conn.execute(
+                "SELECT id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (older_than,)
+            )]
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobManager:
+    """
+    Run large batch jobs in the background through the batched inference path
+
+    Submitted texts are written to SQLite first, so jobs survive restarts
+    and resume from their first unprocessed text. Every job is leased to
+    the process that accepted it, which renews the lease while it runs;
+    when a process stops or dies, any process sharing the database claims
+    its unfinished jobs once the lease has lapsed (at once after a clean
+    stop, within ``lease_seconds`` after a crash). ``max_workers`` jobs run
+    at once, each sending one chunk of ``chunk_size`` texts at a time to
+    the inference executor in the background priority class. Before each chunk a worker yields to
+    interactive traffic: it waits (up to ``yield_ms``) while single-text
+    requests are queued or every executor worker is busy.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_workers: int = 1,
+        chunk_size: int = 32,
+        yield_ms: float = 200.0,
+        lease_seconds: float = 30.0
+    ):
+        self.db_path = db_path
+        self.max_workers = max(1, max_workers)
+        self.chunk_size = max(1, chunk_size)
+        self.max_yield = max(0.0, yield_ms) / 1000.0
+        self.lease_seconds = max(1.0, lease_seconds)
+        self.owner = uuid.uuid4().hex
+        self.store: Optional[JobStore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._lease_task: Optional[asyncio.Task] = None
+        self._cancelled: Set[str] = set()
+
+    async def start(self) -> None:
+        """Open the job database, re-queue unfinished jobs and start workers"""
+        if self._workers:
+            return
+
+        self.store = await asyncio.to_thread(JobStore, self.db_path)
+        self._queue = asyncio.Queue()
+        # A fresh owner each start: the previous run's leases are not ours
+        self.owner = uuid.uuid4().hex
+
+        await self.purge_expired()
+        resumed = await self._claim_orphaned()
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+        self._lease_task = asyncio.create_task(self._keep_leases())
+        logger.info(
+            f"Job manager started: workers={self.max_workers}, chunk_size={self.chunk_size}, "
+            f"lease={self.lease_seconds:g}s, resumed={resumed}, db={self.db_path}"
+        )
+
+    async def stop(self) -> None:
+        """Stop workers and release their jobs to other processes or the next start"""
+        if not self._workers:
+            return
+
+        for task in self._workers + [self._lease_task]:
+            task.cancel()
+        await asyncio.gather(*self._workers, self._lease_task, return_exceptions=True)
+        self._workers = []
+        self._lease_task = None
+        await asyncio.to_thread(self.store.release, self.owner)
+        await asyncio.to_thread(self.store.close)
+        logger.info("Job manager stopped")
+
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    async def create_job(self, model: Optional[str] = None, tier: Optional[str] = None) -> str:
+        """Create a job in the receiving state and return its id"""
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self.store.create, job_id, model, tier, self.owner, self._lease_until())
+        return job_id
+
+    async def add_items(self, job_id: str, start: int, items: List[StreamItem]) -> None:
+        """Append items to a job that is still receiving"""
+        for offset in range(0, len(items), _INSERT_BATCH):
+            await asyncio.to_thread(
+                self.store.add_items, job_id, start + offset, items[offset:offset + _INSERT_BATCH]
+            )
+
+    async def ingest(
+        self, job_id: str, batches: AsyncIterator[List[StreamItem]], max_texts: int
+    ) -> Tuple[int, int]:
+        """
+        Store streamed batches of parsed items for a receiving job
+
+        Returns the number of items and of valid texts stored. Raises
+        ValueError once more than ``max_texts`` items have been sent.
+        """
+        total = valid = 0
+        pending: List[StreamItem] = []
+        async for batch in batches:
+            pending.extend(batch)
+            if total + len(pending) > max_texts:
+                raise ValueError(f"Job exceeds {max_texts} texts")
+            if len(pending) >= _INSERT_BATCH:
+                await self.add_items(job_id, total, pending)
+                total += len(pending)
+                valid += sum(1 for item in pending if item.text is not None)
+                pending = []
+        if pending:
+            await self.add_items(job_id, total, pending)
+            total += len(pending)
+            valid += sum(1 for item in pending if item.text is not None)
+        return total, valid
+
+    async def submit(self, job_id: str) -> None:
+        """Mark a fully received job as queued and hand it to the workers"""
+        await asyncio.to_thread(self.store.set_status, job_id, "queued")
+        self._queue.put_nowait(job_id)
+
+    async def discard(self, job_id: str) -> None:
+        """Drop a job whose body could not be received"""
+        await asyncio.to_thread(self.store.delete, job_id)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def results(self, job_id: str, offset: int, limit: int) -> List[dict]:
+        return await asyncio.to_thread(self.store.results, job_id, offset, limit)
+
+    async def delete(self, job_id: str) -> None:
+        """Cancel a job if it is running and delete it with its results"""
+        job = await self.get(job_id)
+        if job is not None and job["status"] in ("queued", "running"):
+            self._cancelled.add(job_id)
+        await asyncio.to_thread(self.store.delete, job_id)
+
+    async def purge_expired(self) -> None:
+        """Delete finished jobs older than JOBS_RETENTION_HOURS"""
+        if settings.JOBS_RETENTION_HOURS <= 0:
+            return
+        cutoff = time.time() - settings.JOBS_RETENTION_HOURS * 3600
+        for job_id in await asyncio.to_thread(self.store.expired, cutoff):
+            await asyncio.to_thread(self.store.delete, job_id)
+
+    def queue_depth(self) -> int:
+        """Jobs waiting for a worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _lease_until(self) -> float:
+        return time.time() + self.lease_seconds
+
+    async def _claim_orphaned(self) -> int:
+        """Queue the unfinished jobs of processes that stopped renewing their leases"""
+        claimed = await asyncio.to_thread(self.store.claim, self.owner, self._lease_until())
+        for job_id in claimed:
+            self._queue.put_nowait(job_id)
+        if claimed and self._workers:
+            logger.info(f"Resuming {len(claimed)} jobs left by a stopped process")
+        return len(claimed)
+
+    async def _keep_leases(self) -> None:
+        """Renew this process's leases and pick up orphaned jobs until cancelled"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.store.renew, self.owner, self._lease_until())
+                await self._claim_orphaned()
+            except sqlite3.Error as e:
+                logger.warning(f"Renewing job leases failed: {str(e)}")
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {str(e)}")
+                await asyncio.to_thread(self.store.set_status, job_id, "failed", str(e))
+            finally:
+                self._cancelled.discard(job_id)
+
+    async def _process(self, job_id: str) -> None:
+        """Process a job chunk by chunk until no unprocessed texts remain"""
+        job = await self.get(job_id)
+        if job is None:
+            return
+
+        await asyncio.to_thread(self.store.set_status, job_id, "running")
+        started = time.perf_counter()
+        processed = 0
+
+        while job_id not in self._cancelled:
+            items = await asyncio.to_thread(self.store.next_items, job_id, self.chunk_size)
+            if not items:
+                break
+
+            await self._yield_to_interactive()
+            texts = [text for _, text in items]
+            # Loads the job's model on first use; a load failure fails the job
+            async with model_registry.use(job["model"]) as model:
+                try:
+                    predictions = await model_registry.predict(
+                        model, texts, job["tier"] or "standard", "background"
+                    )
+                    results = [
+                        (index, sentiment, format_confidence(confidence), None)
+                        for (index, _), (sentiment, confidence) in zip(items, predictions)
+                    ]
+                except QueueFullError:
+                    await asyncio.sleep(_POLL_SECONDS)
+                    continue
+                except Exception as e:
+                    logger.error(f"Error during job {job_id} inference: {str(e)}")
+                    results = [(index, None, None, f"Error analyzing sentiment: {str(e)}") for index, _ in items]
+
+            if job_id in self._cancelled:
+                break
+            await asyncio.to_thread(self.store.save_results, job_id, results)
+            processed += len(results)
+
+        if job_id in self._cancelled:
+            logger.info(f"Job {job_id} cancelled")
+            return
+
+        await asyncio.to_thread(self.store.set_status, job_id, "completed")
+        elapsed = time.perf_counter() - started
+        logger.info(f"Job {job_id} completed: {processed} texts in {elapsed:.1f}s")
+        await self.purge_expired()
+
+    async def _yield_to_interactive(self) -> None:
+        """Wait briefly while interactive requests are queued or workers are busy"""
+        deadline = time.monotonic() + self.max_yield
+        while time.monotonic() < deadline and (
+            micro_batcher.queue_depth() > 0
+            or inference_executor.pending() >= inference_executor.max_workers
+        ):
+            await asyncio.sleep(_POLL_SECONDS)
+
+
+def _resolve_db_path() -> str:
+    path = Path(settings.JOBS_DB_PATH)
+    if not path.is_absolute():
+        path = Path(__file__).parent.parent.parent / path
+    return str(path)
+
+
+# Global job manager instance
+job_manager = JobManager(
+    db_path=_resolve_db_path(),
+    max_workers=settings.JOBS_WORKERS,
+    chunk_size=settings.JOBS_CHUNK_SIZE,
+    yield_ms=settings.JOBS_YIELD_MS,
+    lease_seconds=settings.JOBS_LEASE_SECONDS
+)
+
+metrics.collected(
+    "jobs_queued", "Jobs waiting for a job worker", "gauge",
+    (), lambda: {(): job_manager.queue_depth()}
+)
@@ -0,0 +1,284 @@
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from .config import settings
+
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow batches
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+TOKEN_BUCKETS = (8, 16, 32, 64, 128, 256, 384, 512)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """Render a Prometheus label set"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    """Render a sample value"""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class CounterChild:
+    """A single labeled counter series"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class HistogramChild:
+    """A single labeled histogram series with fixed buckets"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Metric:
+    """Base class for a metric family keyed by label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        """
+        Get (or create) the series for a label set
+
+        Callers on the hot path should keep the returned child instead of
+        looking it up on every observation.
+        """
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter family"""
+
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def render(self) -> List[str]:
+        lines = []
+        for values, child in list(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}{labels} {_format_number(child.value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Histogram family with fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def render(self) -> List[str]:
+        lines = []
+        for values, child in list(self._children.items()):
+            counts = list(child.counts)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_number(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_number(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CollectedMetric(_Metric):
+    """
+    Gauge or counter family whose samples come from a callback at scrape
+    time, for values that already live elsewhere (queue depth, cache stats)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: Iterable[str],
+        collect: Callable[[], Dict[Tuple[str, ...], float]]
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, values)} {_format_number(value)}"
+            for values, value in self.collect().items()
+            if value is not None
+        ]
+
+
+class MetricsRegistry:
+    """
+    Minimal Prometheus-compatible metrics registry
+
+    Observations are plain attribute updates on pre-bound series objects:
+    no locks and no string formatting happen until scrape time. Updates
+    from concurrent inference threads rely on the GIL and may, rarely,
+    lose an increment, which is acceptable for monitoring.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._scrapes = 0
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def collected(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: Iterable[str],
+        collect: Callable[[], Dict[Tuple[str, ...], float]]
+    ) -> CollectedMetric:
+        return self.register(CollectedMetric(name, documentation, kind, labelnames, collect))
+
+    def per_scrape(self, func: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        Wrap a function so it runs at most once per render(), for
+        collectors of several families that read the same source
+        """
+        cached = {"scrape": None, "value": None}
+
+        def wrapper():
+            if cached["scrape"] != self._scrapes:
+                cached["value"] = func()
+                cached["scrape"] = self._scrapes
+            return cached["value"]
+        return wrapper
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        self._scrapes += 1
+        lines = []
+        for metric in list(self._metrics):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry and metric families
+metrics = MetricsRegistry()
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests by route, method and status", ("route", "method", "status")
+)
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("route", "method")
+)
+INFERENCE_TOKENIZE_SECONDS = metrics.histogram(
+    "inference_tokenize_seconds", "Time spent tokenizing a batch", ("model",)
+)
+INFERENCE_FORWARD_SECONDS = metrics.histogram(
+    "inference_forward_seconds", "Time spent in model forward passes for a batch", ("model",)
+)
+INFERENCE_POSTPROCESS_SECONDS = metrics.histogram(
+    "inference_postprocess_seconds", "Time spent on softmax and result conversion for a batch", ("model",)
+)
+INFERENCE_BATCH_SIZE = metrics.histogram(
+    "inference_batch_size", "Texts per inference batch", ("model",), BATCH_SIZE_BUCKETS
+)
+INFERENCE_TOKENS_PER_TEXT = metrics.histogram(
+    "inference_tokens_per_text", "Tokens per analyzed text after truncation", ("model",), TOKEN_BUCKETS
+)
+INFERENCE_TEXTS = metrics.counter(
+    "inference_texts_total", "Texts run through the model, by truncation tier", ("model", "tier")
+)
+INFERENCE_TRUNCATED_TEXTS = metrics.counter(
+    "inference_truncated_texts_total", "Texts longer than their tier's token limit, by truncation tier",
+    ("model", "tier")
+)
+INFERENCE_TRUNCATED_TOKENS = metrics.counter(
+    "inference_truncated_tokens_total", "Tokens dropped by truncation, by truncation tier", ("model", "tier")
+)
+INFERENCE_QUEUE_WAIT = metrics.histogram(
+    "inference_queue_wait_seconds", "Time a request waited in the micro-batch queue", ("model",)
+)
+INFERENCE_SCHEDULER_WAIT = metrics.histogram(
+    "inference_scheduler_wait_seconds", "Time an inference call waited for an executor worker, by priority class",
+    ("model", "priority")
+)
+INFERENCE_CALL_DURATION = metrics.histogram(
+    "inference_call_duration_seconds", "Inference call latency including scheduler wait, by priority class",
+    ("model", "priority")
+)
+
+
+def model_label() -> str:
+    """Model label value for inference series"""
+    return settings.MODEL_NAME
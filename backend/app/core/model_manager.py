@@ -1,38 +1,159 @@
-import torch
+import gc
+import hashlib
+import os
+import sys
+import time
 import logging
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
-from typing import Optional, Tuple
+import threading
+import psutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from .config import settings
+from .cache import prediction_cache, PredictionCache
+from .artifacts import artifact_path
+from .metrics import (
+    INFERENCE_BATCH_SIZE,
+    INFERENCE_FORWARD_SECONDS,
+    INFERENCE_POSTPROCESS_SECONDS,
+    INFERENCE_TEXTS,
+    INFERENCE_TOKENIZE_SECONDS,
+    INFERENCE_TOKENS_PER_TEXT,
+    INFERENCE_TRUNCATED_TEXTS,
+    INFERENCE_TRUNCATED_TOKENS
+)
+from app.utils.helpers import preprocess_text
+
+# torch and transformers are imported in load_model(), so tooling that
+# only needs settings (or the app factory) does not pay for them
+if TYPE_CHECKING:
+    import torch
+    from transformers import PreTrainedTokenizerBase
+    from .backends import InferenceBackend
 
 
 logger = logging.getLogger(__name__)
 
+# Requests choose a tier; "fast" caps texts at FAST_MAX_SEQUENCE_LENGTH
+# tokens, bounding the cost per text at some accuracy on long texts
+TRUNCATION_TIERS = ("standard", "fast")
+TRUNCATION_STRATEGIES = ("head", "head_tail")
+
+
+def tier_max_length(tier: str = "standard") -> int:
+    """Token limit per text, special tokens included, for a truncation tier"""
+    if tier not in TRUNCATION_TIERS:
+        raise ValueError(
+            f"Unknown truncation tier '{tier}'. Expected one of: {', '.join(TRUNCATION_TIERS)}"
+        )
+    if tier == "fast":
+        return min(settings.FAST_MAX_SEQUENCE_LENGTH, settings.MAX_SEQUENCE_LENGTH)
+    return settings.MAX_SEQUENCE_LENGTH
+
 
 class ModelManager:
-    """Singleton class to manage ML model loading and inference"""
-    
-    _instance: Optional['ModelManager'] = None
-    _initialized: bool = False
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-    
-    def __init__(self):
-        if not self._initialized:
-            self.tokenizer: Optional[DistilBertTokenizer] = None
-            self.model: Optional[DistilBertForSequenceClassification] = None
-            self.device: Optional[torch.device] = None
-            self._initialized = True
-    
-    def load_model(self) -> None:
-        """Load the sentiment analysis model and tokenizer"""
-        if self.model is not None and self.tokenizer is not None:
-            logger.info("Model already loaded")
+    """
+    Load one sentiment model and run inference on it
+
+    The default model comes from MODEL_NAME/TOKENIZER_NAME; further models
+    are created by the model registry from the MODELS setting.
+    """
+    
+    LABELS = ['NEGATIVE', 'POSITIVE']
+    
+    def __init__(
+        self,
+        name: str = "default",
+        model_name: Optional[str] = None,
+        tokenizer_name: Optional[str] = None
+    ):
+        self.name = name
+        self.model_name = model_name or settings.MODEL_NAME
+        self.tokenizer_name = tokenizer_name or (
+            settings.TOKENIZER_NAME if model_name is None else self.model_name
+        )
+        self.tokenizer: Optional['PreTrainedTokenizerBase'] = None
+        self.model: Optional['torch.nn.Module'] = None
+        self.backend: Optional['InferenceBackend'] = None
+        self.device: Optional['torch.device'] = None
+        self.model_source: Optional[str] = None
+        self.startup_timings: Dict[str, float] = {}
+        self.state: str = "not_loaded"  # not_loaded, loading, warming, ready, failed
+        self.version: Optional[str] = None
+        self.memory_bytes = 0
+        self.last_used: Optional[float] = None
+        self._stats_lock = threading.Lock()
+        self._real_tokens = 0
+        self._padded_tokens = 0
+        self._texts = 0
+        # Per tier: texts run, texts truncated, tokens dropped
+        self._truncation_stats = {tier: [0, 0, 0] for tier in TRUNCATION_TIERS}
+        
+        # Metric series bound once so the hot path does no lookups
+        label = self.model_name
+        self._tokenize_seconds = INFERENCE_TOKENIZE_SECONDS.labels(label)
+        self._forward_seconds = INFERENCE_FORWARD_SECONDS.labels(label)
+        self._postprocess_seconds = INFERENCE_POSTPROCESS_SECONDS.labels(label)
+        self._batch_size = INFERENCE_BATCH_SIZE.labels(label)
+        self._tokens_per_text = INFERENCE_TOKENS_PER_TEXT.labels(label)
+        self._truncation_series = {
+            tier: (
+                INFERENCE_TEXTS.labels(label, tier),
+                INFERENCE_TRUNCATED_TEXTS.labels(label, tier),
+                INFERENCE_TRUNCATED_TOKENS.labels(label, tier)
+            )
+            for tier in TRUNCATION_TIERS
+        }
+    
+    def load_model(self, warmup: bool = True) -> None:
+        """
+        Load the sentiment analysis model and tokenizer
+        
+        Uses the local snapshot written by ``export_model.py --backend snapshot``
+        when present, which loads memory-mapped safetensors weights with no
+        network lookups. After loading, a warmup phase runs synthetic batches
+        before ``is_ready()`` returns True. Time spent in each phase is
+        recorded in ``startup_timings``, and the memory the model added to
+        the process in ``memory_bytes``.
+        
+        With ``warmup=False`` the model stays in the warming state; a later
+        ``load_model()`` call only runs the warmup. The pre-fork server uses
+        this to load weights once in the parent and warm up in each worker.
+        """
+        if self.backend is not None and self.tokenizer is not None:
+            if warmup and self.state == "warming":
+                self._finish_loading({}, time.perf_counter())
+                return
+            logger.info(f"Model {self.name} already loaded")
             return
         
+        timings = {}
+        started = time.perf_counter()
+        self.state = "loading"
+        
         try:
+            if settings.TRUNCATION_STRATEGY not in TRUNCATION_STRATEGIES:
+                raise ValueError(
+                    f"Unknown TRUNCATION_STRATEGY '{settings.TRUNCATION_STRATEGY}'. "
+                    f"Expected one of: {', '.join(TRUNCATION_STRATEGIES)}"
+                )
+            
+            snapshot = artifact_path("snapshot", self.model_name)
+            use_snapshot = settings.USE_MODEL_SNAPSHOT and snapshot.is_dir()
+            if use_snapshot:
+                # local_files_only keeps this load offline without switching
+                # the process to offline mode, so hub models still load later
+                logger.info(f"Using local model snapshot: {snapshot}")
+            
+            # Import heavy dependencies
+            step = time.perf_counter()
+            import torch
+            from transformers import DistilBertForSequenceClassification
+            from .quantization import apply_quantization
+            from .backends import load_backend
+            timings["import"] = time.perf_counter() - step
+            # Measured after the imports, which are shared by every model
+            memory_before = _memory_in_use()
+            
             # Determine device
             if settings.DEVICE == "auto":
                 self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
@@ -42,81 +163,482 @@ class ModelManager:
             logger.info(f"Using device: {self.device}")
             
             # Load tokenizer
-            logger.info(f"Loading tokenizer: {settings.TOKENIZER_NAME}")
-            self.tokenizer = DistilBertTokenizer.from_pretrained(settings.TOKENIZER_NAME)
-            
-            # Load model
-            logger.info(f"Loading model: {settings.MODEL_NAME}")
-            self.model = DistilBertForSequenceClassification.from_pretrained(
-                settings.MODEL_NAME
-            )
+            step = time.perf_counter()
+            tokenizer_source = str(snapshot) if use_snapshot else self.tokenizer_name
+            self.tokenizer = self._load_tokenizer(tokenizer_source, local_files_only=use_snapshot)
+            timings["tokenizer"] = time.perf_counter() - step
             
-            # Move model to device and set to evaluation mode
-            self.model = self.model.to(self.device)
-            self.model.eval()
-            
-            logger.info("Model loaded successfully!")
+            # Load eager model (exported backends load their own artifact)
+            step = time.perf_counter()
+            self.model_source = str(snapshot) if use_snapshot else self.model_name
+            if settings.BACKEND == "pytorch":
+                logger.info(f"Loading model: {self.model_source}")
+                self.model = DistilBertForSequenceClassification.from_pretrained(
+                    self.model_source,
+                    local_files_only=use_snapshot,
+                    low_cpu_mem_usage=use_snapshot
+                )
+                
+                # Move model to device and set to evaluation mode
+                self.model = self.model.to(self.device)
+                self.model.eval()
+                
+                # Quantize for faster CPU inference (if configured)
+                self.model = apply_quantization(self.model, settings.QUANTIZATION, self.device)
+            elif settings.QUANTIZATION != "none":
+                logger.warning(
+                    f"QUANTIZATION={settings.QUANTIZATION} is ignored with BACKEND={settings.BACKEND}"
+                )
             
+            # Create inference backend
+            self.backend = load_backend(settings.BACKEND, self.model, self.device, self.model_name)
+            self.version = self._fingerprint(tokenizer_source)
+            timings["weights"] = time.perf_counter() - step
+            self.memory_bytes = max(0, _memory_in_use() - memory_before)
+            self.state = "warming"
         except Exception as e:
-            logger.error(f"Error loading model: {str(e)}")
-            raise RuntimeError(f"Failed to load model: {str(e)}")
+            self._fail(e)
+        
+        if warmup:
+            self._finish_loading(timings, started)
+        else:
+            self.startup_timings = {name: round(value, 3) for name, value in timings.items()}
+            logger.info(
+                f"Model {self.name} loaded without warmup. Backend: {self.backend.name}, "
+                f"memory: {self.memory_bytes / (1024 * 1024):.0f}MB"
+            )
     
-    def predict_sentiment(self, text: str) -> Tuple[str, float]:
+    def _finish_loading(self, timings: Dict[str, float], started: float) -> None:
+        """Warm up a loaded model, then mark it ready"""
+        try:
+            # Warm up kernels and allocators before accepting traffic
+            step = time.perf_counter()
+            self._warmup()
+            timings["warmup"] = time.perf_counter() - step
+        except Exception as e:
+            self._fail(e)
+        
+        timings["total"] = time.perf_counter() - started
+        # Weights loaded before a fork keep their load timings
+        self.startup_timings = {
+            **self.startup_timings,
+            **{name: round(value, 3) for name, value in timings.items()}
+        }
+        self.state = "ready"
+        
+        logger.info(
+            f"Model {self.name} loaded successfully! Backend: {self.backend.name}, "
+            f"memory: {self.memory_bytes / (1024 * 1024):.0f}MB"
+        )
+        logger.info(
+            "Startup timings: " + ", ".join(
+                f"{name}={value:.2f}s" for name, value in self.startup_timings.items()
+            )
+        )
+    
+    def _fail(self, error: Exception) -> None:
+        self.state = "failed"
+        self.tokenizer = self.model = self.backend = None
+        logger.error(f"Error loading model {self.name}: {str(error)}")
+        raise RuntimeError(f"Failed to load model: {str(error)}")
+    
+    def unload(self) -> None:
+        """Drop the model and tokenizer so their memory can be reclaimed"""
+        if self.backend is None:
+            return
+        
+        device = self.device
+        self.state = "not_loaded"
+        self.tokenizer = self.model = self.backend = None
+        self.memory_bytes = 0
+        gc.collect()
+        if device is not None and device.type == "cuda":
+            import torch
+            torch.cuda.empty_cache()
+        logger.info(f"Model {self.name} unloaded")
+    
+    def _fingerprint(self, tokenizer_source: str) -> str:
+        """
+        Identify the loaded weights so predictions cached for another
+        version are never served
+        
+        Local model directories and exported artifacts are fingerprinted by
+        file names, sizes and modification times; hub models by the commit
+        the weights were resolved to.
+        """
+        if settings.BACKEND != "pytorch":
+            paths = [artifact_path(settings.BACKEND, self.model_name)]
+        elif os.path.exists(self.model_source):
+            paths = [Path(self.model_source)]
+        else:
+            commit = getattr(self.model.config, "_commit_hash", None)
+            return commit[:12] if commit else "unversioned"
+        
+        if tokenizer_source not in (self.model_source, str(paths[0])) and os.path.exists(tokenizer_source):
+            paths.append(Path(tokenizer_source))
+        
+        digest = hashlib.sha1()
+        for path in paths:
+            files = sorted(item for item in path.rglob("*") if item.is_file()) if path.is_dir() else [path]
+            for item in files:
+                stat = item.stat()
+                name = item.relative_to(path) if path.is_dir() else item.name
+                digest.update(f"{name}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode("utf-8"))
+        return digest.hexdigest()[:12]
+    
+    def _load_tokenizer(self, source: str, local_files_only: bool = False) -> 'PreTrainedTokenizerBase':
+        """Load the fast (Rust) tokenizer, falling back to the Python one"""
+        from transformers import DistilBertTokenizer, DistilBertTokenizerFast
+        
+        if settings.USE_FAST_TOKENIZER:
+            try:
+                logger.info(f"Loading fast tokenizer: {source}")
+                return DistilBertTokenizerFast.from_pretrained(
+                    source, local_files_only=local_files_only
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Fast tokenizer unavailable ({str(e)}), falling back to slow tokenizer"
+                )
+        
+        logger.info(f"Loading tokenizer: {source}")
+        return DistilBertTokenizer.from_pretrained(source, local_files_only=local_files_only)
+    
+    def _warmup(self) -> None:
+        """
+        Run synthetic batches at several sequence lengths
+        
+        The first forward passes pay for lazy kernel initialization and
+        allocator growth; doing them here keeps that cost off real requests.
+        """
+        import torch
+        from .cpu import configure_torch_threads
+        from .executor import inference_executor
+        
+        if not settings.WARMUP_ENABLED:
+            return
+        
+        # Warmup runs on the loading thread, not an inference worker, so it
+        # warms kernels and allocators rather than the workers' own thread
+        # pools; matching their intra-op thread count keeps the kernel
+        # choices the same as on the real calls
+        configure_torch_threads(inference_executor.torch_threads)
+        
+        cls_id = self.tokenizer.cls_token_id
+        sep_id = self.tokenizer.sep_token_id
+        filler_id = self.tokenizer.convert_tokens_to_ids("the")
+        lengths = sorted({
+            min(max(length, 2), settings.MAX_SEQUENCE_LENGTH)
+            for length in settings.warmup_sequence_lengths_list
+        })
+        
+        with torch.no_grad():
+            for length in lengths:
+                ids = [cls_id] + [filler_id] * (length - 2) + [sep_id]
+                inputs = self._pad_batch([ids] * settings.WARMUP_BATCH_SIZE)
+                for _ in range(settings.WARMUP_ITERATIONS):
+                    self.backend.forward(**inputs)
+        
+        logger.info(
+            f"Warmup complete: lengths={lengths}, batch_size={settings.WARMUP_BATCH_SIZE}, "
+            f"iterations={settings.WARMUP_ITERATIONS}"
+        )
+    
+    def predict_sentiment(self, text: str, tier: str = "standard") -> Tuple[str, float]:
         """
         Predict sentiment for a given text
         
         Args:
             text: Input text to analyze
+            tier: Truncation tier (standard or fast)
             
         Returns:
             Tuple of (sentiment_label, confidence_score)
         """
-        if self.model is None or self.tokenizer is None:
-            raise RuntimeError("Model not loaded. Call load_model() first.")
+        return self.predict_batch([text], tier)[0]
+    
+    def predict_batch(self, texts: List[str], tier: str = "standard") -> List[Tuple[str, float]]:
+        """
+        Predict sentiment for several texts, serving repeats from the cache
         
-        # Tokenize input
-        inputs = self.tokenizer(
-            text,
-            return_tensors='pt',
-            padding=True,
-            truncation=True,
-            max_length=settings.MAX_SEQUENCE_LENGTH
+        Args:
+            texts: Input texts to analyze
+            tier: Truncation tier (standard or fast)
+            
+        Returns:
+            List of (sentiment_label, confidence_score) in input order
+        """
+        max_length = tier_max_length(tier)
+        with self._stats_lock:
+            self._texts += len(texts)
+        self.last_used = time.time()
+        
+        if prediction_cache is None:
+            return self._predict_uncached(texts, tier)
+        
+        keys = [self.cache_key(text, max_length) for text in texts]
+        return prediction_cache.get_or_compute_many(
+            keys, texts, lambda missing: self._predict_uncached(missing, tier), self.model_name
         )
+    
+    def get_cached(self, text: str, tier: str = "standard") -> Optional[Tuple[str, float]]:
+        """Return a cached prediction for the text, if any"""
+        if prediction_cache is None:
+            return None
+        return prediction_cache.get(self.cache_key(text, tier_max_length(tier)), self.model_name)
+    
+    def cache_key(self, text: str, max_length: Optional[int] = None) -> str:
+        """Cache key for a text under the loaded model version and truncation policy"""
+        max_length = max_length or settings.MAX_SEQUENCE_LENGTH
+        # Head truncation keeps the keys used before the policy was configurable
+        truncation = str(max_length)
+        if settings.TRUNCATION_STRATEGY == "head_tail":
+            truncation += f":head_tail:{settings.TRUNCATION_HEAD_RATIO}"
+        return PredictionCache.make_key(
+            preprocess_text(text),
+            f"{self.model_name}@{self.version}",
+            truncation
+        )
+    
+    def _truncate(self, ids: List[int], budget: int) -> List[int]:
+        """
+        Cut token ids (special tokens excluded) to at most ``budget`` tokens
+        
+        ``head`` keeps the first tokens. ``head_tail`` keeps both ends and
+        drops the middle, since long reviews tend to state their verdict in
+        the opening and closing sentences; TRUNCATION_HEAD_RATIO of the kept
+        tokens come from the start.
+        """
+        if settings.TRUNCATION_STRATEGY != "head_tail":
+            return ids[:budget]
+        head = round(budget * min(max(settings.TRUNCATION_HEAD_RATIO, 0.0), 1.0))
+        return ids[:head] + ids[len(ids) - (budget - head):]
+    
+    def _encode(self, texts: List[str], tier: str) -> List[List[int]]:
+        """
+        Tokenize texts and apply the truncation policy for the tier
+        
+        Texts are tokenized in full so truncation can keep their ends; the
+        tokenizer's length warning is silenced as every text is cut here.
+        """
+        budget = max(1, tier_max_length(tier) - self.tokenizer.num_special_tokens_to_add())
+        encodings = self.tokenizer(texts, add_special_tokens=False, truncation=False, verbose=False)
+        
+        input_ids = []
+        truncated = dropped = 0
+        for ids in encodings["input_ids"]:
+            if len(ids) > budget:
+                truncated += 1
+                dropped += len(ids) - budget
+                ids = self._truncate(ids, budget)
+            input_ids.append(self.tokenizer.build_inputs_with_special_tokens(ids))
+        
+        with self._stats_lock:
+            stats = self._truncation_stats[tier]
+            stats[0] += len(texts)
+            stats[1] += truncated
+            stats[2] += dropped
+        texts_series, truncated_series, dropped_series = self._truncation_series[tier]
+        texts_series.inc(len(texts))
+        if truncated:
+            truncated_series.inc(truncated)
+            dropped_series.inc(dropped)
+        return input_ids
+    
+    def _predict_uncached(self, texts: List[str], tier: str = "standard") -> List[Tuple[str, float]]:
+        """
+        Predict sentiment for several texts with vectorized inference
+        
+        All texts are tokenized in a single tokenizer call and sorted by
+        token length, so texts of similar length share a sub-batch and
+        padding waste stays low. Sub-batches are sized so their padded size
+        stays within MAX_BATCH_TOKENS. Softmax and argmax run once over the
+        combined logits, which are put back in input order.
+        
+        Args:
+            texts: Input texts to analyze
+            tier: Truncation tier (standard or fast)
+            
+        Returns:
+            List of (sentiment_label, confidence_score) in input order
+        """
+        if self.backend is None or self.tokenizer is None:
+            raise RuntimeError("Model not loaded. Call load_model() first.")
+        
+        if not texts:
+            return []
         
-        # Move inputs to device
-        inputs = {key: value.to(self.device) for key, value in inputs.items()}
+        import torch
         
-        # Make prediction
+        # Tokenize all texts in one call, without padding
+        step = time.perf_counter()
+        input_ids = self._encode(texts, tier)
+        self._tokenize_seconds.observe(time.perf_counter() - step)
+        
+        # Bucket texts by length: shortest first
+        order = sorted(range(len(input_ids)), key=lambda index: len(input_ids[index]))
+        sorted_ids = [input_ids[index] for index in order]
+        
+        # Run forward passes per sub-batch and collect the logits
+        step = time.perf_counter()
+        logits = []
+        real_tokens = 0
+        padded_tokens = 0
         with torch.no_grad():
-            outputs = self.model(**inputs)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
+            for start, end in self._split_by_token_budget(sorted_ids):
+                bucket = sorted_ids[start:end]
+                real_tokens += sum(len(ids) for ids in bucket)
+                padded_tokens += len(bucket) * len(bucket[-1])
+                
+                inputs = self._pad_batch(bucket)
+                logits.append(self.backend.forward(**inputs))
+            
+            self._forward_seconds.observe(time.perf_counter() - step)
+            step = time.perf_counter()
+            
+            # Restore input order
+            sorted_logits = torch.cat(logits)
+            combined = torch.empty_like(sorted_logits)
+            combined[torch.tensor(order, device=sorted_logits.device)] = sorted_logits
+            
+            predictions = torch.nn.functional.softmax(combined, dim=-1)
+            confidences, predicted_classes = torch.max(predictions, dim=-1)
+        
+        with self._stats_lock:
+            self._real_tokens += real_tokens
+            self._padded_tokens += padded_tokens
         
         # Get results
-        labels = ['NEGATIVE', 'POSITIVE']
-        predicted_class = torch.argmax(predictions, dim=-1).item()
-        predicted_label = labels[predicted_class]
-        confidence = torch.max(predictions).item()
+        labels = self.LABELS
+        results = [
+            (labels[predicted_class], confidence)
+            for predicted_class, confidence in zip(
+                predicted_classes.tolist(), confidences.tolist()
+            )
+        ]
+        self._postprocess_seconds.observe(time.perf_counter() - step)
+        
+        self._batch_size.observe(len(texts))
+        for ids in input_ids:
+            self._tokens_per_text.observe(len(ids))
         
-        return predicted_label, confidence
+        return results
+    
+    def _split_by_token_budget(self, input_ids: List[List[int]]) -> List[Tuple[int, int]]:
+        """
+        Split encoded texts into (start, end) ranges whose padded size
+        (rows x longest row) stays within MAX_BATCH_TOKENS
+        """
+        budget = settings.MAX_BATCH_TOKENS
+        ranges = []
+        start = 0
+        longest = 0
+        
+        for index, ids in enumerate(input_ids):
+            candidate = max(longest, len(ids))
+            if index > start and candidate * (index - start + 1) > budget:
+                ranges.append((start, index))
+                start = index
+                candidate = len(ids)
+            longest = candidate
+        
+        ranges.append((start, len(input_ids)))
+        return ranges
+    
+    def _pad_batch(self, input_ids: List[List[int]]) -> Dict[str, 'torch.Tensor']:
+        """Right-pad encoded texts into device tensors for a forward pass"""
+        import torch
+        
+        longest = max(len(ids) for ids in input_ids)
+        pad_id = self.tokenizer.pad_token_id or 0
+        
+        ids_tensor = torch.full((len(input_ids), longest), pad_id, dtype=torch.long)
+        mask_tensor = torch.zeros((len(input_ids), longest), dtype=torch.long)
+        for row, ids in enumerate(input_ids):
+            ids_tensor[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            mask_tensor[row, :len(ids)] = 1
+        
+        return {
+            "input_ids": ids_tensor.to(self.device),
+            "attention_mask": mask_tensor.to(self.device),
+        }
     
     def get_model_info(self) -> dict:
-        """Get information about the loaded model"""
-        if self.model is None:
-            return {"status": "not_loaded"}
+        """Get information about the model, loaded or not"""
+        with self._stats_lock:
+            texts = self._texts
+        usage = {
+            "name": self.name,
+            "model_name": self.model_name,
+            "tokenizer_name": self.tokenizer_name,
+            "version": self.version,
+            "memory_bytes": self.memory_bytes,
+            "texts": texts,
+            "last_used": self.last_used,
+        }
+        if self.backend is None:
+            return {"status": "not_loaded", "readiness": self.state, **usage}
         
         return {
             "status": "loaded",
-            "model_name": settings.MODEL_NAME,
-            "tokenizer_name": settings.TOKENIZER_NAME,
+            "readiness": self.state,
+            **usage,
+            "model_source": self.model_source,
+            "fast_tokenizer": self.tokenizer.is_fast,
             "device": str(self.device),
+            "backend": self.backend.name,
+            "quantization": settings.QUANTIZATION if self.model is not None else "none",
             "max_sequence_length": settings.MAX_SEQUENCE_LENGTH,
-            "parameters": sum(p.numel() for p in self.model.parameters()),
+            "max_batch_tokens": settings.MAX_BATCH_TOKENS,
+            "parameters": self.backend.num_parameters(),
+            "padding_efficiency": self.get_padding_efficiency(),
+            "truncation": self.get_truncation_stats(),
+            "startup_timings": self.startup_timings,
         }
     
+    def get_token_counts(self) -> Dict[str, int]:
+        """Real and padded tokens processed across all batches so far"""
+        with self._stats_lock:
+            return {"real_tokens": self._real_tokens, "padded_tokens": self._padded_tokens}
+    
+    def get_truncation_stats(self) -> dict:
+        """Truncation policy and, per tier, how often truncation fired so far"""
+        tiers = {}
+        with self._stats_lock:
+            for tier, (texts, truncated, dropped) in self._truncation_stats.items():
+                tiers[tier] = {
+                    "max_length": tier_max_length(tier),
+                    "texts": texts,
+                    "truncated": truncated,
+                    "truncated_tokens": dropped,
+                    "truncated_ratio": round(truncated / texts, 4) if texts else None,
+                }
+        truncation = {"strategy": settings.TRUNCATION_STRATEGY, "tiers": tiers}
+        if settings.TRUNCATION_STRATEGY == "head_tail":
+            truncation["head_ratio"] = settings.TRUNCATION_HEAD_RATIO
+        return truncation
+    
+    def get_padding_efficiency(self) -> Optional[float]:
+        """Ratio of real tokens to padded tokens across all batches so far"""
+        with self._stats_lock:
+            if self._padded_tokens == 0:
+                return None
+            return round(self._real_tokens / self._padded_tokens, 4)
+    
     def is_ready(self) -> bool:
-        """Check if model is loaded and ready"""
-        return self.model is not None and self.tokenizer is not None
+        """Check if model is loaded, warmed up and ready for traffic"""
+        return self.state == "ready"
+
+
+def _memory_in_use() -> int:
+    """Process RSS plus CUDA allocations, used to size a loaded model"""
+    used = psutil.Process().memory_info().rss
+    if "torch" in sys.modules:
+        import torch
+        if torch.cuda.is_available():
+            used += torch.cuda.memory_allocated()
+    return used
 
 
-# Global model manager instance
+# Global instance for the default model (MODEL_NAME)
 model_manager = ModelManager()
@@ -0,0 +1,411 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from .config import settings
+from .executor import inference_executor
+from .metrics import metrics
+from .model_manager import ModelManager, model_manager
+
+
+logger = logging.getLogger(__name__)
+
+# A model that failed to load is retried after this many seconds, doubling
+# with each further failure up to the maximum
+_LOAD_RETRY_SECONDS = 5.0
+_LOAD_RETRY_MAX_SECONDS = 300.0
+
+
+class UnknownModelError(ValueError):
+    """Raised when a request names a model that is not registered"""
+
+
+class ReloadInProgressError(RuntimeError):
+    """Raised when a reload is requested for a model that is already reloading"""
+
+
+class ReloadUnavailableError(RuntimeError):
+    """Raised when reloads are run by the pre-fork supervisor, not by this worker"""
+
+
+class ModelRegistry:
+    """
+    Named sentiment models served from one process
+
+    The default model (MODEL_NAME) is loaded at startup and never evicted.
+    Other models load on first use. When loaded models exceed the memory
+    budget, the least recently used ones that no request is using are
+    unloaded; they load again the next time they are requested.
+
+    A model can be reloaded, optionally from a different source, while it
+    keeps serving: the new version loads and warms up on the side, then
+    replaces the old one in a single step. Requests that acquired the old
+    version finish on it, and its weights are freed once the last one is
+    released.
+    """
+
+    def __init__(
+        self,
+        default: ModelManager,
+        models: Dict[str, Tuple[str, Optional[str]]],
+        memory_budget_bytes: int = 0
+    ):
+        self.default = default
+        self.memory_budget_bytes = max(0, memory_budget_bytes)
+        self.evictions = 0
+        # Set in pre-fork workers: the supervisor reloads every worker at
+        # once and keeps their weights shared, so workers never reload alone
+        self.supervisor_pid: Optional[int] = None
+
+        # Least recently used first
+        self._models: "OrderedDict[str, ModelManager]" = OrderedDict()
+        self._models[default.name] = default
+        for name, (model_name, tokenizer_name) in models.items():
+            if name in self._models:
+                raise ValueError(f"Model name '{name}' is registered twice")
+            self._models[name] = ModelManager(name, model_name, tokenizer_name)
+        self._names = list(self._models)
+
+        # In-flight requests per model version, including retired versions
+        self._active: Dict[ModelManager, int] = {manager: 0 for manager in self._models.values()}
+        self._retired: Set[ModelManager] = set()
+        self._requests: Dict[str, int] = {name: 0 for name in self._models}
+        self._reloads: Dict[str, dict] = {}
+        self._reload_tasks: Dict[str, asyncio.Task] = {}
+        # Per model: consecutive load failures, next retry time, last error
+        self._load_failures: Dict[str, Tuple[int, float, str]] = {}
+        # Loads run one at a time so each model's memory growth is measured alone
+        self._load_lock = asyncio.Lock()
+
+    def names(self) -> List[str]:
+        """Registered model names in configuration order, default first"""
+        return list(self._names)
+
+    def get(self, name: Optional[str] = None) -> ModelManager:
+        """
+        Look up a model by name without loading it
+
+        Raises:
+            UnknownModelError: If no model is registered under the name
+        """
+        if name is None:
+            return self.default
+        manager = self._models.get(name)
+        if manager is None:
+            raise UnknownModelError(
+                f"Unknown model '{name}'. Available models: {', '.join(self.names())}"
+            )
+        return manager
+
+    async def load(self, name: Optional[str] = None) -> ModelManager:
+        """
+        Load a model if needed, then evict others to stay within budget
+
+        After a failed load, further attempts fail straight away until a
+        retry delay has passed, so requests for a broken model do not each
+        pay for a full load.
+        """
+        async with self._load_lock:
+            manager = self.get(name)
+            if manager.is_ready():
+                return manager
+
+            failures, retry_at, error = self._load_failures.get(manager.name, (0, 0.0, ""))
+            if time.monotonic() < retry_at:
+                raise RuntimeError(
+                    f"Model '{manager.name}' failed to load ({error}); "
+                    f"retrying in {retry_at - time.monotonic():.0f}s"
+                )
+
+            try:
+                await asyncio.to_thread(manager.load_model)
+            except Exception as e:
+                delay = min(_LOAD_RETRY_SECONDS * 2 ** failures, _LOAD_RETRY_MAX_SECONDS)
+                self._load_failures[manager.name] = (failures + 1, time.monotonic() + delay, str(e))
+                raise
+            self._load_failures.pop(manager.name, None)
+            await self._shrink(keep=manager)
+        return manager
+
+    async def acquire(self, name: Optional[str] = None) -> ModelManager:
+        """
+        Get a loaded model and protect it from eviction until released
+
+        Raises:
+            UnknownModelError: If no model is registered under the name
+            RuntimeError: If the model fails to load
+        """
+        # Re-check after each load: another load may have evicted or
+        # replaced it since
+        manager = self.get(name)
+        while not manager.is_ready():
+            await self.load(manager.name)
+            manager = self.get(manager.name)
+
+        self._active[manager] += 1
+        self._requests[manager.name] += 1
+        self._models.move_to_end(manager.name)
+        return manager
+
+    def release(self, manager: ModelManager) -> None:
+        """Release a model obtained from acquire()"""
+        self._active[manager] -= 1
+        if manager in self._retired:
+            if self._active[manager] == 0:
+                self._retired.discard(manager)
+                del self._active[manager]
+                asyncio.create_task(self._unload_retired(manager))
+        elif self._over_budget() and self._evictable() and not self._load_lock.locked():
+            asyncio.create_task(self._shrink_locked())
+
+    async def predict(
+        self,
+        manager: ModelManager,
+        texts: List[str],
+        tier: str = "standard",
+        priority: str = "interactive"
+    ) -> List[Tuple[str, float]]:
+        """
+        Run ``manager.predict_batch`` on the inference executor, keeping
+        the model loaded until the call is done with it
+
+        ``manager`` must be acquired by the caller. Callers release it as
+        soon as they go away, e.g. when a client disconnects, while the
+        forward pass may still be running on a worker thread; this holds a
+        reference of its own, released when the call finishes, or at once
+        if the call is cancelled or rejected before it starts.
+        """
+        self._active[manager] += 1
+        loop = asyncio.get_running_loop()
+        lock = threading.Lock()
+        state = {"started": False, "dropped": False}
+
+        def call():
+            with lock:
+                if state["dropped"]:
+                    return None
+                state["started"] = True
+            try:
+                return manager.predict_batch(texts, tier)
+            finally:
+                loop.call_soon_threadsafe(self.release, manager)
+
+        try:
+            return await inference_executor.run(call, priority=priority, model=manager.model_name)
+        except BaseException:
+            with lock:
+                if not state["started"]:
+                    state["dropped"] = True
+                    self.release(manager)
+            raise
+
+    @asynccontextmanager
+    async def use(self, name: Optional[str] = None) -> AsyncIterator[ModelManager]:
+        """Acquire a model for the duration of a block"""
+        manager = await self.acquire(name)
+        try:
+            yield manager
+        finally:
+            self.release(manager)
+
+    def reload(
+        self,
+        name: Optional[str] = None,
+        model_name: Optional[str] = None,
+        tokenizer_name: Optional[str] = None
+    ) -> dict:
+        """
+        Start loading a new version of a model in the background
+
+        Args:
+            name: Registered model name (default: the default model)
+            model_name: New model name or path (default: the current one,
+                picking up new weights or a new snapshot at the same place)
+            tokenizer_name: New tokenizer (default: the current one, or the
+                new model when ``model_name`` changes)
+
+        Returns:
+            The reload status, also reported by info()
+
+        Raises:
+            UnknownModelError: If no model is registered under the name
+            ReloadInProgressError: If the model is already reloading
+            ReloadUnavailableError: In a pre-fork worker
+        """
+        if self.supervisor_pid is not None:
+            raise ReloadUnavailableError(
+                f"Models are reloaded by the pre-fork supervisor for all workers at once; "
+                f"send SIGHUP to process {self.supervisor_pid}"
+            )
+        current = self.get(name)
+        task = self._reload_tasks.get(current.name)
+        if task is not None and not task.done():
+            raise ReloadInProgressError(f"Model '{current.name}' is already reloading")
+
+        if model_name is None:
+            model_name = current.model_name
+            tokenizer_name = tokenizer_name or current.tokenizer_name
+        replacement = ModelManager(current.name, model_name, tokenizer_name)
+
+        status = {
+            "state": "loading",
+            "model_name": replacement.model_name,
+            "previous_version": current.version,
+            "version": None,
+            "started_at": time.time(),
+            "finished_at": None,
+            "error": None,
+        }
+        self._reloads[current.name] = status
+        self._reload_tasks[current.name] = asyncio.create_task(self._reload(replacement, status))
+        logger.info(f"Reloading model {current.name} from {replacement.model_name}")
+        return dict(status)
+
+    async def wait_for_reloads(self) -> None:
+        """Wait for reloads in progress, e.g. before shutdown"""
+        tasks = [task for task in self._reload_tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _reload(self, replacement: ModelManager, status: dict) -> None:
+        """Load and warm up a replacement, then swap it in"""
+        try:
+            async with self._load_lock:
+                # The old version keeps serving while the new one loads
+                await asyncio.to_thread(replacement.load_model)
+                self._swap(replacement)
+                self._load_failures.pop(replacement.name, None)
+                await self._shrink(keep=replacement)
+        except Exception as e:
+            status.update(state="failed", error=str(e), finished_at=time.time())
+            logger.error(f"Reloading model {replacement.name} failed; the old version keeps serving: {str(e)}")
+            return
+
+        status.update(state="completed", version=replacement.version, finished_at=time.time())
+        logger.info(
+            f"Model {replacement.name} reloaded: version {status['previous_version']} -> {replacement.version}"
+        )
+
+    def replace(self, replacement: ModelManager) -> ModelManager:
+        """
+        Make a loaded replacement current and return the version it replaces
+
+        Runs without awaiting, so atomically; the caller frees the previous
+        version once nothing uses it.
+        """
+        name = self.get(replacement.name).name
+        previous = self._models[name]
+        self._models[name] = replacement
+        self._active[replacement] = 0
+        if previous is self.default:
+            self.default = replacement
+        return previous
+
+    def _swap(self, replacement: ModelManager) -> None:
+        previous = self.replace(replacement)
+        if self._active.get(previous, 0) > 0:
+            # In-flight requests finish on the old version; the last release unloads it
+            self._retired.add(previous)
+        else:
+            self._active.pop(previous, None)
+            asyncio.create_task(self._unload_retired(previous))
+
+    async def _unload_retired(self, manager: ModelManager) -> None:
+        if manager.backend is None:
+            return
+        await asyncio.to_thread(manager.unload)
+        logger.info(f"Freed replaced version {manager.version} of model {manager.name}")
+
+    def memory_used(self) -> int:
+        """Approximate memory held by loaded models"""
+        return sum(manager.memory_bytes for manager in self._models.values() if manager.backend is not None)
+
+    def _over_budget(self) -> bool:
+        return bool(self.memory_budget_bytes) and self.memory_used() > self.memory_budget_bytes
+
+    def _evictable(self, keep: Optional[ModelManager] = None) -> List[ModelManager]:
+        """Loaded models no request is using, least recently used first"""
+        return [
+            manager for manager in self._models.values()
+            if manager is not self.default
+            and manager is not keep
+            and manager.backend is not None
+            and self._active[manager] == 0
+        ]
+
+    async def _shrink_locked(self) -> None:
+        async with self._load_lock:
+            await self._shrink()
+
+    async def _shrink(self, keep: Optional[ModelManager] = None) -> None:
+        """Unload least recently used idle models until within budget"""
+        for manager in self._evictable(keep):
+            if not self._over_budget():
+                return
+            if manager.backend is None or self._active[manager] > 0:
+                continue
+
+            # Not ready from here on, so no new request can start using it
+            manager.state = "not_loaded"
+            freed = manager.memory_bytes
+            await asyncio.to_thread(manager.unload)
+            self.evictions += 1
+            logger.info(
+                f"Evicted model {manager.name} ({freed / (1024 * 1024):.0f}MB) to stay within memory budget"
+            )
+
+        if keep is not None and self._over_budget():
+            logger.warning(
+                f"Loaded models use {self.memory_used() / (1024 * 1024):.0f}MB, over the "
+                f"{self.memory_budget_bytes / (1024 * 1024):.0f}MB budget, and none can be evicted"
+            )
+
+    def info(self) -> dict:
+        """Every registered model with its load state, memory and usage"""
+        models = []
+        for name in self.names():
+            manager = self._models[name]
+            info = manager.get_model_info()
+            info["default"] = name == self.default.name
+            info["requests"] = self._requests[name]
+            info["active_requests"] = self._active[manager]
+            info["reload"] = self._reloads.get(name)
+            models.append(info)
+        return {
+            "default_model": self.default.name,
+            "memory_budget_bytes": self.memory_budget_bytes or None,
+            "memory_used_bytes": self.memory_used(),
+            "evictions": self.evictions,
+            "models": models,
+        }
+
+
+# Global model registry instance
+model_registry = ModelRegistry(
+    default=model_manager,
+    models=settings.models_map,
+    memory_budget_bytes=settings.MODEL_MEMORY_BUDGET_MB * 1024 * 1024
+)
+
+metrics.collected(
+    "model_loaded", "Whether a registered model is loaded", "gauge",
+    ("model",), lambda: {
+        (manager.model_name,): int(manager.backend is not None)
+        for manager in map(model_registry.get, model_registry.names())
+    }
+)
+metrics.collected(
+    "model_memory_bytes", "Approximate memory held by a loaded model", "gauge",
+    ("model",), lambda: {
+        (manager.model_name,): manager.memory_bytes
+        for manager in map(model_registry.get, model_registry.names())
+    }
+)
+metrics.collected(
+    "model_evictions_total", "Models unloaded to stay within the memory budget", "counter",
+    (), lambda: {(): model_registry.evictions}
+)
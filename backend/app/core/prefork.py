@@ -0,0 +1,444 @@
+import gc
+import logging
+import os
+import select
+import signal
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+import psutil
+
+from .config import settings
+from .cpu import configure_torch_threads, cpu_pool, intra_op_threads, pin_current_thread, split_cpus
+from .executor import inference_executor
+from .model_manager import ModelManager
+from .model_registry import model_registry
+from app.utils.helpers import get_process_memory
+
+
+logger = logging.getLogger(__name__)
+
+# A worker that exits sooner than this after starting counts as crashing
+_MIN_UPTIME_SECONDS = 10.0
+# Consecutive crashing workers before the server gives up
+_MAX_CRASHES = 5
+# How long a replacement worker may take to load and warm up during a reload
+_READY_TIMEOUT_SECONDS = 300.0
+
+
+class Worker:
+    """A forked server process and the pipe it reports readiness on"""
+
+    def __init__(self, worker_id: int, pid: int, ready_fd: int):
+        self.id = worker_id
+        self.pid = pid
+        self.ready_fd: Optional[int] = ready_fd
+        self.ready: Optional[bool] = None  # None until its model is ready or failed
+        self.retiring = False
+        self.started_at = time.monotonic()
+
+
+class PreforkServer:
+    """
+    Serve the app from forked worker processes that share one copy of the model
+
+    The parent process loads the default model once, without warmup, binds
+    the listening socket and forks ``workers`` processes that each run
+    uvicorn on it. Weights are not written after loading, so copy-on-write
+    keeps them in pages shared by every worker: an extra worker costs its
+    private memory (activations, allocator caches, request state), not
+    another copy of the model. The garbage collector is frozen before
+    forking so collections in a worker do not touch, and copy, the objects
+    inherited from the parent. Each worker sets its own torch thread count
+    and warms up on its own; with CPU_AFFINITY set, each is pinned to its
+    own block of cores.
+
+    The parent restarts workers that exit unexpectedly and logs each
+    worker's memory split into private and shared pages. Signals:
+
+        SIGTERM, SIGINT: stop workers gracefully and exit
+        SIGHUP: load the model again, then replace workers one at a time
+        SIGUSR1: log a memory report
+
+    Preloading needs CPU inference with the pytorch or torchscript backend;
+    CUDA contexts and ONNX Runtime sessions do not survive a fork, so with
+    those each worker loads its own copy as a normal server would.
+    """
+
+    def __init__(
+        self,
+        app,
+        host: str,
+        port: int,
+        workers: int,
+        torch_threads: int = 0,
+        log_level: str = "info",
+        preload: bool = True,
+        graceful_timeout: float = 30.0,
+        memory_report_seconds: float = 300.0
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.num_workers = max(1, workers)
+        self.torch_threads = torch_threads or intra_op_threads(self.num_workers)
+        pool = cpu_pool()
+        self.worker_cpus = split_cpus(pool, self.num_workers) if pool else None
+        self.log_level = log_level.lower()
+        self.preload = preload
+        self.graceful_timeout = graceful_timeout
+        self.memory_report_seconds = memory_report_seconds
+        self.preloaded = False
+        self.workers: Dict[int, Worker] = {}
+        self._socket = None
+        self._signals: List[int] = []
+        self._stopping = False
+        self._crashes = 0
+        self._reported_startup = False
+        self._next_report: Optional[float] = None
+
+    def run(self) -> int:
+        """Preload, fork the workers and supervise them until stopped; returns the exit code"""
+        if not hasattr(os, "fork"):
+            raise RuntimeError("The pre-fork server needs os.fork(), which this platform lacks")
+
+        import uvicorn
+
+        self._socket = uvicorn.Config(self.app, host=self.host, port=self.port).bind_socket()
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(sig, self._on_signal)
+
+        if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND == "memory":
+            logger.warning(
+                "RATE_LIMIT_BACKEND=memory keeps a separate budget in each worker; "
+                "use local or redis to share one"
+            )
+
+        try:
+            self.preloaded = self._preload()
+        except Exception as e:
+            logger.error(f"Preloading the model failed: {str(e)}")
+            return 1
+
+        logger.info(
+            f"Pre-fork server starting {self.num_workers} workers on http://{self.host}:{self.port}: "
+            f"torch_threads={self.torch_threads} per worker, pinned={self.worker_cpus is not None}, "
+            f"preloaded={self.preloaded}"
+        )
+        self._freeze()
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id, warm_first=False)
+
+        exit_code = 0
+        while not self._stopping:
+            self._handle_signals()
+            self._poll(0.5)
+            if self._crashes >= _MAX_CRASHES:
+                logger.error(f"Workers crashed {self._crashes} times in a row right after starting; giving up")
+                exit_code = 1
+                break
+            self._report_memory_when_due()
+
+        self._stop_workers()
+        self._socket.close()
+        logger.info("Pre-fork server stopped")
+        return exit_code
+
+    def _preload(self) -> bool:
+        """Load the default model in the parent if workers can share it"""
+        if not self.preload:
+            return False
+
+        reason = _preload_unsupported()
+        if reason:
+            logger.warning(f"Not preloading the model ({reason}); each worker loads its own copy")
+            return False
+
+        import torch
+
+        # Intra-op thread pools do not survive a fork: run none in the parent
+        torch.set_num_threads(1)
+        model_registry.default.load_model(warmup=False)
+        return True
+
+    def _freeze(self) -> None:
+        """Move everything allocated so far out of the collector's reach"""
+        gc.collect()
+        gc.freeze()
+
+    def _spawn(self, worker_id: int, warm_first: bool = True) -> Worker:
+        """
+        Fork a worker process
+
+        A worker started with ``warm_first`` loads and warms up before it
+        accepts connections, so replacements for running workers take no
+        requests they would answer with 503. The first workers follow
+        LOAD_MODEL_IN_BACKGROUND like a single-process server.
+        """
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                os.close(read_fd)
+                cpus = self.worker_cpus[worker_id % len(self.worker_cpus)] if self.worker_cpus else None
+                self._run_worker(write_fd, warm_first, cpus)
+            except BaseException as e:
+                if not isinstance(e, SystemExit):
+                    logger.exception(f"Worker {worker_id} failed: {str(e)}")
+                exit_code = e.code if isinstance(e, SystemExit) and isinstance(e.code, int) else 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(exit_code)
+
+        os.close(write_fd)
+        worker = Worker(worker_id, pid, read_fd)
+        self.workers[pid] = worker
+        logger.info(f"Started worker {worker_id} (pid {pid})")
+        return worker
+
+    def _run_worker(self, ready_fd: int, warm_first: bool, cpus: Optional[List[int]]) -> None:
+        """Body of a forked worker: configure it and run uvicorn on the shared socket"""
+        import uvicorn
+
+        # Drop the parent's handlers; uvicorn and the app install their own
+        for sig in (signal.SIGTERM, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(sig, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        for worker in self.workers.values():
+            if worker.ready_fd is not None:
+                os.close(worker.ready_fd)
+        self.workers = {}
+
+        # Threads started from here on inherit the worker's cores
+        pin_current_thread(cpus)
+        configure_torch_threads(self.torch_threads)
+        inference_executor.torch_threads = self.torch_threads
+        inference_executor.cpus = cpus
+        model_registry.supervisor_pid = os.getppid()
+
+        if warm_first or not settings.LOAD_MODEL_IN_BACKGROUND:
+            try:
+                model_registry.default.load_model()
+            except RuntimeError:
+                pass  # Reported to the parent; the worker serves unready like a single process
+
+        config = uvicorn.Config(
+            self.app,
+            log_level=self.log_level,
+            timeout_graceful_shutdown=self.graceful_timeout
+        )
+        server = uvicorn.Server(config)
+        threading.Thread(
+            target=self._watch_worker, args=(server, ready_fd, os.getppid()),
+            name="prefork-watch", daemon=True
+        ).start()
+        server.run(sockets=[self._socket])
+
+    @staticmethod
+    def _watch_worker(server, ready_fd: int, parent_pid: int) -> None:
+        """Tell the parent once the worker serves a ready model, and stop if the parent goes away"""
+        while True:
+            if ready_fd is not None and server.started:
+                state = model_registry.default.state
+                if state in ("ready", "failed"):
+                    try:
+                        os.write(ready_fd, b"1" if state == "ready" else b"0")
+                    except OSError:
+                        pass
+                    os.close(ready_fd)
+                    ready_fd = None
+            if os.getppid() != parent_pid:
+                logger.warning("Pre-fork parent exited; stopping worker")
+                os.kill(os.getpid(), signal.SIGTERM)
+                return
+            time.sleep(0.1 if ready_fd is not None else 1.0)
+
+    def _on_signal(self, signum: int, frame) -> None:
+        self._signals.append(signum)
+        if signum in (signal.SIGTERM, signal.SIGINT):
+            self._stopping = True
+
+    def _handle_signals(self) -> None:
+        while self._signals:
+            signum = self._signals.pop(0)
+            if signum == signal.SIGHUP:
+                self._reload()
+            elif signum == signal.SIGUSR1:
+                self._report_memory()
+
+    def _poll(self, timeout: float) -> None:
+        """Collect readiness reports and restart workers that exited unexpectedly"""
+        pending = {worker.ready_fd: worker for worker in self.workers.values() if worker.ready_fd is not None}
+        if pending:
+            try:
+                readable, _, _ = select.select(list(pending), [], [], timeout)
+            except InterruptedError:
+                readable = []
+            for fd in readable:
+                self._read_ready(pending[fd])
+        else:
+            time.sleep(timeout)
+
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self.workers.pop(pid, None)
+            if worker is not None:
+                self._on_exit(worker, status)
+
+    def _read_ready(self, worker: Worker) -> None:
+        data = os.read(worker.ready_fd, 1)
+        os.close(worker.ready_fd)
+        worker.ready_fd = None
+        worker.ready = data == b"1"
+        if worker.ready:
+            self._crashes = 0
+            logger.info(f"Worker {worker.id} (pid {worker.pid}) is ready")
+        else:
+            logger.error(f"Worker {worker.id} (pid {worker.pid}) failed to load the model")
+
+    def _on_exit(self, worker: Worker, status: int) -> None:
+        if worker.ready_fd is not None:
+            os.close(worker.ready_fd)
+            worker.ready_fd = None
+        if worker.retiring or self._stopping:
+            return
+
+        code = os.waitstatus_to_exitcode(status)
+        logger.warning(f"Worker {worker.id} (pid {worker.pid}) exited unexpectedly with status {code}; restarting")
+        if time.monotonic() - worker.started_at < _MIN_UPTIME_SECONDS:
+            self._crashes += 1
+            time.sleep(min(2 ** self._crashes, 30))
+        else:
+            self._crashes = 0
+        if self._crashes < _MAX_CRASHES:
+            self._spawn(worker.id)
+
+    def _reload(self) -> None:
+        """Load the model again, then replace workers one at a time without downtime"""
+        logger.info("Reloading: replacing workers one at a time")
+        if self.preloaded:
+            current = model_registry.default
+            replacement = ModelManager(current.name, current.model_name, current.tokenizer_name)
+            try:
+                replacement.load_model(warmup=False)
+            except Exception as e:
+                logger.error(f"Reloading the model failed; workers keep the current version: {str(e)}")
+                return
+            # Workers keep their own view of the previous weights until they exit
+            previous = model_registry.replace(replacement)
+            gc.unfreeze()
+            previous.unload()
+            self._freeze()
+            logger.info(f"Model version {previous.version} -> {replacement.version}")
+
+        for old in sorted(self.workers.values(), key=lambda worker: worker.id):
+            if self._stopping:
+                return
+            new = self._spawn(old.id)
+            if not self._wait_ready(new):
+                logger.error(f"Replacement worker {new.id} did not become ready; stopping the reload")
+                self._terminate([new])
+                return
+            self._terminate([old])
+        logger.info("Reload complete")
+
+    def _wait_ready(self, worker: Worker) -> bool:
+        deadline = time.monotonic() + _READY_TIMEOUT_SECONDS
+        while worker.ready is None and worker.pid in self.workers and time.monotonic() < deadline:
+            if self._stopping:
+                return False
+            self._poll(0.5)
+        return bool(worker.ready) and worker.pid in self.workers
+
+    def _terminate(self, workers: List[Worker]) -> None:
+        """Stop workers gracefully, killing those that outlive the timeout"""
+        for worker in workers:
+            worker.retiring = True
+            _signal(worker.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while any(worker.pid in self.workers for worker in workers):
+            if time.monotonic() > deadline:
+                for worker in workers:
+                    if worker.pid in self.workers:
+                        logger.warning(f"Worker {worker.id} (pid {worker.pid}) did not stop in time; killing it")
+                        _signal(worker.pid, signal.SIGKILL)
+                deadline = float("inf")
+            self._poll(0.1)
+
+    def _stop_workers(self) -> None:
+        logger.info(f"Stopping {len(self.workers)} workers")
+        self._terminate(list(self.workers.values()))
+
+    def _report_memory_when_due(self) -> None:
+        now = time.monotonic()
+        if not self._reported_startup:
+            if self.workers and all(worker.ready is not None for worker in self.workers.values()):
+                self._reported_startup = True
+                self._report_memory()
+                if self.memory_report_seconds > 0:
+                    self._next_report = now + self.memory_report_seconds
+        elif self._next_report is not None and now >= self._next_report:
+            self._report_memory()
+            self._next_report = now + self.memory_report_seconds
+
+    def _report_memory(self) -> None:
+        """Log each process's memory split into private and shared pages"""
+        processes = [("parent", os.getpid())] + [
+            (f"worker {worker.id}", worker.pid)
+            for worker in sorted(self.workers.values(), key=lambda worker: worker.id)
+        ]
+        totals = {"rss": 0, "uss": 0, "pss": 0}
+        private = []
+        for label, pid in processes:
+            try:
+                memory = get_process_memory(psutil.Process(pid))
+            except psutil.Error:
+                continue
+            for kind in totals:
+                totals[kind] += memory.get(kind, 0)
+            if pid != os.getpid() and "uss" in memory:
+                private.append(memory["uss"])
+            logger.info(
+                f"Memory {label} (pid {pid}): " + ", ".join(
+                    f"{kind} {value / (1024 * 1024):.0f}MB" for kind, value in memory.items()
+                )
+            )
+
+        summary = f"Memory total: rss {totals['rss'] / (1024 * 1024):.0f}MB"
+        if totals["pss"]:
+            summary += f", actually used (pss) {totals['pss'] / (1024 * 1024):.0f}MB"
+        if private:
+            summary += f"; each worker adds ~{sum(private) / len(private) / (1024 * 1024):.0f}MB private"
+        logger.info(summary)
+
+
+def _preload_unsupported() -> Optional[str]:
+    """Why the model cannot be loaded before forking, if it cannot"""
+    if settings.BACKEND == "onnx":
+        return "ONNX Runtime sessions do not survive a fork"
+    if settings.DEVICE == "cuda":
+        return "CUDA cannot be initialized before a fork"
+    if settings.DEVICE == "auto":
+        # Ask NVML rather than the CUDA runtime so the check itself is fork-safe
+        os.environ.setdefault("PYTORCH_NVML_BASED_CUDA_CHECK", "1")
+        import torch
+        if torch.cuda.is_available():
+            return "CUDA cannot be initialized before a fork"
+    return None
+
+
+def _signal(pid: int, signum: int) -> None:
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
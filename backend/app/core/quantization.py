@@ -0,0 +1,128 @@
+import copy
+import logging
+from typing import List
+
+import torch
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ("none", "dynamic_int8")
+
+# Fixed sample set for comparing quantized and full-precision predictions
+DRIFT_SAMPLE_TEXTS = [
+    "I love this movie! It's absolutely fantastic.",
+    "This is terrible.",
+    "It's okay, I guess.",
+    "The service was slow and the food arrived cold.",
+    "Best purchase I've made all year, highly recommended.",
+    "Not worth the money at all.",
+    "The plot dragged in the middle, but the ending made up for it.",
+    "I would not recommend this product to anyone.",
+    "Surprisingly good for the price.",
+    "The staff were friendly and the room was spotless.",
+    "It broke after two days and support never replied.",
+    "Meh. Nothing special, nothing terrible.",
+    "An instant classic, I will watch it again and again.",
+    "The update made the app slower and harder to use.",
+    "Great battery life, mediocre camera.",
+    "I can't believe how bad the sequel was.",
+]
+
+
+def quantize_dynamic_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """Apply dynamic INT8 quantization to the model's Linear layers (CPU only)"""
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def apply_quantization(model: torch.nn.Module, mode: str, device: torch.device) -> torch.nn.Module:
+    """
+    Quantize a loaded model according to the configured mode
+
+    Args:
+        model: Full-precision model in eval mode
+        mode: One of QUANTIZATION_MODES
+        device: Device the model runs on
+
+    Returns:
+        The quantized model, or the original model if mode is "none"
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(
+            f"Unknown QUANTIZATION mode '{mode}'. Expected one of: {', '.join(QUANTIZATION_MODES)}"
+        )
+
+    if mode == "none":
+        return model
+
+    if device.type != "cpu":
+        raise ValueError(f"QUANTIZATION={mode} is only supported on CPU, not {device}")
+
+    logger.info("Applying dynamic INT8 quantization to Linear layers")
+    return quantize_dynamic_int8(model)
+
+
+def predict_probabilities(model, tokenizer, texts: List[str], device: torch.device) -> torch.Tensor:
+    """Class probabilities for texts in one padded forward pass"""
+    inputs = tokenizer(
+        texts,
+        return_tensors='pt',
+        padding=True,
+        truncation=True,
+        max_length=settings.MAX_SEQUENCE_LENGTH
+    )
+    inputs = {key: value.to(device) for key, value in inputs.items()}
+
+    with torch.no_grad():
+        outputs = model(**inputs)
+        return torch.nn.functional.softmax(outputs.logits, dim=-1).cpu()
+
+
+def check_quantization_drift(model, tokenizer, texts: List[str] = None) -> dict:
+    """
+    Compare dynamic INT8 predictions against full precision
+
+    Args:
+        model: Full-precision model in eval mode on CPU
+        tokenizer: Tokenizer for the model
+        texts: Texts to compare (default: DRIFT_SAMPLE_TEXTS)
+
+    Returns:
+        Dictionary with label agreement and confidence differences
+    """
+    texts = texts or DRIFT_SAMPLE_TEXTS
+    device = torch.device("cpu")
+
+    quantized = quantize_dynamic_int8(copy.deepcopy(model))
+
+    fp32_probs = predict_probabilities(model, tokenizer, texts, device)
+    int8_probs = predict_probabilities(quantized, tokenizer, texts, device)
+
+    fp32_conf, fp32_labels = torch.max(fp32_probs, dim=-1)
+    int8_conf, int8_labels = torch.max(int8_probs, dim=-1)
+    agree = fp32_labels == int8_labels
+    # Confidence drift measured on the fp32-predicted class
+    drift = (int8_probs.gather(1, fp32_labels.unsqueeze(1)).squeeze(1) - fp32_conf).abs()
+
+    id2label = model.config.id2label
+    disagreements = [
+        {
+            "text": text,
+            "fp32": (id2label[int(fp32_labels[i])], round(float(fp32_conf[i]), 4)),
+            "int8": (id2label[int(int8_labels[i])], round(float(int8_conf[i]), 4)),
+        }
+        for i, text in enumerate(texts)
+        if not agree[i]
+    ]
+
+    return {
+        "samples": len(texts),
+        "label_agreement": round(float(agree.float().mean()), 4),
+        "mean_confidence_drift": round(float(drift.mean()), 4),
+        "max_confidence_drift": round(float(drift.max()), 4),
+        "disagreements": disagreements,
+    }
@@ -0,0 +1,353 @@
+import asyncio
+import logging
+import math
+import os
+import sqlite3
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_BACKENDS = ("memory", "local", "redis")
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of charging a client against its limit"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the current window ends
+    retry_after: float  # seconds to wait before retrying (0 when allowed)
+
+
+class RateLimitStore:
+    """
+    Sliding-window-counter rate limiter over a pluggable counter store
+
+    Each client keeps only two counters: requests in the current fixed
+    window and in the previous one. The sliding count is estimated as
+    ``previous * (1 - elapsed_fraction) + current``, which smooths the
+    burst allowed at window boundaries without storing timestamps.
+    Windows are aligned to the epoch, so every store and every worker
+    agrees on window boundaries.
+
+    Subclasses implement ``_charge`` to atomically roll the client's
+    counters forward and add ``cost`` if it fits within the limit.
+    """
+
+    name = "base"
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+
+    async def hit(self, key: str, limit: int, cost: int = 1, now: Optional[float] = None) -> RateLimitResult:
+        """
+        Charge ``cost`` requests to a client if it stays within ``limit``
+
+        Rejected requests are not counted, so a client that backs off for
+        ``retry_after`` seconds is allowed again.
+        """
+        now = time.time() if now is None else now
+        window = int(now // self.window_seconds)
+        elapsed = (now % self.window_seconds) / self.window_seconds
+
+        allowed, current, previous = await self._charge(key, window, elapsed, limit, cost)
+
+        estimated = previous * (1 - elapsed) + current
+        return RateLimitResult(
+            allowed=allowed,
+            limit=limit,
+            remaining=max(0, math.floor(limit - estimated)),
+            reset_after=self.window_seconds * (1 - elapsed),
+            retry_after=0.0 if allowed else self._retry_after(current, previous, elapsed, limit, cost)
+        )
+
+    async def _charge(
+        self, key: str, window: int, elapsed: float, limit: int, cost: int
+    ) -> Tuple[bool, int, int]:
+        """
+        Roll counters to ``window`` and charge ``cost`` if within ``limit``
+
+        Returns:
+            Tuple of (allowed, current count after charging, previous count)
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release connections held by the store"""
+
+    def _retry_after(self, current: int, previous: int, elapsed: float, limit: int, cost: int) -> float:
+        """Seconds until the sliding estimate leaves room for ``cost`` requests"""
+        if cost > limit:
+            # Never satisfiable; ask the client to wait a full window
+            return self.window_seconds
+
+        if current + cost <= limit and previous > 0:
+            # The previous window's weight decays enough within this window
+            needed = 1 - (limit - current - cost) / previous
+            return max(0.0, (needed - elapsed) * self.window_seconds)
+
+        # Wait for the current window to become the previous one, then for
+        # its weight to decay enough
+        wait = (1 - elapsed) * self.window_seconds
+        if current > 0 and current + cost > limit:
+            wait += (1 - (limit - cost) / current) * self.window_seconds
+        return wait
+
+
+def _roll(stored_window: int, current: int, previous: int, window: int) -> Tuple[int, int]:
+    """Shift stored counters forward to ``window``"""
+    if stored_window == window:
+        return current, previous
+    if stored_window == window - 1:
+        return 0, current
+    return 0, 0
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Per-process counters in memory
+
+    Clients are kept in least-recently-seen order, so idle clients whose
+    counters have fully expired are evicted from the front in amortized
+    constant time, and ``max_clients`` caps memory under address churn.
+    """
+
+    name = "memory"
+
+    def __init__(self, window_seconds: float, max_clients: int = 100000):
+        super().__init__(window_seconds)
+        self.max_clients = max_clients
+        # client key -> [window index, current count, previous count]
+        self._clients: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    async def _charge(
+        self, key: str, window: int, elapsed: float, limit: int, cost: int
+    ) -> Tuple[bool, int, int]:
+        entry = self._clients.get(key)
+        if entry is None:
+            entry = [window, 0, 0]
+            self._clients[key] = entry
+        else:
+            self._clients.move_to_end(key)
+            entry[1], entry[2] = _roll(entry[0], entry[1], entry[2], window)
+            entry[0] = window
+
+        allowed = entry[2] * (1 - elapsed) + entry[1] + cost <= limit
+        if allowed:
+            entry[1] += cost
+
+        self._evict(window)
+        return allowed, entry[1], entry[2]
+
+    def _evict(self, window: int) -> None:
+        """Drop clients with no counts left in the sliding window"""
+        clients = self._clients
+        while clients:
+            key, entry = next(iter(clients.items()))
+            if entry[0] >= window - 1 and len(clients) <= self.max_clients:
+                break
+            del clients[key]
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+class LocalRateLimitStore(RateLimitStore):
+    """
+    Counters shared by all worker processes on one host
+
+    Stored in a small SQLite database, by default under /dev/shm so it
+    lives in shared memory. Each charge is one short ``BEGIN IMMEDIATE``
+    transaction, which serializes concurrent workers; durability is
+    switched off since counters are disposable.
+
+    Transactions run on a dedicated thread, so waiting for another
+    worker's write lock never blocks the event loop, and the connection
+    is only ever used from that thread.
+    """
+
+    name = "local"
+
+    # Expired clients are deleted once every this many charges
+    _SWEEP_INTERVAL = 1000
+    # Longest wait for another worker's write lock before a charge fails
+    _BUSY_TIMEOUT_SECONDS = 0.5
+
+    def __init__(self, window_seconds: float, path: str):
+        super().__init__(window_seconds)
+        self.path = path
+        self._charges = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, on the store's thread"""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=self._BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, window INTEGER NOT NULL, "
+                "current INTEGER NOT NULL, previous INTEGER NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    async def _charge(
+        self, key: str, window: int, elapsed: float, limit: int, cost: int
+    ) -> Tuple[bool, int, int]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._thread, self._charge_blocking, key, window, elapsed, limit, cost
+        )
+
+    def _charge_blocking(
+        self, key: str, window: int, elapsed: float, limit: int, cost: int
+    ) -> Tuple[bool, int, int]:
+        """Roll and charge a client's counters in one write transaction"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT window, current, previous FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            current, previous = _roll(*row, window) if row else (0, 0)
+
+            allowed = previous * (1 - elapsed) + current + cost <= limit
+            if allowed:
+                current += cost
+
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, window, current, previous) VALUES (?, ?, ?, ?)",
+                (key, window, current, previous)
+            )
+
+            self._charges += 1
+            if self._charges % self._SWEEP_INTERVAL == 0:
+                conn.execute("DELETE FROM rate_limits WHERE window < ?", (window - 1,))
+
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return allowed, current, previous
+
+    async def close(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._thread, self._close_blocking)
+        self._thread.shutdown(wait=False)
+
+    def _close_blocking(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Atomically roll a client's counters and charge the cost if it fits.
+# KEYS[1] = client hash; ARGV = window, limit, cost, elapsed fraction, ttl
+_REDIS_CHARGE_SCRIPT = """
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local elapsed = tonumber(ARGV[4])
+local stored = redis.call('HMGET', KEYS[1], 'window', 'current', 'previous')
+local current, previous = 0, 0
+if stored[1] then
+    local stored_window = tonumber(stored[1])
+    if stored_window == window then
+        current = tonumber(stored[2])
+        previous = tonumber(stored[3])
+    elseif stored_window == window - 1 then
+        previous = tonumber(stored[2])
+    end
+end
+local allowed = 0
+if previous * (1 - elapsed) + current + cost <= limit then
+    allowed = 1
+    current = current + cost
+end
+redis.call('HSET', KEYS[1], 'window', window, 'current', current, 'previous', previous)
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return {allowed, current, previous}
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Counters in Redis (or any server speaking its protocol), shared by
+    workers on every host
+
+    Each charge is a single Lua script call, so it is atomic and costs
+    one round trip. Keys expire two windows after their last use.
+    """
+
+    name = "redis"
+
+    def __init__(self, window_seconds: float, url: str, key_prefix: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the redis package")
+
+        super().__init__(window_seconds)
+        self.key_prefix = key_prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_CHARGE_SCRIPT)
+        self._ttl = int(math.ceil(window_seconds * 2))
+
+    async def _charge(
+        self, key: str, window: int, elapsed: float, limit: int, cost: int
+    ) -> Tuple[bool, int, int]:
+        allowed, current, previous = await self._script(
+            keys=[f"{self.key_prefix}:{key}"],
+            args=[window, limit, cost, repr(elapsed), self._ttl]
+        )
+        return bool(allowed), int(current), int(previous)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def _default_local_path() -> str:
+    """Shared-memory database path for the local store"""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return str(Path(directory) / "sentiment-api-ratelimit.db")
+
+
+def create_rate_limit_store() -> RateLimitStore:
+    """
+    Create the configured rate limit store
+
+    Raises:
+        ValueError: For unknown backends
+    """
+    backend = settings.RATE_LIMIT_BACKEND
+    window = settings.RATE_LIMIT_WINDOW
+
+    if backend not in RATE_LIMIT_BACKENDS:
+        raise ValueError(
+            f"Unknown RATE_LIMIT_BACKEND '{backend}'. Expected one of: {', '.join(RATE_LIMIT_BACKENDS)}"
+        )
+
+    if backend == "local":
+        path = settings.RATE_LIMIT_LOCAL_PATH or _default_local_path()
+        logger.info(f"Rate limit counters shared through {path}")
+        return LocalRateLimitStore(window, path)
+
+    if backend == "redis":
+        logger.info("Rate limit counters shared through Redis")
+        return RedisRateLimitStore(window, settings.RATE_LIMIT_REDIS_URL, settings.RATE_LIMIT_KEY_PREFIX)
+
+    return MemoryRateLimitStore(window, max_clients=settings.RATE_LIMIT_MAX_CLIENTS)
@@ -0,0 +1,288 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, List, NamedTuple, Optional
+
+from pydantic import ValidationError
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from .config import settings
+from .executor import QueueFullError
+from .model_manager import ModelManager
+from .model_registry import model_registry
+from app.schemas import TextInput
+from app.utils.helpers import format_confidence, preprocess_text
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retrying a batch the inference queue turned away,
+# and the longest a batch keeps retrying before it is reported as failed
+_QUEUE_FULL_BACKOFF = 0.05
+_QUEUE_FULL_MAX_WAIT = 30.0
+
+
+class StreamItem(NamedTuple):
+    """One input line: a text to analyze, or the reason it was rejected"""
+
+    line: int
+    id: Optional[object]
+    text: Optional[str]
+    error: Optional[str]
+
+
+class StreamAbort(Exception):
+    """Raised by a charge callback to end the stream with an inline error"""
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose content generator reads the request body
+
+    StreamingResponse normally listens for client disconnects on
+    ``receive`` while streaming, which would swallow body chunks the
+    generator still needs. Here the generator owns ``receive``; a
+    disconnect surfaces as ClientDisconnect from ``request.stream()``.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def parse_line(raw: bytes, line: int, plain_text: bool) -> Optional[StreamItem]:
+    """
+    Parse one NDJSON (or plain text) line into a stream item
+
+    NDJSON lines are either a JSON string or an object with a ``text``
+    field and an optional ``id`` echoed back with the result. Blank
+    lines are skipped.
+    """
+    try:
+        decoded = raw.decode("utf-8").strip()
+    except UnicodeDecodeError:
+        return StreamItem(line, None, None, "Line is not valid UTF-8")
+
+    if not decoded:
+        return None
+
+    if plain_text:
+        return parse_value(decoded, line)
+
+    try:
+        value = json.loads(decoded)
+    except ValueError:
+        return StreamItem(line, None, None, "Line is not valid JSON")
+    return parse_value(value, line)
+
+
+def parse_value(value: object, line: int) -> StreamItem:
+    """Validate one decoded input: a string or an object with ``text`` and ``id``"""
+    item_id = None
+    if isinstance(value, dict):
+        item_id = value.get("id")
+        text = value.get("text")
+    else:
+        text = value
+
+    if not isinstance(text, str):
+        return StreamItem(line, item_id, None, "Expected a JSON string or an object with a 'text' string")
+
+    try:
+        text = TextInput(text=text).text
+    except ValidationError as e:
+        return StreamItem(line, item_id, None, e.errors()[0]["msg"])
+
+    return StreamItem(line, item_id, preprocess_text(text), None)
+
+
+async def read_batches(
+    chunks: AsyncIterator[bytes],
+    plain_text: bool,
+    batch_size: int,
+    max_line_bytes: int
+) -> AsyncIterator[List[StreamItem]]:
+    """
+    Split a streamed request body into batches of parsed lines
+
+    A batch is emitted when it holds ``batch_size`` texts and whenever a
+    received chunk is used up, so slow producers still get prompt
+    results. Lines longer than ``max_line_bytes`` are reported as errors
+    without being buffered, which bounds memory whatever the input.
+    """
+    buffer = bytearray()
+    batch: List[StreamItem] = []
+    texts_in_batch = 0
+    line = 0
+    oversized = False
+
+    def add(item: Optional[StreamItem]) -> None:
+        nonlocal texts_in_batch
+        if item is not None:
+            batch.append(item)
+            if item.text is not None:
+                texts_in_batch += 1
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline < 0:
+                if not oversized:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        oversized = True
+                        buffer.clear()
+                break
+
+            line += 1
+            if oversized:
+                add(StreamItem(line, None, None, f"Line exceeds {max_line_bytes} bytes"))
+                oversized = False
+            else:
+                buffer += chunk[start:newline]
+                if len(buffer) > max_line_bytes:
+                    add(StreamItem(line, None, None, f"Line exceeds {max_line_bytes} bytes"))
+                else:
+                    add(parse_line(bytes(buffer), line, plain_text))
+            buffer.clear()
+            start = newline + 1
+
+            if texts_in_batch >= batch_size:
+                yield batch
+                batch, texts_in_batch = [], 0
+
+        if batch:
+            yield batch
+            batch, texts_in_batch = [], 0
+
+    # Final line without a trailing newline
+    if oversized or buffer:
+        line += 1
+        if oversized:
+            add(StreamItem(line, None, None, f"Line exceeds {max_line_bytes} bytes"))
+        else:
+            add(parse_line(bytes(buffer), line, plain_text))
+    if batch:
+        yield batch
+
+
+async def _predict(model: ModelManager, texts: List[str], priority: str, tier: str):
+    """
+    Run batched inference, waiting out a full queue instead of failing
+
+    Raises:
+        QueueFullError: If the queue stays full for _QUEUE_FULL_MAX_WAIT seconds
+    """
+    deadline = asyncio.get_running_loop().time() + _QUEUE_FULL_MAX_WAIT
+    while True:
+        try:
+            return await model_registry.predict(model, texts, tier, priority)
+        except QueueFullError:
+            if asyncio.get_running_loop().time() + _QUEUE_FULL_BACKOFF > deadline:
+                raise
+            await asyncio.sleep(_QUEUE_FULL_BACKOFF)
+
+
+def _result_line(item: StreamItem, **fields) -> bytes:
+    record = {"line": item.line}
+    if item.id is not None:
+        record["id"] = item.id
+    record.update(fields)
+    return (json.dumps(record) + "\n").encode("utf-8")
+
+
+async def stream_predictions(
+    chunks: AsyncIterator[bytes],
+    plain_text: bool = False,
+    charge: Optional[Callable[[int], Awaitable[None]]] = None,
+    priority: str = "batch",
+    model: Optional[ModelManager] = None,
+    tier: str = "standard"
+) -> AsyncIterator[bytes]:
+    """
+    Analyze a streamed body and yield one NDJSON result line per input line
+
+    Parsing runs ahead of inference by at most STREAM_PREFETCH_BATCHES
+    batches; when inference falls behind, the request body stops being
+    read and TCP flow control slows the client down. Invalid lines and
+    failed batches are reported inline, and a final summary line reports
+    totals.
+
+    Args:
+        chunks: Request body chunks
+        plain_text: Treat each line as raw text instead of NDJSON
+        charge: Optional callback charging texts to the caller's rate
+            limit; raising StreamAbort ends the stream
+        priority: Priority class for inference calls
+        model: Model to run (default: the default model)
+        tier: Truncation tier (standard or fast)
+    """
+    model = model or model_registry.default
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, settings.STREAM_PREFETCH_BATCHES))
+
+    async def produce():
+        try:
+            async for batch in read_batches(
+                chunks, plain_text, settings.STREAM_BATCH_SIZE, settings.STREAM_MAX_LINE_BYTES
+            ):
+                await queue.put(batch)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    processed = errors = 0
+
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            if isinstance(batch, Exception):
+                logger.warning(f"Stream input failed: {str(batch)}")
+                yield (json.dumps({"error": f"Error reading input: {str(batch)}"}) + "\n").encode("utf-8")
+                errors += 1
+                break
+
+            valid = [item for item in batch if item.text is not None]
+            predictions = {}
+            batch_error = None
+            if valid:
+                try:
+                    if charge is not None:
+                        await charge(len(valid))
+                    results = await _predict(model, [item.text for item in valid], priority, tier)
+                    predictions = {item.line: result for item, result in zip(valid, results)}
+                except StreamAbort as e:
+                    yield (json.dumps({"error": str(e)}) + "\n").encode("utf-8")
+                    errors += 1
+                    break
+                except QueueFullError as e:
+                    logger.warning(f"Streamed batch dropped, inference queue stayed full: {str(e)}")
+                    batch_error = f"Error analyzing sentiment: {str(e)}"
+                except Exception as e:
+                    logger.error(f"Error during streamed sentiment analysis: {str(e)}")
+                    batch_error = f"Error analyzing sentiment: {str(e)}"
+
+            lines = []
+            for item in batch:
+                if item.line in predictions:
+                    sentiment, confidence = predictions[item.line]
+                    lines.append(_result_line(item, sentiment=sentiment, confidence=format_confidence(confidence)))
+                    processed += 1
+                else:
+                    lines.append(_result_line(item, error=item.error or batch_error))
+                    errors += 1
+            yield b"".join(lines)
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except (asyncio.CancelledError, Exception):
+            pass
+
+    yield (json.dumps({"done": True, "processed": processed, "errors": errors}) + "\n").encode("utf-8")
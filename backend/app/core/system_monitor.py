@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from .config import settings
+from .metrics import metrics
+from app.utils.helpers import get_process_memory, get_system_info
+
+
+logger = logging.getLogger(__name__)
+
+
+class SystemMonitor:
+    """
+    Periodically sample system and process stats into a cached snapshot
+
+    Health endpoints and metric scrapes read the snapshot instead of
+    calling psutil, so a probe costs a dict copy. CPU percentages are
+    measured over the sampling interval rather than by sleeping inside
+    the request. Samples are taken on a worker thread, as reading private
+    and shared memory parses /proc/<pid>/smaps.
+    """
+
+    def __init__(self, interval_seconds: float = 5.0):
+        self.interval = max(0.5, interval_seconds)
+        self._snapshot: Dict[str, object] = {}
+        self._process_memory: Dict[str, int] = {}
+        self._sampled_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Take a first sample and start the background sampling task"""
+        if self._task is not None:
+            return
+
+        await asyncio.to_thread(self.sample)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"System monitor started: interval={self.interval:.1f}s")
+
+    async def stop(self) -> None:
+        """Stop the background sampling task"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("System monitor stopped")
+
+    def sample(self) -> None:
+        """Refresh the snapshot (blocking; runs off the event loop)"""
+        self._process_memory = get_process_memory()
+        self._snapshot = get_system_info(self._process_memory)
+        self._sampled_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, object]:
+        """Latest sample plus its age in seconds"""
+        snapshot = dict(self._snapshot)
+        if self._sampled_at is not None:
+            snapshot["sample_age_seconds"] = round(time.monotonic() - self._sampled_at, 2)
+        return snapshot
+
+    def process_memory(self) -> Dict[str, int]:
+        """Latest sample of this process's memory by kind (rss, uss, shared, pss)"""
+        return self._process_memory
+
+    async def _run(self) -> None:
+        """Sample on a fixed interval until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.sample)
+            except Exception as e:
+                logger.warning(f"System sampling failed: {str(e)}")
+
+
+# Global system monitor instance
+system_monitor = SystemMonitor(interval_seconds=settings.SYSTEM_SAMPLE_INTERVAL_SECONDS)
+
+metrics.collected(
+    "process_memory_bytes", "Resident memory of this process by kind (rss, uss, shared, pss), as of the last system sample", "gauge",
+    ("kind",), lambda: {(kind,): value for kind, value in system_monitor.process_memory().items()}
+)
@@ -1,43 +1,138 @@
 from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from collections import defaultdict
-from time import time
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Iterable, Optional, Tuple
+import math
 import logging
 
+from app.core.rate_limit import MemoryRateLimitStore, RateLimitResult, RateLimitStore
+
 logger = logging.getLogger(__name__)
 
 
-class RateLimiter(BaseHTTPMiddleware):
-    """Simple in-memory rate limiter middleware"""
-    
-    def __init__(self, app, requests_limit: int = 100, window_seconds: int = 60):
-        super().__init__(app)
+class RateLimiter:
+    """
+    Sliding-window rate limiter middleware
+
+    Clients are identified by API key when the request carries one of the
+    configured keys, and by IP address otherwise. Each API key can have its
+    own limit. Every response carries ``X-RateLimit-*`` headers, and
+    rejected requests get a 429 with ``Retry-After``.
+
+    Counters live in a pluggable store; use a shared store so several
+    workers enforce one budget. Each request is charged once here, and
+    endpoints can charge more with ``charge_request``. Written as plain
+    ASGI so allowed requests pass through without BaseHTTPMiddleware's
+    extra task and stream.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_limit: int = 100,
+        window_seconds: int = 60,
+        api_key_header: str = "X-API-Key",
+        api_key_limits: Optional[Dict[str, int]] = None,
+        store: Optional[RateLimitStore] = None,
+        exempt_paths: Iterable[str] = ()
+    ):
+        self.app = app
         self.requests_limit = requests_limit
         self.window_seconds = window_seconds
-        self.requests = defaultdict(list)
-    
-    async def dispatch(self, request: Request, call_next):
-        # Get client IP
-        client_ip = request.client.host
-        
-        # Clean old requests
-        current_time = time()
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip]
-            if current_time - req_time < self.window_seconds
-        ]
-        
-        # Check rate limit
-        if len(self.requests[client_ip]) >= self.requests_limit:
-            logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-            raise HTTPException(
-                status_code=429,
-                detail=f"Rate limit exceeded. Maximum {self.requests_limit} requests per {self.window_seconds} seconds."
-            )
-        
-        # Add current request
-        self.requests[client_ip].append(current_time)
-        
+        self.api_key_header = api_key_header
+        self.api_key_limits = api_key_limits or {}
+        self.store = store or MemoryRateLimitStore(window_seconds)
+        self.exempt_paths = frozenset(exempt_paths)
+
+    def _identify(self, scope: Scope) -> Tuple[str, int]:
+        """Return the client key and its request limit"""
+        api_key = Headers(scope=scope).get(self.api_key_header)
+        # Unknown keys fall back to the IP limit so they cannot be used to dodge it
+        if api_key and api_key in self.api_key_limits:
+            return f"key:{api_key}", self.api_key_limits[api_key]
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        return f"ip:{client_ip}", self.requests_limit
+
+    @staticmethod
+    def _headers(result: RateLimitResult) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(math.ceil(result.reset_after)),
+        }
+
+    def _rejection(self, client_key: str, result: RateLimitResult):
+        """Log a rejected request and build its detail message and headers"""
+        # Never write full API keys to the logs
+        client_label = client_key if client_key.startswith("ip:") else f"{client_key[:8]}***"
+        logger.warning(f"Rate limit exceeded for {client_label}")
+
+        headers = self._headers(result)
+        headers["Retry-After"] = str(max(1, math.ceil(result.retry_after)))
+        detail = f"Rate limit exceeded. Maximum {result.limit} requests per {self.window_seconds} seconds."
+        return detail, headers
+
+    async def charge(self, client_key: str, limit: int, cost: int) -> Optional[RateLimitResult]:
+        """Charge a client, failing open if the store is unavailable"""
+        try:
+            return await self.store.hit(client_key, limit, cost)
+        except Exception as e:
+            logger.error(f"Rate limit store error, allowing request: {str(e)}")
+            return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        client_key, limit = self._identify(scope)
+        result = await self.charge(client_key, limit, 1)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not result.allowed:
+            detail, headers = self._rejection(client_key, result)
+            response = JSONResponse(status_code=429, content={"detail": detail}, headers=headers)
+            await response(scope, receive, send)
+            return
+
+        # Let endpoints charge additional units to the same client
+        scope.setdefault("state", {})["rate_limit"] = (self, client_key, limit)
+        rate_limit_headers = self._headers(result)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                # Keep headers from an endpoint's own 429 (see charge_request)
+                for name, value in rate_limit_headers.items():
+                    if name not in headers:
+                        headers[name] = value
+            await send(message)
+
         # Process request
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send_wrapper)
+
+
+async def charge_request(request: Request, cost: int) -> None:
+    """
+    Charge extra units to the caller's rate limit from inside an endpoint
+
+    Used by batch endpoints so each text counts against the limit rather
+    than each HTTP call. Does nothing when rate limiting is disabled.
+
+    Raises:
+        HTTPException: 429 if the charge exceeds the caller's limit
+    """
+    rate_limit = getattr(request.state, "rate_limit", None)
+    if rate_limit is None or cost <= 0:
+        return
+
+    limiter, client_key, limit = rate_limit
+    result = await limiter.charge(client_key, limit, cost)
+    if result is not None and not result.allowed:
+        detail, headers = limiter._rejection(client_key, result)
+        raise HTTPException(status_code=429, detail=detail, headers=headers)
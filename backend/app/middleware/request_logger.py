@@ -1,35 +1,65 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import time
 import logging
+from app.core.config import settings
+from app.core.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION
 
 logger = logging.getLogger(__name__)
 
 
-class RequestLoggerMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all requests and responses with timing"""
+class RequestLoggerMiddleware:
+    """
+    Middleware to log all requests and responses with timing
+
+    Written as plain ASGI rather than BaseHTTPMiddleware, so responses
+    (including streaming ones) pass straight through without an extra
+    task and memory stream per request.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Start timer
         start_time = time.time()
+        method = scope["method"]
+        path = scope["path"]
+        status_code = 500
         
         # Log request
-        logger.info(f"Request: {request.method} {request.url.path}")
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate processing time
-        process_time = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"Response: {request.method} {request.url.path} - "
-            f"Status: {response.status_code} - "
-            f"Time: {process_time:.3f}s"
-        )
+        logger.info(f"Request: {method} {path}")
         
-        # Add custom header with processing time
-        response.headers["X-Process-Time"] = str(process_time)
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add custom header with processing time
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", str(time.time() - start_time))
+            await send(message)
         
-        return response
+        try:
+            # Process request
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Calculate processing time, including the response body
+            process_time = time.time() - start_time
+            
+            # Log response
+            logger.info(
+                f"Response: {method} {path} - "
+                f"Status: {status_code} - "
+                f"Time: {process_time:.3f}s"
+            )
+            
+            # Record metrics by route template to keep label cardinality bounded
+            if settings.METRICS_ENABLED:
+                route = scope.get("route")
+                route_path = route.path if route is not None else "unmatched"
+                HTTP_REQUESTS.labels(route_path, method, status_code).inc()
+                HTTP_REQUEST_DURATION.labels(route_path, method).observe(process_time)
@@ -4,7 +4,15 @@ from .sentiment import (
     SentimentResult,
     BatchSentimentResult,
     HealthResponse,
+    ProbeResponse,
     ModelInfo,
+    ModelsInfo,
+    ModelReloadRequest,
+    ModelReloadStatus,
+    CacheStats,
+    JobStatus,
+    JobResultItem,
+    JobResults,
     ErrorResponse
 )
 
@@ -14,6 +22,14 @@ __all__ = [
     "SentimentResult",
     "BatchSentimentResult",
     "HealthResponse",
+    "ProbeResponse",
     "ModelInfo",
+    "ModelsInfo",
+    "ModelReloadRequest",
+    "ModelReloadStatus",
+    "CacheStats",
+    "JobStatus",
+    "JobResultItem",
+    "JobResults",
     "ErrorResponse"
 ]
@@ -1,10 +1,14 @@
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional
+from typing import Any, List, Literal, Optional
 
 
 class TextInput(BaseModel):
     """Single text input for sentiment analysis"""
     text: str = Field(..., min_length=1, max_length=5000, description="Text to analyze")
+    model: Optional[str] = Field(None, description="Registered model to use (default: the default model)")
+    tier: Literal["standard", "fast"] = Field(
+        "standard", description="Truncation tier: fast caps long texts at fewer tokens for lower latency"
+    )
     
     @validator('text')
     def text_not_empty(cls, v):
@@ -16,6 +20,10 @@ class TextInput(BaseModel):
 class BatchTextInput(BaseModel):
     """Multiple texts input for batch sentiment analysis"""
     texts: List[str] = Field(..., min_items=1, max_items=50, description="List of texts to analyze")
+    model: Optional[str] = Field(None, description="Registered model to use (default: the default model)")
+    tier: Literal["standard", "fast"] = Field(
+        "standard", description="Truncation tier: fast caps long texts at fewer tokens for lower latency"
+    )
     
     @validator('texts')
     def texts_not_empty(cls, v):
@@ -44,19 +52,134 @@ class BatchSentimentResult(BaseModel):
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str = Field(..., description="Service status")
+    readiness: str = Field(..., description="Model readiness (not_loaded, loading, warming, ready, failed)")
     device: str = Field(..., description="Device being used (CPU/CUDA)")
     model_loaded: bool = Field(..., description="Whether model is loaded")
     system_info: Optional[dict] = Field(None, description="System information")
 
 
+class ProbeResponse(BaseModel):
+    """Liveness or readiness probe response"""
+    status: str = Field(..., description="Probe status (alive, ready, unavailable)")
+    readiness: Optional[str] = Field(None, description="Model readiness (not_loaded, loading, warming, ready, failed)")
+
+
+class ModelReloadRequest(BaseModel):
+    """Request to load a new version of a model without downtime"""
+    model: Optional[str] = Field(None, description="Registered model to reload (default: the default model)")
+    model_name: Optional[str] = Field(
+        None, description="New model name or path (default: reload the current one from the same place)"
+    )
+    tokenizer_name: Optional[str] = Field(None, description="New tokenizer name or path")
+
+
+class ModelReloadStatus(BaseModel):
+    """Progress of a model reload"""
+    state: str = Field(..., description="Reload state (loading, completed, failed)")
+    model_name: str = Field(..., description="Model name or path being loaded")
+    previous_version: Optional[str] = Field(None, description="Version serving when the reload started")
+    version: Optional[str] = Field(None, description="Version serving after the reload")
+    started_at: float = Field(..., description="Time the reload started (Unix seconds)")
+    finished_at: Optional[float] = Field(None, description="Time the reload finished (Unix seconds)")
+    error: Optional[str] = Field(None, description="Why the reload failed")
+
+
 class ModelInfo(BaseModel):
-    """Model information response"""
-    status: str = Field(..., description="Model status")
+    """Information about one registered model"""
+    status: str = Field(..., description="Model status (loaded, not_loaded)")
+    readiness: Optional[str] = Field(None, description="Model readiness (not_loaded, loading, warming, ready, failed)")
+    name: Optional[str] = Field(None, description="Registered name used to select the model")
+    default: Optional[bool] = Field(None, description="Whether this is the default model")
     model_name: Optional[str] = Field(None, description="Model name")
+    version: Optional[str] = Field(None, description="Fingerprint of the loaded weights, part of every cache key")
+    model_source: Optional[str] = Field(None, description="Hub name or local snapshot the weights were loaded from")
     tokenizer_name: Optional[str] = Field(None, description="Tokenizer name")
+    fast_tokenizer: Optional[bool] = Field(None, description="Whether the Rust-backed fast tokenizer is in use")
     device: Optional[str] = Field(None, description="Device")
+    backend: Optional[str] = Field(None, description="Inference backend (pytorch, torchscript, onnx)")
+    quantization: Optional[str] = Field(None, description="Active quantization mode")
     max_sequence_length: Optional[int] = Field(None, description="Maximum sequence length")
+    max_batch_tokens: Optional[int] = Field(None, description="Maximum padded tokens per forward pass")
     parameters: Optional[int] = Field(None, description="Number of model parameters")
+    padding_efficiency: Optional[float] = Field(
+        None, description="Real tokens divided by padded tokens across batched inference"
+    )
+    truncation: Optional[dict] = Field(
+        None, description="Truncation strategy and, per tier, token limit and how often texts were truncated"
+    )
+    startup_timings: Optional[dict] = Field(
+        None, description="Seconds spent on import, tokenizer, weights and warmup at startup"
+    )
+    memory_bytes: Optional[int] = Field(None, description="Approximate memory the loaded model holds")
+    requests: Optional[int] = Field(None, description="Requests served by this model")
+    active_requests: Optional[int] = Field(None, description="Requests currently using this model")
+    texts: Optional[int] = Field(None, description="Texts analyzed by this model")
+    last_used: Optional[float] = Field(None, description="Time of the last inference (Unix seconds)")
+    reload: Optional[ModelReloadStatus] = Field(None, description="Most recent reload, if any")
+
+
+class ModelsInfo(BaseModel):
+    """Model registry response"""
+    default_model: str = Field(..., description="Name of the model used when a request names none")
+    memory_budget_bytes: Optional[int] = Field(None, description="Memory budget for loaded models, if set")
+    memory_used_bytes: int = Field(..., description="Approximate memory held by loaded models")
+    evictions: int = Field(0, description="Models unloaded to stay within the memory budget")
+    models: List[ModelInfo] = Field(..., description="Every registered model, default first")
+
+
+class CacheStats(BaseModel):
+    """Prediction cache statistics response"""
+    enabled: bool = Field(..., description="Whether the prediction cache is enabled")
+    entries: int = Field(0, description="Number of cached predictions")
+    bytes: int = Field(0, description="Approximate memory used by cached predictions")
+    max_entries: Optional[int] = Field(None, description="Maximum number of entries")
+    max_bytes: Optional[int] = Field(None, description="Maximum cache size in bytes")
+    ttl_seconds: Optional[float] = Field(None, description="Entry lifetime in seconds")
+    hits: int = Field(0, description="Lookups served from the cache")
+    misses: int = Field(0, description="Lookups that required inference")
+    coalesced: int = Field(0, description="Misses that waited on an identical in-flight prediction")
+    evictions: int = Field(0, description="Entries evicted to stay within budget")
+    expirations: int = Field(0, description="Entries dropped after their TTL")
+    disk_hits: int = Field(0, description="Misses served from the persistent disk cache")
+    hit_ratio: Optional[float] = Field(None, description="Fraction of lookups served without new inference")
+    disk: Optional[dict] = Field(None, description="Persistent disk cache statistics")
+
+
+class JobStatus(BaseModel):
+    """Background job status and progress"""
+    id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="Job status (receiving, queued, running, completed, failed, cancelled)")
+    model: Optional[str] = Field(None, description="Registered model the job runs on (default: the default model)")
+    tier: Optional[str] = Field(None, description="Truncation tier the job runs in (default: standard)")
+    total: int = Field(..., description="Number of submitted texts")
+    processed: int = Field(..., description="Texts processed so far, including invalid ones")
+    failed: int = Field(..., description="Texts that were invalid or could not be analyzed")
+    progress: float = Field(..., ge=0.0, le=1.0, description="Fraction of texts processed")
+    error: Optional[str] = Field(None, description="Reason the job failed")
+    created_at: float = Field(..., description="Submission time (Unix seconds)")
+    started_at: Optional[float] = Field(None, description="Time processing started (Unix seconds)")
+    finished_at: Optional[float] = Field(None, description="Time processing finished (Unix seconds)")
+
+
+class JobResultItem(BaseModel):
+    """Result for one text of a background job"""
+    index: int = Field(..., description="Position of the text in the submitted job")
+    id: Optional[Any] = Field(None, description="Identifier supplied with the text")
+    text: Optional[str] = Field(None, description="Analyzed text")
+    sentiment: Optional[str] = Field(None, description="Predicted sentiment (POSITIVE or NEGATIVE)")
+    confidence: Optional[float] = Field(None, description="Confidence score")
+    error: Optional[str] = Field(None, description="Why the text could not be analyzed")
+    done: bool = Field(..., description="Whether the text has been processed")
+
+
+class JobResults(BaseModel):
+    """One page of background job results"""
+    id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="Job status")
+    total: int = Field(..., description="Number of submitted texts")
+    offset: int = Field(..., description="Index of the first result on this page")
+    next_offset: Optional[int] = Field(None, description="Offset of the next page, if any")
+    results: List[JobResultItem] = Field(..., description="Results in input order")
 
 
 class ErrorResponse(BaseModel):
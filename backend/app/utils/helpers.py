@@ -1,14 +1,39 @@
+import os
 import psutil
 import platform
-from typing import Dict
+from typing import Dict, Optional
 
+# Current process, reused so CPU percentages measure between calls
+_process = psutil.Process()
 
-def get_system_info() -> Dict[str, any]:
-    """Get system information including CPU, memory, and platform details"""
+
+def _current_process() -> psutil.Process:
+    """The calling process, re-resolved in workers forked after import"""
+    global _process
+    if _process.pid != os.getpid():
+        _process = psutil.Process()
+    return _process
+
+
+def get_system_info(process_memory: Optional[Dict[str, int]] = None) -> Dict[str, any]:
+    """
+    Get system information including CPU, memory, process and platform details
+    
+    Does not block: CPU percentages cover the time since the previous call,
+    so call this periodically (see SystemMonitor) rather than per request.
+    ``process_memory`` reuses a get_process_memory() result already taken.
+    """
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         
+        process = _current_process()
+        with process.oneshot():
+            if process_memory is None:
+                process_memory = get_process_memory(process)
+            process_cpu_percent = process.cpu_percent(interval=None)
+            process_threads = process.num_threads()
+        
         return {
             "platform": platform.system(),
             "platform_version": platform.version(),
@@ -16,12 +41,43 @@ def get_system_info() -> Dict[str, any]:
             "cpu_percent": cpu_percent,
             "memory_total_gb": round(memory.total / (1024**3), 2),
             "memory_available_gb": round(memory.available / (1024**3), 2),
-            "memory_percent": memory.percent
+            "memory_percent": memory.percent,
+            "process_id": process.pid,
+            **{
+                f"process_{kind}_mb": round(value / (1024**2), 1)
+                for kind, value in process_memory.items()
+            },
+            "process_cpu_percent": process_cpu_percent,
+            "process_threads": process_threads
         }
     except Exception as e:
         return {"error": str(e)}
 
 
+def get_process_memory(process: Optional[psutil.Process] = None) -> Dict[str, int]:
+    """
+    Resident memory of a process split into private and shared bytes
+    
+    ``rss`` counts every resident page, including pages shared with other
+    processes (such as model weights inherited from a pre-fork parent);
+    ``uss`` counts pages only this process holds, i.e. what it really adds,
+    ``shared`` the difference, and ``pss`` charges each shared page
+    proportionally to the processes sharing it. Where private and shared
+    pages cannot be told apart (non-Linux, or no permission), only ``rss``
+    is reported.
+    """
+    process = process or _current_process()
+    try:
+        info = process.memory_full_info()
+    except (psutil.AccessDenied, NotImplementedError):
+        return {"rss": process.memory_info().rss}
+    
+    memory = {"rss": info.rss, "uss": info.uss, "shared": max(0, info.rss - info.uss)}
+    if hasattr(info, "pss"):
+        memory["pss"] = info.pss
+    return memory
+
+
 def format_confidence(confidence: float, decimals: int = 3) -> float:
     """Format confidence score to specified decimal places"""
     return round(confidence, decimals)
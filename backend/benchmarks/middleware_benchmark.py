@@ -0,0 +1,182 @@
+"""
+Middleware benchmark: requests/sec with and without the middleware stack
+
+Drives the ASGI app directly (no server, no sockets) with a stub model, so
+the numbers isolate framework and middleware overhead from inference.
+Three stacks are compared:
+
+    none      - routes only
+    stack     - the app's real middleware (CORS, request logger, rate limiter)
+    basehttp  - routes behind two pass-through BaseHTTPMiddleware layers,
+                the cost the old middleware paid before doing any work
+
+Usage:
+    python benchmarks/middleware_benchmark.py
+    python benchmarks/middleware_benchmark.py --requests 20000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep per-request log I/O and rate limiting rejections out of the measurement
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("RATE_LIMIT_REQUESTS", str(10 ** 9))
+
+from fastapi import FastAPI  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.api import router  # noqa: E402
+from app.core.batcher import micro_batcher  # noqa: E402
+from app.core.executor import inference_executor  # noqa: E402
+from app.core.model_manager import model_manager  # noqa: E402
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    """BaseHTTPMiddleware that does nothing but call the next app"""
+
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def build_apps() -> dict:
+    """Create the app variants to compare"""
+    bare = FastAPI()
+    bare.include_router(router)
+
+    basehttp = FastAPI()
+    basehttp.add_middleware(PassThroughMiddleware)
+    basehttp.add_middleware(PassThroughMiddleware)
+    basehttp.include_router(router)
+
+    return {"none": bare, "stack": create_app(), "basehttp": basehttp}
+
+
+def stub_model() -> None:
+    """Replace inference with a constant prediction"""
+    model_manager.state = "ready"
+    model_manager._predict_uncached = lambda texts, tier="standard": [("POSITIVE", 0.99)] * len(texts)
+
+
+async def call(app, method: str, path: str, body: bytes) -> int:
+    """Send one HTTP request through the ASGI app and return its status"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"benchmark"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    request_sent = False
+    status = 0
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run(app, method: str, path: str, body: bytes, total: int, concurrency: int) -> dict:
+    """Issue ``total`` requests from ``concurrency`` concurrent clients"""
+    latencies = []
+    statuses = {}
+    remaining = total
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            status = await call(app, method, path, body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "statuses": statuses,
+    }
+
+
+async def benchmark(args) -> None:
+    stub_model()
+    inference_executor.start()
+    await micro_batcher.start()
+
+    body = json.dumps({"text": "I love this movie! It's absolutely fantastic."}).encode()
+    method = "POST" if args.path.startswith("/analyze") else "GET"
+    apps = build_apps()
+
+    print("=" * 60)
+    print(f"  {method} {args.path}: {args.requests} requests, concurrency {args.concurrency}")
+    print("=" * 60)
+    print(f"  {'stack':<10}{'req/s':>12}{'p50 (ms)':>12}{'p99 (ms)':>12}  statuses")
+
+    results = {}
+    try:
+        for name, app in apps.items():
+            # Warm up routing, caches and the stub path
+            await run(app, method, args.path, body, min(500, args.requests), args.concurrency)
+            results[name] = await run(app, method, args.path, body, args.requests, args.concurrency)
+            r = results[name]
+            print(f"  {name:<10}{r['rps']:>12.0f}{r['p50_ms']:>12.3f}{r['p99_ms']:>12.3f}  {r['statuses']}")
+    finally:
+        await micro_batcher.stop()
+        inference_executor.shutdown()
+
+    print("=" * 60)
+    print(f"  Middleware stack throughput vs none: {results['stack']['rps'] / results['none']['rps']:.2f}x")
+    print(f"  Pass-through BaseHTTPMiddleware x2 vs none: "
+          f"{results['basehttp']['rps'] / results['none']['rps']:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP middleware stack")
+    parser.add_argument("--requests", type=int, default=5000,
+                        help="Requests per stack (default: 5000)")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Concurrent in-flight requests (default: 32)")
+    parser.add_argument("--path", type=str, default="/analyze",
+                        help="Endpoint to call (default: /analyze)")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Quantization drift check: dynamic INT8 vs fp32 predictions
+
+Loads the configured model in full precision, quantizes a copy with
+dynamic INT8, and compares labels and confidences on a fixed sample set.
+Exits with status 1 if label agreement falls below --min-agreement.
+
+Usage:
+    python benchmarks/quantization_drift.py
+    python benchmarks/quantization_drift.py --min-agreement 0.95
+"""
+
+import argparse
+import copy
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import torch  # noqa: E402
+from transformers import AutoTokenizer, DistilBertForSequenceClassification  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.quantization import (  # noqa: E402
+    DRIFT_SAMPLE_TEXTS,
+    check_quantization_drift,
+    predict_probabilities,
+    quantize_dynamic_int8
+)
+
+
+def time_inference(model, tokenizer, texts, repeats: int) -> float:
+    """Average milliseconds per forward pass over the sample set"""
+    device = torch.device("cpu")
+    predict_probabilities(model, tokenizer, texts, device)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict_probabilities(model, tokenizer, texts, device)
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dynamic INT8 and fp32 predictions")
+    parser.add_argument("--model", type=str, default=settings.MODEL_NAME,
+                        help=f"Model name or path (default: {settings.MODEL_NAME})")
+    parser.add_argument("--tokenizer", type=str, default=settings.TOKENIZER_NAME,
+                        help=f"Tokenizer name or path (default: {settings.TOKENIZER_NAME})")
+    parser.add_argument("--min-agreement", type=float, default=0.95,
+                        help="Minimum label agreement before failing (default: 0.95)")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="Timed forward passes per model (default: 5)")
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+    model = DistilBertForSequenceClassification.from_pretrained(args.model).eval()
+
+    report = check_quantization_drift(model, tokenizer, DRIFT_SAMPLE_TEXTS)
+
+    quantized = quantize_dynamic_int8(copy.deepcopy(model))
+    fp32_ms = time_inference(model, tokenizer, DRIFT_SAMPLE_TEXTS, args.repeats)
+    int8_ms = time_inference(quantized, tokenizer, DRIFT_SAMPLE_TEXTS, args.repeats)
+
+    print("=" * 60)
+    print(f"  Model: {args.model}")
+    print(f"  Samples: {report['samples']}")
+    print("=" * 60)
+    print(f"  Label agreement:       {report['label_agreement']:.2%}")
+    print(f"  Mean confidence drift: {report['mean_confidence_drift']:.4f}")
+    print(f"  Max confidence drift:  {report['max_confidence_drift']:.4f}")
+    print(f"  fp32 batch time:       {fp32_ms:.1f} ms")
+    print(f"  int8 batch time:       {int8_ms:.1f} ms ({fp32_ms / int8_ms:.2f}x)")
+
+    for item in report["disagreements"]:
+        print(f"  ! {item['text']!r}: fp32={item['fp32']} int8={item['int8']}")
+    print("=" * 60)
+
+    if report["label_agreement"] < args.min_agreement:
+        print(f"  FAIL: agreement below {args.min_agreement:.2%}")
+        sys.exit(1)
+    print("  OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Tokenizer benchmark: fast (Rust) vs slow (Python) DistilBERT tokenizer
+
+Measures per-text tokenization (one call per text, like the old request
+path) and per-batch tokenization (one call for the whole batch, like
+ModelManager.predict_batch) for both tokenizers.
+
+Usage:
+    python benchmarks/tokenizer_benchmark.py
+    python benchmarks/tokenizer_benchmark.py --batch-size 64 --repeats 20
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transformers import DistilBertTokenizer, DistilBertTokenizerFast  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+SAMPLE_TEXTS = [
+    "I love this movie! It's absolutely fantastic.",
+    "This is terrible.",
+    "It's okay, I guess.",
+    "The service was slow and the food arrived cold, but the staff apologised.",
+    "Best purchase I've made all year, would recommend to anyone looking for a reliable laptop.",
+    "Not worth the money.",
+    "The plot dragged in the middle, yet the final act made up for it with a genuinely surprising twist "
+    "and some of the best cinematography I have seen in years.",
+    "meh",
+]
+
+
+def build_texts(count: int) -> list:
+    """Repeat the sample texts up to the requested count"""
+    return [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(count)]
+
+
+def time_call(func, repeats: int) -> float:
+    """Median wall time of func() in milliseconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def benchmark(tokenizer, texts: list, repeats: int) -> dict:
+    """Time per-text and per-batch tokenization"""
+    kwargs = dict(truncation=True, max_length=settings.MAX_SEQUENCE_LENGTH)
+
+    # Warm up
+    tokenizer(texts, **kwargs)
+
+    per_text_total = time_call(lambda: [tokenizer(text, **kwargs) for text in texts], repeats)
+    per_batch = time_call(lambda: tokenizer(texts, **kwargs), repeats)
+
+    return {
+        "per_text_ms": per_text_total / len(texts),
+        "per_text_loop_ms": per_text_total,
+        "per_batch_ms": per_batch,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fast vs slow tokenizers")
+    parser.add_argument("--tokenizer", type=str, default=settings.TOKENIZER_NAME,
+                        help=f"Tokenizer name or path (default: {settings.TOKENIZER_NAME})")
+    parser.add_argument("--batch-size", type=int, default=50,
+                        help="Texts per batch (default: 50)")
+    parser.add_argument("--repeats", type=int, default=10,
+                        help="Timed repetitions, median is reported (default: 10)")
+    args = parser.parse_args()
+
+    texts = build_texts(args.batch_size)
+    tokenizers = {
+        "slow": DistilBertTokenizer.from_pretrained(args.tokenizer),
+        "fast": DistilBertTokenizerFast.from_pretrained(args.tokenizer),
+    }
+
+    print("=" * 60)
+    print(f"  Tokenizer: {args.tokenizer}")
+    print(f"  Batch size: {args.batch_size}, repeats: {args.repeats}")
+    print("=" * 60)
+    print(f"  {'tokenizer':<10}{'per text (ms)':>16}{'text loop (ms)':>16}{'one batch (ms)':>16}")
+
+    results = {}
+    for name, tokenizer in tokenizers.items():
+        results[name] = benchmark(tokenizer, texts, args.repeats)
+        r = results[name]
+        print(f"  {name:<10}{r['per_text_ms']:>16.3f}{r['per_text_loop_ms']:>16.3f}{r['per_batch_ms']:>16.3f}")
+
+    print("=" * 60)
+    print(f"  Fast speedup per text:  {results['slow']['per_text_ms'] / results['fast']['per_text_ms']:.1f}x")
+    print(f"  Fast speedup per batch: {results['slow']['per_batch_ms'] / results['fast']['per_batch_ms']:.1f}x")
+    print(f"  Fast batch vs slow text loop: "
+          f"{results['slow']['per_text_loop_ms'] / results['fast']['per_batch_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
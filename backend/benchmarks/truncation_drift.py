@@ -0,0 +1,118 @@
+"""
+Truncation drift check: truncation strategies and the fast tier vs the
+full token limit
+
+Runs the configured model on a set of texts under each truncation
+strategy (head, head_tail) in the standard and fast tiers, and compares
+labels with head truncation at MAX_SEQUENCE_LENGTH, the longest input the
+model sees. Reports label agreement, how many texts were truncated and
+the time per text. Exits with status 1 if the fast tier with the
+configured TRUNCATION_STRATEGY agrees less than --min-agreement.
+
+The built-in texts are long synthetic reviews with the verdict at both
+ends; pass --texts-file with real traffic for numbers worth acting on.
+
+Usage:
+    python benchmarks/truncation_drift.py
+    python benchmarks/truncation_drift.py --texts-file reviews.txt --min-agreement 0.9
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Every configuration must run the model, not read another's cached result
+os.environ.setdefault("CACHE_ENABLED", "false")
+os.environ.setdefault("DISK_CACHE_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.core.config import settings  # noqa: E402
+from app.core.model_manager import TRUNCATION_STRATEGIES, TRUNCATION_TIERS, ModelManager  # noqa: E402
+from app.core.quantization import DRIFT_SAMPLE_TEXTS  # noqa: E402
+
+# Neutral sentences that push a review's verdict apart from its middle
+FILLER = (
+    "We arrived on a Tuesday and parked behind the building. "
+    "The room faced the street and the window opened onto a small balcony. "
+    "Breakfast was served between seven and ten in the hall downstairs. "
+)
+
+
+def long_review_texts() -> list:
+    """Long texts whose opening and closing sentences carry the sentiment"""
+    texts = []
+    for index, opening in enumerate(DRIFT_SAMPLE_TEXTS):
+        closing = DRIFT_SAMPLE_TEXTS[(index * 5) % len(DRIFT_SAMPLE_TEXTS)]
+        for repeats in (2, 8, 20):
+            texts.append(f"{opening} {FILLER * repeats}{closing}")
+    return texts
+
+
+def run(manager: ModelManager, texts: list, tier: str) -> tuple:
+    """Labels, truncated text count and milliseconds per text for one configuration"""
+    before = manager.get_truncation_stats()["tiers"][tier]["truncated"]
+    started = time.perf_counter()
+    predictions = manager.predict_batch(texts, tier)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    truncated = manager.get_truncation_stats()["tiers"][tier]["truncated"] - before
+    return [label for label, _ in predictions], truncated, elapsed_ms / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare truncation strategies and the fast tier")
+    parser.add_argument("--texts-file", type=str, default=None,
+                        help="Texts to compare, one per line (default: built-in long reviews)")
+    parser.add_argument("--min-agreement", type=float, default=0.9,
+                        help="Minimum fast tier label agreement before failing (default: 0.9)")
+    args = parser.parse_args()
+
+    texts = long_review_texts()
+    if args.texts_file:
+        with open(args.texts_file, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+        if not texts:
+            raise SystemExit(f"{args.texts_file} contains no texts")
+
+    configured = settings.TRUNCATION_STRATEGY
+    manager = ModelManager()
+    manager.load_model()
+
+    settings.TRUNCATION_STRATEGY = "head"
+    reference, _, _ = run(manager, texts, "standard")
+    # Timings of the first pass include one-off costs; measure again
+    reference, _, _ = run(manager, texts, "standard")
+
+    print("=" * 72)
+    print(f"  Model: {settings.MODEL_NAME}")
+    print(f"  Texts: {len(texts)}, reference: head truncation at {settings.MAX_SEQUENCE_LENGTH} tokens")
+    print("=" * 72)
+    print(f"  {'strategy':<10}{'tier':<10}{'tokens':>8}{'truncated':>11}{'agreement':>11}{'ms/text':>10}")
+
+    results = {}
+    for strategy in TRUNCATION_STRATEGIES:
+        settings.TRUNCATION_STRATEGY = strategy
+        for tier in TRUNCATION_TIERS:
+            labels, truncated, ms_per_text = run(manager, texts, tier)
+            agreement = sum(a == b for a, b in zip(labels, reference)) / len(texts)
+            results[(strategy, tier)] = agreement
+            max_length = manager.get_truncation_stats()["tiers"][tier]["max_length"]
+            print(
+                f"  {strategy:<10}{tier:<10}{max_length:>8}{truncated / len(texts):>11.1%}"
+                f"{agreement:>11.2%}{ms_per_text:>10.2f}"
+            )
+    settings.TRUNCATION_STRATEGY = configured
+    print("=" * 72)
+
+    agreement = results[(configured, "fast")]
+    if agreement < args.min_agreement:
+        print(f"  FAIL: fast tier ({configured}) agreement {agreement:.2%} below {args.min_agreement:.2%}")
+        sys.exit(1)
+    print(f"  OK: fast tier ({configured}) agreement {agreement:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Export the configured model for fast startup and alternate backends
+
+Loads MODEL_NAME once, exports it, and caches the artifact under
+ARTIFACT_DIR:
+
+- snapshot: local safetensors copy of model and tokenizer, loaded at
+  startup with no network lookups (USE_MODEL_SNAPSHOT)
+- torchscript / onnx: graphs for the BACKEND setting
+
+Usage:
+    python export_model.py                        # Export everything
+    python export_model.py --backend snapshot     # Local snapshot only
+    python export_model.py --backend onnx         # Export ONNX only
+    python export_model.py --backend torchscript --force
+"""
+
+import argparse
+import shutil
+import time
+from transformers import DistilBertForSequenceClassification
+from app.core.config import settings
+from app.core.artifacts import artifact_path
+from app.core.backends import export_onnx, export_snapshot, export_torchscript
+
+
+EXPORTERS = {
+    "torchscript": export_torchscript,
+    "onnx": export_onnx,
+}
+
+ARTIFACTS = ["snapshot"] + list(EXPORTERS)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export the sentiment model for alternate inference backends"
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default="all",
+        choices=["all"] + ARTIFACTS,
+        help="Backend artifact to export (default: all)"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=settings.MODEL_NAME,
+        help=f"Model name or path (default: {settings.MODEL_NAME})"
+    )
+    parser.add_argument(
+        "--tokenizer",
+        type=str,
+        default=settings.TOKENIZER_NAME,
+        help=f"Tokenizer name or path for the snapshot (default: {settings.TOKENIZER_NAME})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Overwrite existing artifacts"
+    )
+    
+    args = parser.parse_args()
+    backends = ARTIFACTS if args.backend == "all" else [args.backend]
+    
+    print("=" * 60)
+    print(f"  Exporting: {args.model}")
+    print("=" * 60)
+    
+    model = None
+    for backend in backends:
+        path = artifact_path(backend, args.model)
+        if path.exists() and not args.force:
+            print(f"  {backend}: exists at {path} (use --force to overwrite)")
+            continue
+        
+        start = time.perf_counter()
+        
+        if backend == "snapshot":
+            if path.exists():
+                shutil.rmtree(path)
+            export_snapshot(args.model, args.tokenizer, path)
+            print(f"  {backend}: wrote {path} in {time.perf_counter() - start:.1f}s")
+            continue
+        
+        if model is None:
+            # torchscript=True makes the model return tuples, which tracing needs
+            model = DistilBertForSequenceClassification.from_pretrained(
+                args.model, torchscript=True
+            ).eval()
+        
+        EXPORTERS[backend](model, path)
+        print(f"  {backend}: wrote {path} in {time.perf_counter() - start:.1f}s")
+    
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,28 @@ Usage:
     python main.py
 """
 
+import sys
 import uvicorn
 from app import app
 from app.core.config import settings
 
 
 if __name__ == "__main__":
+    if settings.WORKERS > 1:
+        from app.core.prefork import PreforkServer
+        
+        sys.exit(PreforkServer(
+            app,
+            host=settings.HOST,
+            port=settings.PORT,
+            workers=settings.WORKERS,
+            torch_threads=settings.INFERENCE_TORCH_THREADS,
+            log_level=settings.LOG_LEVEL,
+            preload=settings.PRELOAD_MODEL,
+            graceful_timeout=settings.WORKER_GRACEFUL_TIMEOUT,
+            memory_report_seconds=settings.WORKER_MEMORY_REPORT_SECONDS
+        ).run())
+    
     uvicorn.run(
         "app:app",
         host=settings.HOST,
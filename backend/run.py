@@ -8,11 +8,17 @@ Usage:
     python run.py --host 127.0.0.1   # Run on localhost only
     python run.py --port 8080        # Run on custom port
     python run.py --no-reload        # Disable auto-reload
+    python run.py --workers 4        # Pre-fork 4 workers sharing one copy of the model
+    python run.py --threads 2        # Run torch with 2 intra-op threads per inference thread
 """
 
 import argparse
+import os
+import sys
 import uvicorn
 from app.core.config import settings
+from app.core.cpu import intra_op_threads
+from app.core.executor import inference_executor
 
 
 def main():
@@ -36,6 +42,18 @@ def main():
         action="store_true",
         help="Disable auto-reload on code changes"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.WORKERS,
+        help=f"Worker processes; more than 1 pre-forks workers that share the model (default: {settings.WORKERS})"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=settings.INFERENCE_TORCH_THREADS,
+        help="Torch intra-op threads per worker (default: CPUs divided by workers)"
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -45,6 +63,14 @@ def main():
     )
     
     args = parser.parse_args()
+    if args.threads < 0:
+        parser.error("--threads must be 0 (split the CPUs) or more")
+    
+    # Importing settings already created the executor; set its threads as a
+    # pre-fork worker does, and export them for the process auto-reload starts
+    settings.INFERENCE_TORCH_THREADS = args.threads
+    os.environ["INFERENCE_TORCH_THREADS"] = str(args.threads)
+    inference_executor.torch_threads = intra_op_threads()
     
     print("=" * 60)
     print(f"  {settings.APP_NAME}")
@@ -53,9 +79,29 @@ def main():
     print(f"  Server: http://{args.host}:{args.port}")
     print(f"  Docs: http://{args.host}:{args.port}/docs")
     print(f"  ReDoc: http://{args.host}:{args.port}/redoc")
+    if args.workers > 1:
+        print(f"  Workers: {args.workers} (pre-fork, shared model weights)")
     print("=" * 60)
     print()
     
+    if args.workers > 1:
+        # Auto-reload watches one process; workers are replaced with SIGHUP instead
+        from app import app
+        from app.core.prefork import PreforkServer
+        
+        server = PreforkServer(
+            app,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            torch_threads=args.threads,
+            log_level=args.log_level,
+            preload=settings.PRELOAD_MODEL,
+            graceful_timeout=settings.WORKER_GRACEFUL_TIMEOUT,
+            memory_report_seconds=settings.WORKER_MEMORY_REPORT_SECONDS
+        )
+        sys.exit(server.run())
+    
     uvicorn.run(
         "app:app",
         host=args.host,
@@ -0,0 +1,390 @@
+"""
+Offline bulk scoring for large text files
+
+Scores a CSV, JSONL, plain text (one text per line) or Parquet file
+directly with ModelManager, without the HTTP stack. Input is read in
+chunks, scored on a pool of worker processes (one model per worker, torch
+threads and CPU affinity pinned per worker) and written in input order as
+it completes. A checkpoint next to the output records progress, so an
+interrupted run continues where it stopped with --resume.
+
+Usage:
+    python score.py reviews.csv scores.jsonl --text-field review --id-field review_id
+    python score.py reviews.jsonl scores.csv --workers 4 --threads 2
+    python score.py reviews.txt scores.jsonl --resume
+    python score.py reviews.jsonl scores.jsonl --tier fast
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+from pathlib import Path
+
+# Offline scoring sees each text once: skip the prediction cache and the
+# latency warmup in workers unless explicitly configured
+os.environ.setdefault("CACHE_ENABLED", "false")
+os.environ.setdefault("DISK_CACHE_ENABLED", "false")
+os.environ.setdefault("WARMUP_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+# Workers parallelize within each batch, not across operators
+os.environ.setdefault("INFERENCE_INTEROP_THREADS", "1")
+
+from app.core.config import settings  # noqa: E402
+from app.core.cpu import available_cpus  # noqa: E402
+
+
+FORMATS = ("csv", "jsonl", "txt", "parquet")
+
+
+def detect_format(path: str) -> str:
+    """Infer the file format from its extension"""
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix in ("ndjson", "json"):
+        return "jsonl"
+    if suffix in ("text", "tsv"):
+        return "txt" if suffix == "text" else "csv"
+    return suffix if suffix in FORMATS else "txt"
+
+
+def read_records(path: str, fmt: str, text_field: str, id_field: str = None):
+    """
+    Stream (record id, text) pairs from an input file
+
+    Records whose text cannot be read yield None as text so they keep
+    their offset and are reported as errors.
+    """
+    if fmt == "csv":
+        delimiter = "\t" if path.endswith(".tsv") else ","
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f, delimiter=delimiter):
+                yield (row.get(id_field) if id_field else None), row.get(text_field)
+
+    elif fmt == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    value = json.loads(line)
+                except ValueError:
+                    yield None, None
+                    continue
+                if isinstance(value, dict):
+                    yield (value.get(id_field) if id_field else None), value.get(text_field)
+                else:
+                    yield None, value
+
+    elif fmt == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet input requires the pyarrow package")
+
+        columns = [text_field] + ([id_field] if id_field else [])
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=4096, columns=columns):
+            texts = batch.column(text_field).to_pylist()
+            ids = batch.column(id_field).to_pylist() if id_field else [None] * len(texts)
+            yield from zip(ids, texts)
+
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                yield None, line.rstrip("\n")
+
+
+def read_chunks(records, chunk_size: int, start_offset: int):
+    """Group records into lists of (offset, id, text), skipping done ones"""
+    records = islice(records, start_offset, None)
+    offset = start_offset
+    while True:
+        chunk = [(offset + i, record_id, text) for i, (record_id, text) in enumerate(islice(records, chunk_size))]
+        if not chunk:
+            return
+        offset += len(chunk)
+        yield chunk
+
+
+# --- Worker process -------------------------------------------------------
+
+_tier = "standard"
+# Why this worker failed to start, reported by its first task
+_init_error = None
+
+
+def _init_worker(started, workers: int, threads: int, pin: bool, tier: str) -> None:
+    """
+    Load one model per worker and pin its torch threads and CPUs
+
+    Errors are kept for _worker_ready to raise in the parent: raising here
+    would make the pool replace the worker, which fails the same way, forever.
+    """
+    import logging
+    import signal
+    from app.core.cpu import configure_torch_threads, pin_current_thread
+
+    global _tier, _init_error
+    _tier = tier
+
+    # Ctrl+C reaches the whole process group; let the parent stop the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    logging.basicConfig(level=logging.WARNING)
+    # A replacement for a crashed worker takes over its CPU block
+    with started.get_lock():
+        worker_id = started.value % workers
+        started.value += 1
+
+    try:
+        if pin:
+            assigned = available_cpus()[worker_id * threads:(worker_id + 1) * threads]
+            if len(assigned) == threads:
+                pin_current_thread(assigned)
+        configure_torch_threads(threads)
+
+        from app.core.model_manager import model_manager
+        model_manager.load_model()
+    except Exception as e:
+        _init_error = f"Worker {worker_id} failed to start: {str(e)}"
+
+
+def _worker_ready(_) -> int:
+    """No-op task used to wait until every worker has loaded its model"""
+    if _init_error is not None:
+        raise RuntimeError(_init_error)
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _score_chunk(chunk):
+    """Score one chunk and return its result records and real token count"""
+    if _init_error is not None:
+        raise RuntimeError(_init_error)
+    from app.core.model_manager import model_manager
+    from app.utils.helpers import preprocess_text
+
+    results = []
+    pending = []
+    for offset, record_id, text in chunk:
+        record = {"offset": offset, "id": record_id}
+        processed = preprocess_text(text) if isinstance(text, str) else ""
+        if processed:
+            pending.append((record, processed))
+        else:
+            record["error"] = "Missing or empty text"
+        results.append(record)
+
+    tokens_before = model_manager.get_token_counts()["real_tokens"]
+    if pending:
+        try:
+            predictions = model_manager.predict_batch([text for _, text in pending], _tier)
+            for (record, _), (sentiment, confidence) in zip(pending, predictions):
+                record["sentiment"] = sentiment
+                record["confidence"] = round(confidence, 4)
+        except Exception as e:
+            for record, _ in pending:
+                record["error"] = f"Error analyzing sentiment: {str(e)}"
+    tokens = model_manager.get_token_counts()["real_tokens"] - tokens_before
+
+    return results, tokens
+
+
+# --- Output and checkpoints -----------------------------------------------
+
+OUTPUT_FIELDS = ["offset", "id", "sentiment", "confidence", "error"]
+
+
+class ResultWriter:
+    """Append results as JSONL or CSV and checkpoint progress atomically"""
+
+    def __init__(self, path: str, checkpoint_path: str, input_path: str, resume_bytes: int = None):
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        self.input_path = input_path
+        self.csv = Path(path).suffix.lower() == ".csv"
+
+        if resume_bytes is not None and os.path.exists(path):
+            # Drop anything written after the last checkpoint
+            with open(path, "r+b") as f:
+                f.truncate(resume_bytes)
+            self.file = open(path, "a", newline="", encoding="utf-8")
+        else:
+            self.file = open(path, "w", newline="", encoding="utf-8")
+
+        if self.csv:
+            self.writer = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS)
+            if self.file.tell() == 0:
+                self.writer.writeheader()
+
+    def write(self, results) -> None:
+        for record in results:
+            if self.csv:
+                self.writer.writerow(record)
+            else:
+                self.file.write(json.dumps({k: v for k, v in record.items() if v is not None}) + "\n")
+
+    def checkpoint(self, next_offset: int) -> None:
+        """Flush output and record the first offset not yet written"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        state = {"input": self.input_path, "offset": next_offset, "output_bytes": self.file.tell()}
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def load_checkpoint(path: str, input_path: str) -> dict:
+    """Read a checkpoint, refusing one written for a different input"""
+    with open(path) as f:
+        state = json.load(f)
+    if state.get("input") != input_path:
+        raise SystemExit(f"Checkpoint {path} belongs to {state.get('input')}, not {input_path}")
+    return state
+
+
+# --- Main -----------------------------------------------------------------
+
+def main():
+    cpu_count = len(available_cpus())
+    default_workers = max(1, cpu_count // 4)
+
+    parser = argparse.ArgumentParser(
+        description="Score a large text file with the sentiment model, without the HTTP API"
+    )
+    parser.add_argument("input", type=str, help="Input file (.csv, .tsv, .jsonl, .txt or .parquet)")
+    parser.add_argument("output", type=str, help="Output file (.jsonl or .csv)")
+    parser.add_argument("--format", type=str, choices=FORMATS, default=None,
+                        help="Input format (default: from the file extension)")
+    parser.add_argument("--text-field", type=str, default="text",
+                        help="Column or JSON field holding the text (default: text)")
+    parser.add_argument("--id-field", type=str, default=None,
+                        help="Column or JSON field copied to the output as id")
+    parser.add_argument("--workers", type=int, default=default_workers,
+                        help=f"Worker processes, one model each (default: {default_workers})")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Torch threads per worker (default: CPUs divided by workers)")
+    parser.add_argument("--no-pin", action="store_true",
+                        help="Do not pin each worker to its own CPUs")
+    parser.add_argument("--tier", type=str, choices=("standard", "fast"), default="standard",
+                        help="Truncation tier; fast caps texts at FAST_MAX_SEQUENCE_LENGTH tokens "
+                             "(default: standard)")
+    parser.add_argument("--chunk-size", type=int, default=256,
+                        help="Texts sent to a worker at a time (default: 256)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the checkpoint next to the output file")
+    parser.add_argument("--start-offset", type=int, default=None,
+                        help="Skip this many input records (overrides the checkpoint)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Replace an existing output file")
+    args = parser.parse_args()
+
+    workers = max(1, args.workers)
+    threads = args.threads or max(1, cpu_count // workers)
+    # Read by the workers' settings, so a warmup runs with the same threads
+    os.environ["INFERENCE_TORCH_THREADS"] = str(threads)
+    fmt = args.format or detect_format(args.input)
+    input_path = str(Path(args.input).resolve())
+    checkpoint_path = args.output + ".checkpoint"
+
+    if args.resume and args.start_offset is not None:
+        raise SystemExit("--resume and --start-offset cannot be combined")
+
+    start_offset = args.start_offset or 0
+    resume_bytes = None
+    if args.resume and os.path.exists(checkpoint_path):
+        state = load_checkpoint(checkpoint_path, input_path)
+        start_offset = state["offset"]
+        resume_bytes = state["output_bytes"]
+    elif os.path.exists(args.output) and not args.overwrite:
+        raise SystemExit(f"{args.output} exists; pass --resume to continue or --overwrite to replace it")
+
+    print("=" * 60)
+    print(f"  Scoring: {args.input} ({fmt}) -> {args.output}")
+    print(f"  Model: {settings.MODEL_NAME} ({args.tier} tier, {settings.TRUNCATION_STRATEGY} truncation)")
+    print(f"  Workers: {workers} x {threads} threads, chunk size {args.chunk_size}")
+    if start_offset:
+        print(f"  Resuming at record {start_offset}")
+    print("=" * 60)
+
+    # spawn gives each worker a clean interpreter instead of a fork of
+    # this process's torch thread pools
+    context = multiprocessing.get_context("spawn")
+    started_workers = context.Value("i", 0)
+
+    records = read_records(args.input, fmt, args.text_field, args.id_field)
+    chunks = read_chunks(records, args.chunk_size, start_offset)
+
+    scored = tokens = errors = 0
+    next_offset = start_offset
+
+    initargs = (started_workers, workers, threads, not args.no_pin, args.tier)
+    with context.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        # Time only scoring: wait until every worker has loaded its model
+        load_started = time.perf_counter()
+        ready = set()
+        while len(ready) < workers:
+            try:
+                ready.update(pool.map(_worker_ready, range(workers), chunksize=1))
+            except RuntimeError as e:
+                raise SystemExit(str(e))
+        print(f"  Workers ready in {time.perf_counter() - load_started:.1f}s")
+        # Opened once workers are up, so a failed start leaves no output behind
+        writer = ResultWriter(args.output, checkpoint_path, input_path, resume_bytes)
+
+        started = time.perf_counter()
+        last_report = started
+        # Keep a bounded number of chunks in flight so memory stays flat
+        # however large the input is; results are written in input order
+        in_flight = deque()
+
+        def write_next() -> None:
+            nonlocal next_offset, scored, tokens, errors
+            results, chunk_tokens = in_flight.popleft().get()
+            writer.write(results)
+            next_offset = results[-1]["offset"] + 1
+            writer.checkpoint(next_offset)
+            scored += len(results)
+            tokens += chunk_tokens
+            errors += sum(1 for record in results if "error" in record)
+
+        try:
+            for chunk in chunks:
+                in_flight.append(pool.apply_async(_score_chunk, (chunk,)))
+                if len(in_flight) >= workers * 2:
+                    write_next()
+
+                now = time.perf_counter()
+                if now - last_report >= 10:
+                    last_report = now
+                    elapsed = now - started
+                    print(f"  {next_offset} records, {scored / elapsed:.1f} texts/s, {tokens / elapsed:.0f} tokens/s")
+
+            while in_flight:
+                write_next()
+        except KeyboardInterrupt:
+            print(f"\n  Interrupted; resume with --resume (checkpoint at record {next_offset})")
+            pool.terminate()
+            writer.close()
+            sys.exit(130)
+
+    writer.close()
+    elapsed = time.perf_counter() - started
+
+    print("=" * 60)
+    print(f"  Scored {scored} texts ({errors} errors) in {elapsed:.1f}s")
+    print(f"  Throughput: {scored / elapsed:.1f} texts/s, {tokens / elapsed:.0f} tokens/s")
+    print(f"  Checkpoint: {checkpoint_path} (next record {next_offset})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the app package the way run.py and the benchmarks do
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
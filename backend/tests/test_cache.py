@@ -0,0 +1,131 @@
+import threading
+import time
+
+from app.core.cache import DiskPredictionCache, PredictionCache
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = PredictionCache(max_entries=2)
+    cache.put("a", ("POSITIVE", 0.9))
+    cache.put("b", ("NEGATIVE", 0.8))
+    assert cache.get("a") == ("POSITIVE", 0.9)
+
+    cache.put("c", ("POSITIVE", 0.7))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ("POSITIVE", 0.9)
+    assert cache.get("c") == ("POSITIVE", 0.7)
+    assert cache.evictions == 1
+
+
+def test_byte_budget_evicts_oldest_entries():
+    cache = PredictionCache(max_entries=0, max_bytes=1)
+    cache.put("a", ("POSITIVE", 0.9))
+    cache.put("b", ("NEGATIVE", 0.8))
+
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_expire_after_ttl():
+    cache = PredictionCache(ttl_seconds=0.05)
+    cache.put("a", ("POSITIVE", 0.9))
+    assert cache.get("a") == ("POSITIVE", 0.9)
+
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_get_or_compute_many_only_computes_misses():
+    cache = PredictionCache()
+    cache.put("a", ("POSITIVE", 0.9))
+    computed = []
+
+    def compute(texts):
+        computed.append(list(texts))
+        return [("NEGATIVE", 0.6) for _ in texts]
+
+    results = cache.get_or_compute_many(["a", "b", "b"], ["text a", "text b", "text b"], compute)
+
+    assert results == [("POSITIVE", 0.9), ("NEGATIVE", 0.6), ("NEGATIVE", 0.6)]
+    assert computed == [["text b"]]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = PredictionCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute(texts):
+        calls.append(texts)
+        started.set()
+        release.wait(5)
+        return [("POSITIVE", 0.9) for _ in texts]
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_compute_many(["k"], ["t"], compute)))
+    first.start()
+    assert started.wait(5)
+
+    second = threading.Thread(target=lambda: results.append(cache.get_or_compute_many(["k"], ["t"], compute)))
+    second.start()
+    while cache.coalesced == 0:
+        time.sleep(0.01)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert len(calls) == 1
+    assert results == [[("POSITIVE", 0.9)], [("POSITIVE", 0.9)]]
+
+
+def test_failed_compute_is_raised_to_coalesced_waiters():
+    cache = PredictionCache()
+
+    def compute(texts):
+        raise RuntimeError("boom")
+
+    for _ in range(2):
+        try:
+            cache.get_or_compute_many(["k"], ["t"], compute)
+        except RuntimeError as e:
+            assert str(e) == "boom"
+        else:
+            raise AssertionError("expected the compute error")
+    assert cache.stats()["entries"] == 0
+
+
+def test_counters_are_kept_per_model():
+    cache = PredictionCache(max_entries=1)
+    cache.get_or_compute_many(["a"], ["t"], lambda texts: [("POSITIVE", 0.9)], "small")
+    cache.get_or_compute_many(["a", "b"], ["t", "u"], lambda texts: [("NEGATIVE", 0.1)], "large")
+
+    counters = cache.model_counters()
+    assert counters["small"]["misses"] == 1
+    assert counters["small"]["evictions"] == 1
+    assert counters["small"]["entries"] == 0
+    assert (counters["large"]["hits"], counters["large"]["misses"], counters["large"]["entries"]) == (1, 1, 1)
+
+
+def test_disk_tier_counts_concurrent_lookups(tmp_path):
+    disk = DiskPredictionCache(str(tmp_path), size_limit_bytes=1 << 20, model_name="model")
+    disk.set_many({"hit": ("POSITIVE", 0.9)})
+
+    def lookup():
+        for _ in range(200):
+            disk.get_many(["hit", "miss"])
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = disk.stats()
+    disk.close()
+    assert (stats["hits"], stats["misses"]) == (1600, 1600)
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.executor import InferenceExecutor, QueueFullError
+
+
+async def _run_blocked(executor, calls):
+    """
+    Occupy the only worker, queue ``calls`` of (priority, tag), then free
+    the worker and return the tags in the order they ran
+    """
+    release = threading.Event()
+    order = []
+    blocker = asyncio.create_task(executor.run(release.wait, 5))
+    await asyncio.sleep(0.05)
+
+    tasks = []
+    for priority, tag in calls:
+        tasks.append(asyncio.create_task(executor.run(order.append, tag, priority=priority)))
+        await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(blocker, *tasks)
+    return order
+
+
+def _executor(**kwargs):
+    executor = InferenceExecutor(max_workers=1, **kwargs)
+    executor.start()
+    return executor
+
+
+def test_classes_share_workers_by_weight():
+    executor = _executor(weights={"interactive": 3, "batch": 1, "background": 1})
+    try:
+        calls = [("interactive", "i")] * 12 + [("batch", "b")] * 12
+        order = asyncio.run(_run_blocked(executor, calls))
+    finally:
+        executor.shutdown()
+
+    first = order[:8]
+    assert first.count("i") == 6 and first.count("b") == 2
+    # Batch work is not starved behind the interactive backlog
+    assert "b" in order[:2]
+
+
+def test_calls_within_a_class_run_in_arrival_order():
+    executor = _executor()
+    try:
+        order = asyncio.run(_run_blocked(executor, [("batch", n) for n in range(5)]))
+    finally:
+        executor.shutdown()
+
+    assert order == list(range(5))
+
+
+def test_full_queue_is_rejected():
+    executor = _executor(max_pending=2)
+
+    async def scenario():
+        release = threading.Event()
+        running = [asyncio.create_task(executor.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(QueueFullError):
+            await executor.run(lambda: None)
+        release.set()
+        await asyncio.gather(*running)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+
+def test_cancelled_waiter_does_not_leak_its_worker():
+    executor = _executor()
+
+    async def scenario():
+        # Hold the only worker at the scheduler level
+        await executor._acquire("interactive")
+        waiter = asyncio.create_task(executor.run(lambda: None))
+        await asyncio.sleep(0.05)
+
+        # The worker frees up, popping the cancelled waiter, before the
+        # waiter's task gets to handle its cancellation
+        waiter.cancel()
+        executor._release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert await asyncio.wait_for(executor.run(lambda: "ran"), 5) == "ran"
+        assert executor.pending() == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+
+def test_waiter_cancelled_after_being_granted_passes_the_worker_on():
+    executor = _executor()
+
+    async def scenario():
+        await executor._acquire("interactive")
+        granted = asyncio.create_task(executor.run(lambda: None))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(executor.run(lambda: "ran"))
+        await asyncio.sleep(0.05)
+
+        # Granted the worker, then cancelled before its task resumes
+        executor._release()
+        granted.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await granted
+
+        assert await asyncio.wait_for(queued, 5) == "ran"
+        assert executor.pending() == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
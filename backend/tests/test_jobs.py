@@ -0,0 +1,107 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core import jobs
+from app.core.jobs import JobManager
+from app.core.streaming import StreamItem
+
+
+@pytest.fixture(autouse=True)
+def stub_model(monkeypatch):
+    @asynccontextmanager
+    async def use(name=None):
+        yield None
+
+    async def predict(model, texts, tier, priority):
+        await asyncio.sleep(0.01)
+        return [("POSITIVE", 0.9) for _ in texts]
+
+    monkeypatch.setattr(jobs.model_registry, "use", use)
+    monkeypatch.setattr(jobs.model_registry, "predict", predict)
+
+
+async def _submit(manager, count):
+    job_id = await manager.create_job()
+    await manager.add_items(job_id, 0, [StreamItem(line, None, f"text {line}", None) for line in range(count)])
+    await manager.submit(job_id)
+    return job_id
+
+
+async def _wait_for(manager, job_id, status, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while (await manager.get(job_id))["status"] != status:
+        assert asyncio.get_running_loop().time() < deadline, await manager.get(job_id)
+        await asyncio.sleep(0.02)
+    return await manager.get(job_id)
+
+
+def test_job_of_a_stopped_process_finishes_in_another(tmp_path):
+    # A pre-fork reload stops each old worker while the replacements run
+    async def scenario():
+        old = JobManager(str(tmp_path / "jobs.db"), chunk_size=2, yield_ms=0, lease_seconds=3)
+        new = JobManager(str(tmp_path / "jobs.db"), chunk_size=2, yield_ms=0, lease_seconds=3)
+        await old.start()
+        await new.start()
+        try:
+            job_id = await _submit(old, 200)
+            await _wait_for(old, job_id, "running")
+            await old.stop()
+            assert 0 < (await new.get(job_id))["processed"] < 200
+
+            job = await _wait_for(new, job_id, "completed")
+            assert (job["processed"], job["failed"]) == (200, 0)
+        finally:
+            await old.stop()
+            await new.stop()
+
+    asyncio.run(scenario())
+
+
+def test_job_of_a_crashed_process_waits_for_its_lease(tmp_path):
+    async def scenario():
+        crashed = JobManager(str(tmp_path / "jobs.db"), chunk_size=2, yield_ms=0, lease_seconds=1)
+        await crashed.start()
+        job_id = await _submit(crashed, 100)
+        await _wait_for(crashed, job_id, "running")
+        # Die without releasing the lease
+        for task in crashed._workers + [crashed._lease_task]:
+            task.cancel()
+        await asyncio.gather(*crashed._workers, crashed._lease_task, return_exceptions=True)
+
+        survivor = JobManager(str(tmp_path / "jobs.db"), chunk_size=2, yield_ms=0, lease_seconds=1)
+        await survivor.start()
+        try:
+            assert survivor.queue_depth() == 0
+            job = await _wait_for(survivor, job_id, "completed")
+            assert job["processed"] == 100
+        finally:
+            await survivor.stop()
+            crashed.store.close()
+
+    asyncio.run(scenario())
+
+
+def test_partial_upload_of_a_live_process_is_kept(tmp_path):
+    async def scenario():
+        uploader = JobManager(str(tmp_path / "jobs.db"), lease_seconds=30)
+        other = JobManager(str(tmp_path / "jobs.db"), lease_seconds=30)
+        await uploader.start()
+        try:
+            job_id = await uploader.create_job()
+            await other.start()
+            assert (await other.get(job_id))["status"] == "receiving"
+        finally:
+            await uploader.stop()
+            await other.stop()
+
+        # Nobody renews it after both stopped, so the next start drops it
+        restarted = JobManager(str(tmp_path / "jobs.db"))
+        await restarted.start()
+        try:
+            assert await restarted.get(job_id) is None
+        finally:
+            await restarted.stop()
+
+    asyncio.run(scenario())
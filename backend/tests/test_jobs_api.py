@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import endpoints
+
+
+class StubJobManager:
+    """Records what create_job stores instead of writing to SQLite"""
+
+    def __init__(self):
+        self.items = []
+
+    def is_running(self):
+        return True
+
+    async def create_job(self, model, tier):
+        return "job"
+
+    async def add_items(self, job_id, start, items):
+        self.items.extend(items)
+
+    async def discard(self, job_id):
+        pass
+
+    async def submit(self, job_id):
+        pass
+
+    async def get(self, job_id):
+        invalid = sum(1 for item in self.items if item.text is None)
+        return {
+            "id": job_id, "status": "queued", "total": len(self.items), "processed": 0,
+            "failed": invalid, "created_at": time.time()
+        }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    jobs = StubJobManager()
+    monkeypatch.setattr(endpoints, "job_manager", jobs)
+    app = FastAPI()
+    app.include_router(endpoints.router)
+    with TestClient(app) as client:
+        client.jobs = jobs
+        yield client
+
+
+def test_json_job_texts_are_validated_off_the_event_loop(client, monkeypatch):
+    threads = set()
+    parse_value = endpoints.parse_value
+
+    def recording_parse_value(value, line):
+        threads.add(threading.get_ident())
+        return parse_value(value, line)
+
+    monkeypatch.setattr(endpoints, "parse_value", recording_parse_value)
+    loop_thread = client.portal.call(threading.get_ident)
+
+    response = client.post("/jobs", json={"texts": ["good", 5, "bad"]})
+
+    assert response.status_code == 202
+    assert (response.json()["total"], response.json()["failed"]) == (3, 1)
+    assert [item.text for item in client.jobs.items] == ["good", None, "bad"]
+    assert threads and loop_thread not in threads
+
+
+def test_json_job_body_errors(client):
+    headers = {"Content-Type": "application/json"}
+
+    assert client.post("/jobs", content=b"{not json", headers=headers).status_code == 400
+    assert client.post("/jobs", json={"text": "good"}).status_code == 400
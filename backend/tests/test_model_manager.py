@@ -0,0 +1,53 @@
+import pytest
+
+from app.core.config import settings
+from app.core.model_manager import ModelManager
+
+
+@pytest.fixture
+def manager():
+    return ModelManager()
+
+
+def test_split_by_token_budget_keeps_padded_size_in_budget(manager, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_BATCH_TOKENS", 20)
+    input_ids = [[1] * length for length in (5, 5, 5, 5, 10, 2)]
+
+    ranges = manager._split_by_token_budget(input_ids)
+
+    assert ranges == [(0, 4), (4, 6)]
+    for start, end in ranges:
+        rows = input_ids[start:end]
+        assert len(rows) * max(map(len, rows)) <= 20
+
+
+def test_split_by_token_budget_gives_an_oversized_text_its_own_range(manager, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_BATCH_TOKENS", 8)
+    input_ids = [[1] * 2, [1] * 30, [1] * 2]
+
+    assert manager._split_by_token_budget(input_ids) == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_split_by_token_budget_single_range_when_it_fits(manager, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_BATCH_TOKENS", 8192)
+
+    assert manager._split_by_token_budget([[1] * 3] * 4) == [(0, 4)]
+
+
+def test_truncate_head_keeps_the_first_tokens(manager, monkeypatch):
+    monkeypatch.setattr(settings, "TRUNCATION_STRATEGY", "head")
+
+    assert manager._truncate(list(range(10)), 4) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("ratio, expected", [
+    (0.5, [0, 1, 8, 9]),
+    (0.25, [0, 7, 8, 9]),
+    (1.0, [0, 1, 2, 3]),
+    (0.0, [6, 7, 8, 9]),
+])
+def test_truncate_head_tail_keeps_both_ends(manager, monkeypatch, ratio, expected):
+    monkeypatch.setattr(settings, "TRUNCATION_STRATEGY", "head_tail")
+    monkeypatch.setattr(settings, "TRUNCATION_HEAD_RATIO", ratio)
+
+    assert manager._truncate(list(range(10)), 4) == expected
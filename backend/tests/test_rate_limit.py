@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from app.core.rate_limit import MemoryRateLimitStore, RateLimitStore
+
+
+WINDOW = 60.0
+# Epoch-aligned window start, so elapsed fractions are exact
+WINDOW_START = 6000.0
+
+
+def test_retry_after_when_previous_window_decays_in_time():
+    store = RateLimitStore(WINDOW)
+    # 10 * (1 - elapsed) + 2 + 1 <= 10 once elapsed reaches 0.3
+    assert store._retry_after(current=2, previous=10, elapsed=0.1, limit=10, cost=1) == pytest.approx(12.0)
+
+
+def test_retry_after_waits_for_the_next_window():
+    store = RateLimitStore(WINDOW)
+    # 30s to the next window, then 6s for 10 * (1 - elapsed) + 1 <= 10
+    assert store._retry_after(current=10, previous=0, elapsed=0.5, limit=10, cost=1) == pytest.approx(36.0)
+
+
+def test_retry_after_for_a_cost_over_the_limit_is_one_window():
+    store = RateLimitStore(WINDOW)
+    assert store._retry_after(current=0, previous=0, elapsed=0.5, limit=10, cost=11) == WINDOW
+
+
+@pytest.mark.parametrize("previous, current, offset, cost", [
+    (10, 2, 6.0, 1),
+    (0, 10, 30.0, 1),
+    (8, 5, 45.0, 4),
+    (4, 4, 0.0, 5),
+])
+def test_retrying_after_retry_after_is_allowed(previous, current, offset, cost):
+    async def scenario():
+        store = MemoryRateLimitStore(WINDOW)
+        limit = 10
+        for _ in range(previous):
+            assert (await store.hit("client", limit, now=WINDOW_START - WINDOW)).allowed
+        now = WINDOW_START + offset
+        for _ in range(current):
+            await store.hit("client", limit, now=now)
+
+        rejected = await store.hit("client", limit, cost=cost, now=now)
+        assert not rejected.allowed
+        assert rejected.retry_after > 0
+
+        early = await store.hit("client", limit, cost=cost, now=now + rejected.retry_after - 0.5)
+        assert not early.allowed
+        assert (await store.hit("client", limit, cost=cost, now=now + rejected.retry_after + 0.001)).allowed
+
+    asyncio.run(scenario())
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Stands in for uvicorn.run: import the app's executor and report its threads
+_PROBE = """
+import sys
+import uvicorn
+
+def fake_run(app, **kwargs):
+    from app.core.executor import inference_executor
+    print(inference_executor.torch_threads)
+
+uvicorn.run = fake_run
+sys.argv = ["run.py"] + sys.argv[1:]
+import run
+run.main()
+"""
+
+
+def test_threads_apply_to_a_single_process_server():
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, "--workers", "1", "--threads", "3", "--no-reload"],
+        cwd=BACKEND, capture_output=True, text=True, timeout=120
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "3"
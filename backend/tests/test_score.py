@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def test_run_fails_when_workers_cannot_load_the_model(tmp_path):
+    texts = tmp_path / "texts.txt"
+    texts.write_text("good\nbad\n")
+    missing = str(tmp_path / "missing-model")
+    env = dict(os.environ, MODEL_NAME=missing, TOKENIZER_NAME=missing, HF_HUB_OFFLINE="1", USE_MODEL_SNAPSHOT="false")
+
+    result = subprocess.run(
+        [sys.executable, "score.py", str(texts), str(tmp_path / "out.jsonl"), "--workers", "2", "--threads", "1"],
+        cwd=BACKEND, env=env, capture_output=True, text=True, timeout=300
+    )
+
+    assert result.returncode != 0
+    assert "failed to start" in result.stderr
+    assert not (tmp_path / "out.jsonl").exists()
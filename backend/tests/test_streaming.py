@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from app.core import streaming
+from app.core.executor import QueueFullError
+from app.core.streaming import read_batches, stream_predictions
+
+
+def _batches(chunks, batch_size=2, max_line_bytes=64, plain_text=False):
+    async def body():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [batch async for batch in read_batches(body(), plain_text, batch_size, max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+def test_lines_split_across_chunks_are_joined():
+    batches = _batches([b'"good mo', b'vie"\n"bad"\n'])
+
+    assert [[item.text for item in batch] for batch in batches] == [["good movie", "bad"]]
+    assert [item.line for item in batches[0]] == [1, 2]
+
+
+def test_batches_hold_at_most_batch_size_texts():
+    batches = _batches([b'"a"\n"b"\n"c"\n"d"\n"e"\n'])
+
+    assert [[item.text for item in batch] for batch in batches] == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_batch_is_emitted_when_a_chunk_is_used_up():
+    batches = _batches([b'"a"\n', b'"b"\n'], batch_size=10)
+
+    assert [[item.text for item in batch] for batch in batches] == [["a"], ["b"]]
+
+
+def test_invalid_and_blank_lines():
+    batches = _batches([b'{"text": "ok", "id": 7}\n\nnot json\n{"id": 1}\n'], batch_size=10)
+    items = [item for batch in batches for item in batch]
+
+    assert [(item.line, item.id, item.text) for item in items[:1]] == [(1, 7, "ok")]
+    assert [item.line for item in items] == [1, 3, 4]
+    assert items[1].error == "Line is not valid JSON"
+    assert items[2].error.startswith("Expected a JSON string")
+
+
+def test_oversized_lines_are_reported_without_buffering():
+    batches = _batches([b'"' + b"x" * 40, b"x" * 40 + b'"\n"short"\n'], batch_size=10, max_line_bytes=64)
+    items = [item for batch in batches for item in batch]
+
+    assert items[0].error == "Line exceeds 64 bytes"
+    assert (items[1].line, items[1].text) == (2, "short")
+
+
+def test_final_line_without_newline_and_plain_text():
+    batches = _batches([b"first\nsecond"], batch_size=10, plain_text=True)
+
+    assert [item.text for batch in batches for item in batch] == ["first", "second"]
+
+
+def test_batch_is_reported_failed_when_the_queue_stays_full(monkeypatch):
+    calls = []
+
+    async def queue_full(*args, **kwargs):
+        calls.append(args)
+        raise QueueFullError("Inference queue is full (64 pending calls)")
+
+    monkeypatch.setattr(streaming, "_QUEUE_FULL_MAX_WAIT", 0.2)
+    monkeypatch.setattr(streaming.model_registry, "predict", queue_full)
+
+    async def body():
+        yield b'"good"\n"bad"\n'
+
+    async def collect():
+        return [json.loads(line) async for chunk in stream_predictions(body(), model=object()) for line in chunk.splitlines()]
+
+    lines = asyncio.run(collect())
+
+    assert [line.get("error", "").startswith("Error analyzing sentiment") for line in lines[:2]] == [True, True]
+    assert lines[-1] == {"done": True, "processed": 0, "errors": 2}
+    assert 1 < len(calls) < 10
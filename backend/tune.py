@@ -0,0 +1,249 @@
+"""
+Find the CPU thread and batch size settings with the best throughput
+
+Sweeps torch intra-op threads per worker x batch sizes on this machine.
+For each thread count, the cores are split between as many workers as
+fit, each pinned to its own block of cores like the pre-fork server with
+CPU_AFFINITY=auto, and all workers run batches concurrently for a fixed
+time. Throughput counts texts across all workers; latency is per batch,
+which is what a request in a full micro-batch waits for. The recommended
+configuration has the highest throughput whose p99 latency meets the
+target.
+
+Usage:
+    python tune.py
+    python tune.py --target-p99-ms 50 --threads 1,2,4 --batch-sizes 1,8,16,32
+    python tune.py --texts-file reviews.txt --duration 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+# Measure inference, not the prediction cache; workers warm up per batch size
+os.environ.setdefault("CACHE_ENABLED", "false")
+os.environ.setdefault("DISK_CACHE_ENABLED", "false")
+os.environ.setdefault("WARMUP_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.core.config import settings  # noqa: E402
+from app.core.cpu import available_cpus, split_cpus  # noqa: E402
+
+
+SAMPLE_TEXTS = [
+    "I love this movie! It's absolutely fantastic.",
+    "This is terrible.",
+    "It's okay, I guess.",
+    "The service was slow and the food arrived cold, but the staff apologised.",
+    "Best purchase I've made all year, would recommend to anyone looking for a reliable laptop.",
+    "Not worth the money.",
+    "The plot dragged in the middle, yet the final act made up for it with a genuinely surprising twist "
+    "and some of the best cinematography I have seen in years.",
+    "meh",
+]
+
+# Untimed batches each worker runs before measuring a batch size
+WARMUP_BATCHES = 3
+
+
+def parse_int_list(value: str) -> list:
+    return sorted({int(item) for item in value.split(",") if item.strip()})
+
+
+def default_thread_counts(cores: int) -> list:
+    """Powers of two up to the core count, plus the core count itself"""
+    counts = []
+    threads = 1
+    while threads < cores:
+        counts.append(threads)
+        threads *= 2
+    return counts + [cores]
+
+
+def percentile(values: list, fraction: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[round(fraction * 100) - 1]
+
+
+# --- Worker process -------------------------------------------------------
+
+_barrier = None
+_texts = None
+
+
+def _init_worker(worker_ids, blocks, threads: int, barrier, texts) -> None:
+    """Pin the worker to its cores, set its threads and load the model if not inherited"""
+    import signal
+    from app.core.cpu import configure_torch_threads, pin_current_thread
+    from app.core.model_manager import model_manager
+
+    global _barrier, _texts
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _barrier = barrier
+    _texts = texts
+
+    worker_id = worker_ids.get()
+    if blocks:
+        pin_current_thread(blocks[worker_id])
+    configure_torch_threads(threads)
+    model_manager.load_model()
+
+
+def _worker_ready(_) -> int:
+    """No-op task used to wait until every worker is initialized"""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _run(args):
+    """Warm up, wait for the other workers, then run batches for ``duration`` seconds"""
+    from app.core.model_manager import model_manager
+
+    batch_size, duration = args
+    offset = 0
+
+    def next_batch():
+        nonlocal offset
+        batch = [_texts[(offset + i) % len(_texts)] for i in range(batch_size)]
+        offset += batch_size
+        return batch
+
+    for _ in range(WARMUP_BATCHES):
+        model_manager.predict_batch(next_batch())
+    _barrier.wait()
+
+    latencies = []
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        step = time.perf_counter()
+        model_manager.predict_batch(next_batch())
+        latencies.append(time.perf_counter() - step)
+    return latencies, time.perf_counter() - started
+
+
+# --- Main -----------------------------------------------------------------
+
+def measure(context, threads: int, workers: int, blocks, batch_sizes: list, duration: float, texts: list) -> list:
+    """Run every batch size on one pool of ``workers`` x ``threads`` and return result rows"""
+    worker_ids = context.Queue()
+    for worker_id in range(workers):
+        worker_ids.put(worker_id)
+    barrier = context.Barrier(workers)
+
+    rows = []
+    with context.Pool(workers, initializer=_init_worker,
+                      initargs=(worker_ids, blocks, threads, barrier, texts)) as pool:
+        ready = set()
+        while len(ready) < workers:
+            ready.update(pool.map(_worker_ready, range(workers), chunksize=1))
+
+        for batch_size in batch_sizes:
+            results = pool.map(_run, [(batch_size, duration)] * workers, chunksize=1)
+            latencies = [latency * 1000 for worker_latencies, _ in results for latency in worker_latencies]
+            throughput = sum(len(worker_latencies) * batch_size / elapsed for worker_latencies, elapsed in results)
+            row = {
+                "threads": threads,
+                "workers": workers,
+                "batch_size": batch_size,
+                "throughput": throughput,
+                "p50_ms": percentile(latencies, 0.5),
+                "p99_ms": percentile(latencies, 0.99),
+                "samples": len(latencies),
+            }
+            rows.append(row)
+            print(
+                f"  {threads:>7}{workers:>8}{batch_size:>7}{row['throughput']:>12.1f}"
+                f"{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['samples']:>9}"
+            )
+    return rows
+
+
+def main():
+    cores = len(available_cpus())
+
+    parser = argparse.ArgumentParser(
+        description="Sweep torch threads x batch sizes and recommend CPU serving settings"
+    )
+    parser.add_argument("--target-p99-ms", type=float, default=100.0,
+                        help="Highest acceptable p99 batch latency in milliseconds (default: 100)")
+    parser.add_argument("--threads", type=str, default=None,
+                        help="Comma-separated intra-op thread counts per worker "
+                             "(default: powers of two up to the core count)")
+    parser.add_argument("--batch-sizes", type=str, default="1,4,8,16,32",
+                        help="Comma-separated batch sizes (default: 1,4,8,16,32)")
+    parser.add_argument("--max-workers", type=int, default=cores,
+                        help=f"Most worker processes per configuration (default: {cores})")
+    parser.add_argument("--duration", type=float, default=5.0,
+                        help="Seconds measured per configuration (default: 5)")
+    parser.add_argument("--texts-file", type=str, default=None,
+                        help="Representative texts, one per line (default: built-in samples)")
+    parser.add_argument("--no-pin", action="store_true",
+                        help="Do not pin each worker to its own cores")
+    args = parser.parse_args()
+
+    thread_counts = parse_int_list(args.threads) if args.threads else default_thread_counts(cores)
+    batch_sizes = parse_int_list(args.batch_sizes)
+    texts = SAMPLE_TEXTS
+    if args.texts_file:
+        with open(args.texts_file, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+        if not texts:
+            raise SystemExit(f"{args.texts_file} contains no texts")
+
+    print("=" * 64)
+    print(f"  Tuning: {settings.MODEL_NAME} ({settings.BACKEND}, quantization {settings.QUANTIZATION})")
+    print(f"  Cores: {cores}, threads {thread_counts}, batch sizes {batch_sizes}")
+    print(f"  {args.duration:.0f}s per configuration, target p99 {args.target_p99_ms:.0f}ms")
+    print("=" * 64)
+
+    # Fork workers from a parent holding the weights, as the pre-fork server
+    # does; without fork each worker loads its own copy
+    if hasattr(os, "fork"):
+        import torch
+        from app.core.model_manager import model_manager
+
+        torch.set_num_threads(1)
+        model_manager.load_model(warmup=False)
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context("spawn")
+
+    print(f"  {'threads':>7}{'workers':>8}{'batch':>7}{'texts/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'samples':>9}")
+    rows = []
+    try:
+        for threads in thread_counts:
+            workers = max(1, min(args.max_workers, cores // threads))
+            blocks = None if args.no_pin else split_cpus(available_cpus(), workers)
+            rows.extend(measure(context, threads, workers, blocks, batch_sizes, args.duration, texts))
+    except KeyboardInterrupt:
+        print("\n  Interrupted; recommending from the configurations measured so far")
+
+    if not rows:
+        sys.exit(130)
+
+    print("=" * 64)
+    meeting = [row for row in rows if row["p99_ms"] <= args.target_p99_ms]
+    if meeting:
+        best = max(meeting, key=lambda row: row["throughput"])
+        print(f"  Best throughput within p99 {args.target_p99_ms:.0f}ms: {best['throughput']:.1f} texts/s "
+              f"(p99 {best['p99_ms']:.1f}ms)")
+    else:
+        best = min(rows, key=lambda row: row["p99_ms"])
+        print(f"  No configuration meets p99 {args.target_p99_ms:.0f}ms; lowest p99 is "
+              f"{best['p99_ms']:.1f}ms at {best['throughput']:.1f} texts/s")
+
+    print("  Recommended settings:")
+    print(f"    WORKERS={best['workers']}")
+    print(f"    INFERENCE_TORCH_THREADS={best['threads']}")
+    print(f"    MICRO_BATCH_MAX_SIZE={best['batch_size']}")
+    if not args.no_pin and best["workers"] > 1:
+        print("    CPU_AFFINITY=auto")
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    main()